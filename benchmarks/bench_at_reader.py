@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""
+Benchmark for the AT commands response reader.
+
+It sends the `Device._query_product_info` commands to a `VirtualModem` and
+prints the time per cycle spent by the legacy reader
+(fixed sleep of `AT_CMD_TIMEOUT` before reading), by the current
+`Device.send_at` reader and by the batched `Device.send_at_batch` reader.
+
+Usage:
+    $ python -m benchmarks.bench_at_reader --cycles 3 --latency 0.005
+"""
+
+import argparse
+import time
+
+import serial
+
+from fw_sim7600.sim7600.device import Device
+from fw_sim7600.sim7600.virtual_modem import VirtualModem
+
+
+def send_at_fixed_sleep(ser, command, back, timeout):
+    """ AT command reader used before the event-driven `Device.send_at`. """
+    rec_buff = b''
+    ser.write((command + '\r\n').encode())
+    time.sleep(timeout)
+    if ser.in_waiting:
+        time.sleep(Device.RESPONSE_WAIT_TIME)
+        rec_buff = ser.read(ser.in_waiting)
+    if rec_buff == b'' or back not in rec_buff.decode():
+        return None
+    return rec_buff
+
+
+def _run_cycles(ser, send_at, cycles) -> float:
+    start = time.monotonic()
+    for _ in range(cycles):
+        for command in Device.PRODUCT_INFO_COMMANDS:
+            send_at(ser, command, 'OK', Device.AT_CMD_TIMEOUT)
+    return (time.monotonic() - start) / cycles
+
+
+def _run_batch_cycles(ser, cycles) -> float:
+    start = time.monotonic()
+    for _ in range(cycles):
+        Device.send_at_batch(ser, Device.PRODUCT_INFO_COMMANDS, Device.AT_CMD_TIMEOUT)
+    return (time.monotonic() - start) / cycles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AT response reader benchmark")
+    parser.add_argument("--cycles", type=int, default=3,
+                        help="Product info cycles to run for each reader (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="Virtual modem response latency in seconds (default: 0.005)")
+    args = parser.parse_args()
+
+    with VirtualModem(latency=args.latency) as modem:
+        with serial.Serial(modem.port, 115200, timeout=Device.RESPONSE_WAIT_TIME) as ser:
+            before = _run_cycles(ser, send_at_fixed_sleep, args.cycles)
+            after = _run_cycles(ser, Device.send_at, args.cycles)
+            batched = _run_batch_cycles(ser, args.cycles)
+
+    print("Commands per cycle: {}".format(len(Device.PRODUCT_INFO_COMMANDS)))
+    print("Fixed sleep reader:  {:8.3f} s/cycle".format(before))
+    print("Event-driven reader: {:8.3f} s/cycle".format(after))
+    print("Batched reader:      {:8.3f} s/cycle".format(batched))
+    print("Speed-up:            {:8.1f}x".format(before / after if after > 0 else float('inf')))
+
+
+if __name__ == '__main__':
+    main()
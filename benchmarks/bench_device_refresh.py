@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+End-to-end benchmark for the `Device.refresh()` method.
+
+It runs the whole serial path (AT commands, responses reading, GNSS logic and
+PDU parsing) against a `VirtualModem` and prints the time per refresh.
+
+Usage:
+    $ python -m benchmarks.bench_device_refresh --cycles 5 --fix-after 2 --gnss-session always_on
+"""
+
+import argparse
+import time
+
+from fw_sim7600.sim7600.device import Device
+from fw_sim7600.sim7600.virtual_modem import VirtualModem
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Device refresh benchmark")
+    parser.add_argument("--cycles", type=int, default=5,
+                        help="Refreshes to run (default: 5)")
+    parser.add_argument("--sleep", type=float, default=1.0,
+                        help="Seconds between refreshes, like the main loop sleep (default: 1.0)")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="Virtual modem response latency in seconds (default: 0.005)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Virtual modem ERROR responses rate (default: 0.0)")
+    parser.add_argument("--no-fix", action="store_true",
+                        help="Virtual modem never returns a GNSS fix")
+    parser.add_argument("--fix-after", type=float, default=0.0,
+                        help="Virtual modem time to first fix in seconds (default: 0.0)")
+    parser.add_argument("--gnss-session", default=Device.GNSS_SESSION_PER_CYCLE, choices=Device.GNSS_SESSIONS,
+                        help="GNSS session policy (default: {})".format(Device.GNSS_SESSION_PER_CYCLE))
+    parser.add_argument("--gnss-auto-report", type=int, default=0,
+                        help="GNSS auto-report interval in seconds, 0 to poll (default: 0)")
+    args = parser.parse_args()
+
+    with VirtualModem(latency=args.latency, error_rate=args.error_rate,
+                      fix=not args.no_fix, fix_after=args.fix_after) as modem:
+        dev = Device(modem.port, 115200, auto_refresh=False,
+                     gnss_session=args.gnss_session, gnss_auto_report=args.gnss_auto_report)
+        times = []
+        try:
+            for i in range(args.cycles):
+                start = time.monotonic()
+                dev.refresh(True)
+                times.append(time.monotonic() - start)
+                print("Refresh {}/{}: {:8.3f} s ({} values)".format(i + 1, args.cycles, times[-1],
+                                                                   len(dev.latest_data)))
+                time.sleep(args.sleep)
+        finally:
+            dev.close()
+
+    print("Average refresh:  {:8.3f} s".format(sum(times) / len(times)))
+    print("Max refresh:      {:8.3f} s".format(max(times)))
+    print("Modem commands:   {} ({} errors)".format(modem.commands_count, modem.errors_count))
+    print("GNSS stats:       {}".format(dev.gnss_stats))
+    print("Connection stats: {}".format(dev.conn_stats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+"""
+Benchmark for the script's cold start.
+
+It runs `python -X importtime run.py --version` (or `--help`) in a new
+process, parses the import times printed by the interpreter and prints the
+total import time, the process' wall time and the slowest imported modules.
+
+It also guards the cold start budget: the script exits with 1 when the best
+import time exceeds the `--budget` or when a heavy module (eg: `pydbus`,
+`gi`, `serial` or `RPi`) is imported only to print the version or the help.
+
+Usage:
+    $ python -m benchmarks.bench_import_time --runs 5 --budget 150
+    $ python -m benchmarks.bench_import_time --mode help
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# Modules that must be imported only when the device or the DBus are used
+HEAVY_MODULES = ('pydbus', 'gi', 'serial', 'RPi', 'cProfile', 'pstats', 'logging.handlers')
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_once(script_arg) -> (float, float, dict):
+    """ Returns the total import time (in seconds), the wall time and the cumulative time of each module. """
+    start = time.perf_counter()
+    res = subprocess.run([sys.executable, "-X", "importtime", "run.py", script_arg],
+                         cwd=ROOT_DIR, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if res.returncode != 0:
+        raise RuntimeError("run.py {} failed:\n{}".format(script_arg, res.stderr))
+
+    modules = {}
+    total_us = 0
+    for line in res.stderr.splitlines():
+        # eg: `import time:       331 |       2861 |     fw_sim7600.base.commons`
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative) / 1e6
+        if not name.startswith("  "):
+            # top level import, nested ones are included in his cumulative time
+            total_us += int(cumulative)
+    return total_us / 1e6, wall, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start import time benchmark")
+    parser.add_argument("--runs", type=int, default=5,
+                        help="Script executions, the best one is reported (default: 5)")
+    parser.add_argument("--mode", default="version", choices=("version", "help"),
+                        help="Run the script with the `--version` or the `--help` argument (default: version)")
+    parser.add_argument("--budget", type=float, default=150.0,
+                        help="Max import time in milliseconds (default: 150.0)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Slowest modules to print (default: 10)")
+    args = parser.parse_args()
+
+    script_arg = "--" + args.mode
+    runs = [_run_once(script_arg) for _ in range(args.runs)]
+    import_time, wall, modules = min(runs, key=lambda run: run[0])
+
+    print("Slowest imports (cumulative):")
+    for name, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+        print("  {:<40} {:8.3f} ms".format(name, cumulative * 1000))
+    print("Import time:  {:8.3f} ms (budget: {:.3f} ms)".format(import_time * 1000, args.budget))
+    print("Process time: {:8.3f} ms".format(wall * 1000))
+
+    failed = False
+    heavy = sorted(name for name in modules
+                   if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES))
+    if len(heavy) > 0:
+        print("FAIL: heavy modules imported for {}: {}".format(script_arg, ", ".join(heavy)))
+        failed = True
+    if import_time * 1000 > args.budget:
+        print("FAIL: import time over budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
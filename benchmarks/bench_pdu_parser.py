@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+"""
+Benchmark for the AT commands responses parser.
+
+It parses the frames of a whole refresh (product info, network and GNSS
+commands, plus an unsolicited GNSS report) with the legacy `if/elif` parser
+and with the table-driven `AT_CMDS_PARSERS` extractors, checks that
+`Device._parse_pdu()` returns the legacy parser's values and prints the
+throughput in frames per second. Only the values' extraction is timed, like the
+legacy parser does, the device's samples building is excluded. It also checks
+that frames with leading stray lines (`STRAY_FRAMES`) are parsed.
+
+Usage:
+    $ python -m benchmarks.bench_pdu_parser --cycles 20000
+"""
+
+import argparse
+import time
+
+from fw_sim7600.sim7600._pdu import pdu_split
+from fw_sim7600.sim7600.device import Device
+from fw_sim7600.sim7600.mappings import AT_CMDS_PARSERS
+
+# Frames as received from a SIM7600E-H (see `docs/logs`)
+FRAMES = [
+    b'AT+CGMI\r\r\nSIMCOM INCORPORATED\r\n\r\nOK\r\n',
+    b'AT+CGMM\r\r\nSIMCOM_SIM7600E-H\r\n\r\nOK\r\n',
+    b'AT+CGSN\r\r\n862798066497344\r\n\r\nOK\r\n',
+    b'AT+CSUB\r\r\n+CSUB: B04V03\r\n+CSUB: MDM9x07_LE20_S_22_V1.03_210527\r\n\r\nOK\r\n',
+    b'AT+CGMR\r\r\n+CGMR: LE20B04SIM7600M22\r\n\r\nOK\r\n',
+    b'AT+CSQ\r\r\n+CSQ: 19,99\r\n\r\nOK\r\n',
+    b'AT+CREG?\r\r\n+CREG: 0,1\r\n\r\nOK\r\n',
+    b'AT+CPIN?\r\r\n+CPIN: READY\r\n\r\nOK\r\n',
+    b'AT+COPS?\r\r\n+COPS: 0,0,"vodafone IT",7\r\n\r\nOK\r\n',
+    b'AT+CGPSINFO\r\r\n+CGPSINFO: 4629.830411,N,01120.202419,E,051023,185112.0,290.5,0.0,\r\n\r\nOK\r\n',
+    b'AT+CGNSSINFO\r\r\n+CGNSSINFO: 2,06,04,00,4629.822936,N,01120.199998,E,051023,194627.0,323.3,0.0,'
+    b',1.3,1.0,0.8\r\n\r\nOK\r\n',
+    b'\r\n+CGNSSINFO: 2,06,04,00,4629.822940,N,01120.199990,E,051023,194628.0,323.1,0.0,,1.3,1.0,0.8\r\n',
+]
+
+# Frames with empty lines or a previous command's result code before the
+# response, and the values parsed from them
+STRAY_FRAMES = [
+    (b'\r\nAT+CSQ\r\r\n+CSQ: 20,99\r\n\r\nOK\r\n', {'AT+CSQ_rssi': '20', 'AT+CSQ_ber': '99'}),
+    (b'OK\r\n\r\nAT+CGMM\r\r\nSIMCOM_SIM7600E-H\r\n\r\nOK\r\n', {'AT+CGMM': 'SIMCOM_SIM7600E-H'}),
+    (b'\r\nOK\r\n\r\n+CGPSINFO: 4629.830411,N,01120.202419,E,051023,185112.0,290.5,0.0,\r\n',
+     {'CGPSINFO_alt': '290.5'}),
+]
+
+
+def parse_pdu_legacy(frames) -> dict:
+    """ AT commands responses parser used before the `AT_CMDS_PARSERS` table. """
+    data = {}
+    count = 1
+    for frame in frames:
+        if b'AT+CGMI' in frame:
+            # AT+CGMI\r\r\nSIMCOM INCORPORATED\r\n\r\nOK\r\n
+            frame_lines = frame.decode().split("\r\n")
+            data['AT+CGMI'] = frame_lines[1]
+
+        elif b'AT+CGMM' in frame:
+            # AT+CGMM\r\r\nSIMCOM_SIM7600E-H\r\n\r\nOK\r\n
+            frame_lines = frame.decode().split("\r\n")
+            data['AT+CGMM'] = frame_lines[1]
+
+        elif b'AT+CGSN' in frame:
+            # AT + CGSN\r\r\n860147054839863\r\n\r\nOK\r\n
+            frame_lines = frame.decode().split("\r\n")
+            data['AT+CGSN'] = frame_lines[1]
+
+        elif b'AT+CSUB' in frame:
+            # AT+CSUB\r\r\n+CSUB: B04V03\r\n+CSUB: MDM9x07_LE20_S_22_V1.03_210527\r\n\r\nOK\r\n
+            frame_lines = frame.decode().split("\r\n")
+            data['AT+CSUB'] = frame_lines[1][
+                                    len("CSUB:") + 1:].strip()
+            data['AT+CSUB_B'] = frame_lines[2][
+                                      len("CSUB:") + 1:].strip()
+
+        elif b'AT+CGMR' in frame:
+            # AT+CGMR\r\r\n+CGMR: LE20B04SIM7600M22\r\n\r\nOK\r\n
+            frame_lines = frame.decode().split("\r\n")
+            data['AT+CGMR'] = frame_lines[1][
+                                    len("CGMR:") + 1:].strip()
+
+        elif b'AT+CSQ' in frame:
+            # AT+CSQ\r\r\n+CSQ: 4,99\r\n\r\nOK\r\n
+            frame_lines = frame.decode().split("\r\n")
+            values = frame_lines[1][len("CSQ:") + 1:].strip().split(',')
+            data['AT+CSQ_rssi'] = values[0]
+            data['AT+CSQ_ber'] = values[1]
+
+        elif b'AT+CREG' in frame:
+            # AT+CREG...
+            frame_lines = frame.decode().split("\r\n")
+            data['AT+CREG'] = frame_lines[1]
+
+        elif b'AT+CPIN' in frame:
+            # AT+CPIN...
+            frame_lines = frame.decode().split("\r\n")
+            data['AT+CPIN'] = frame_lines[1]
+
+        elif b'AT+COPS' in frame:
+            # AT+COPS...
+            frame_lines = frame.decode().split("\r\n")
+            data['AT+COPS'] = frame_lines[1]
+
+        elif b'+CGPSINFO:' in frame:
+            # {...}+CGPSINFO: 4629.830411,N,01120.202419,E,051023,185112.0,290.5,0.0,{...}
+            frame_lines = frame.decode().split("\r\n")
+            line: str
+            for line in frame_lines:
+                if "+CGPSINFO:" in line:
+                    line = line[len("+CGPSINFO:"):].strip()
+                    values = line.split(",")
+                    data['CGPSINFO_lat_degrees'] = values[0]
+                    data['CGPSINFO_lat_dir'] = values[1]
+                    data['CGPSINFO_log_degrees'] = values[2]
+                    data['CGPSINFO_log_dir'] = values[3]
+                    # data['CGPSINFO_date'] = values[4]
+                    # data['CGPSINFO_utc_date'] = values[5]
+                    data['CGPSINFO_alt'] = values[6]
+                    data['CGPSINFO_speed'] = values[7]
+                    data['CGPSINFO_course'] = values[8] if values[8] != "" else "-1"
+
+        elif b'+CGNSSINFO:' in frame:
+            # {...}+CGNSSINFO: 2,02,03,00,4629.822936,N,01120.199998,E,051023,194627.0,323.3,0.0,,2.0,1.7,1.0{...}
+            frame_lines = frame.decode().split("\r\n")
+            line: str
+            for line in frame_lines:
+                if "+CGNSSINFO:" in line:
+                    line = line[len("+CGNSSINFO:"):].strip()
+                    values = line.split(",")
+                    data['CGNSSINFO_mode'] = values[0]
+                    data['CGNSSINFO_sat_gps_count'] = values[1]
+                    data['CGNSSINFO_sat_glonass_count'] = values[2]
+                    data['CGNSSINFO_sat_beidou_count'] = values[3]
+                    data['CGNSSINFO_lat_degrees'] = values[4]
+                    data['CGNSSINFO_lat_dir'] = values[5]
+                    data['CGNSSINFO_log_degrees'] = values[6]
+                    data['CGNSSINFO_log_dir'] = values[7]
+                    # data['CGNSSINFO_date'] = values[8]
+                    # data['CGNSSINFO_utc_date'] = values[9]
+                    data['CGNSSINFO_alt'] = values[10]
+                    data['CGNSSINFO_speed'] = values[11]
+                    data['CGNSSINFO_course'] = values[12] if values[
+                                                                       12] != "" else "-1"
+                    data['CGNSSINFO_pdop'] = values[13]
+                    data['CGNSSINFO_hdop'] = values[14]
+                    data['CGNSSINFO_vdop'] = values[15]
+
+        count += 1
+    return data
+
+
+def parse_pdu_table(frames) -> dict:
+    """ Values' extraction of `Device._parse_pdu()`, without the samples. """
+    data = {}
+    for frame in frames:
+        command, lines = pdu_split(frame)
+        parser = AT_CMDS_PARSERS.get(command)
+        if parser is not None:
+            data.update(parser(lines))
+    return data
+
+
+def _run(parse, cycles) -> float:
+    start = time.perf_counter()
+    for _ in range(cycles):
+        parse(FRAMES)
+    return cycles * len(FRAMES) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AT responses parser benchmark")
+    parser.add_argument("--cycles", type=int, default=20000,
+                        help="Refreshes' frames to parse for each parser (default: 20000)")
+    args = parser.parse_args()
+
+    dev = Device("/dev/null_bench", 115200, auto_refresh=False)
+    dev._parse_pdu(FRAMES)
+    table_values = {k: v for k, v in dev.latest_data.items() if k != 'power_module_state'}
+    legacy_values = parse_pdu_legacy(FRAMES)
+    assert table_values == legacy_values, \
+        "Parsers mismatch: {}".format(set(table_values.items()) ^ set(legacy_values.items()))
+    assert parse_pdu_table(FRAMES) == legacy_values, "Extractors mismatch"
+    for frame, expected in STRAY_FRAMES:
+        dev._parse_pdu([frame])
+        values = {k: dev.latest_data.get(k) for k in expected}
+        assert values == expected, "Frame {} parsed as {}".format(frame, values)
+
+    legacy = _run(parse_pdu_legacy, args.cycles)
+    table = _run(parse_pdu_table, args.cycles)
+    print("Legacy parser:       {:10.0f} frames/s".format(legacy))
+    print("Table-driven parser: {:10.0f} frames/s".format(table))
+    print("Speed up:            {:10.2f} x".format(table / legacy))
+
+
+if __name__ == '__main__':
+    main()
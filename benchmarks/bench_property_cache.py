@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Benchmark for the published properties' cache.
+
+It runs the cache's operations of a main loop cycle (freshness check and
+update for each property, then a calculator's read) with the legacy cache
+(a new `{'name', 'value', 'time': datetime.now()}` dict per update) and with
+the `PropertyCache`, and prints the time and the memory allocated per cycle.
+
+Usage:
+    $ python -m benchmarks.bench_property_cache --cycles 20000
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from fw_sim7600.base.property_cache import PropertyCache
+from fw_sim7600.sim7600.mappings import PROPS_CODES
+
+PROPERTIES = [prop['name'] for prop in PROPS_CODES.values()]
+TIME_TO_RESET = 300
+
+
+def _cycle_legacy(cache, value):
+    for name in PROPERTIES:
+        if name in cache \
+                and cache[name]['value'] == value \
+                and (datetime.now() - cache[name]['time']).total_seconds() < TIME_TO_RESET:
+            continue
+        cache[name] = {'name': name, 'value': value, 'time': datetime.now()}
+    return cache[PROPERTIES[0]]['value']
+
+
+def _cycle_compact(cache, value):
+    for name in PROPERTIES:
+        if name in cache \
+                and cache[name].value == value \
+                and cache.age_ns(name) < TIME_TO_RESET * 1_000_000_000:
+            continue
+        cache.set(name, value)
+    return cache[PROPERTIES[0]]['value']
+
+
+def _run(cycle, cache, cycles) -> (float, float):
+    start = time.perf_counter()
+    for i in range(cycles):
+        cycle(cache, float(i))
+    elapsed = (time.perf_counter() - start) / cycles
+
+    # memory allocated during each cycle, also if released before his end
+    allocated = 0
+    tracemalloc.start()
+    for i in range(100):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        cycle(cache, float(i))
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return elapsed, allocated / 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Properties cache benchmark")
+    parser.add_argument("--cycles", type=int, default=20000,
+                        help="Cycles to run for each cache (default: 20000)")
+    args = parser.parse_args()
+
+    legacy_time, legacy_mem = _run(_cycle_legacy, {}, args.cycles)
+    compact_time, compact_mem = _run(_cycle_compact, PropertyCache(), args.cycles)
+    print("Properties per cycle:  {}".format(len(PROPERTIES)))
+    print("Legacy cache:          {:8.3f} us/cycle {:10.0f} bytes/cycle".format(legacy_time * 1e6, legacy_mem))
+    print("PropertyCache:         {:8.3f} us/cycle {:10.0f} bytes/cycle".format(compact_time * 1e6, compact_mem))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Benchmark for the main loop's period.
+
+It runs cycles with a random work time, followed by the legacy wait (sleep
+the whole period after the work) or by the `FixedRateScheduler`'s wait for
+the next deadline, and prints the average period and the total drift from
+the expected `cycles * period` time.
+
+Usage:
+    $ python -m benchmarks.bench_scheduler --period 0.5 --cycles 20
+"""
+
+import argparse
+import random
+import threading
+import time
+
+from fw_sim7600.base.scheduler import FixedRateScheduler
+
+
+def _run_legacy(period, cycles, max_work) -> float:
+    event = threading.Event()
+    start = time.monotonic()
+    for _ in range(cycles):
+        time.sleep(random.uniform(0, max_work))
+        event.wait(period)
+    return time.monotonic() - start
+
+
+def _run_scheduler(period, cycles, max_work) -> float:
+    event = threading.Event()
+    scheduler = FixedRateScheduler(period)
+    start = time.monotonic()
+    scheduler.start()
+    for _ in range(cycles):
+        time.sleep(random.uniform(0, max_work))
+        scheduler.wait(event.wait)
+    return time.monotonic() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Main loop's period benchmark")
+    parser.add_argument("--period", type=float, default=0.5,
+                        help="Main loop period in seconds (default: 0.5)")
+    parser.add_argument("--cycles", type=int, default=20,
+                        help="Cycles to run for each wait (default: 20)")
+    parser.add_argument("--max-work", type=float, default=0.2,
+                        help="Max seconds of work per cycle (default: 0.2)")
+    args = parser.parse_args()
+
+    expected = args.period * args.cycles
+    for name, run in (("Legacy sleep", _run_legacy), ("FixedRateScheduler", _run_scheduler)):
+        elapsed = run(args.period, args.cycles, args.max_work)
+        print("{:<20} {:8.3f} s/cycle, drift {:8.3f} s".format(
+            name + ":", elapsed / args.cycles, elapsed - expected))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+"""
+Benchmark for the persistent serial connection.
+
+It compares the time per cycle spent opening a new serial port on each cycle
+(like devices did before the `SerialConnection` class) with the time spent
+using the same `SerialConnection` for all cycles. Each cycle sends one AT
+command to a `VirtualModem`.
+
+Usage:
+    $ python -m benchmarks.bench_serial_conn --cycles 200
+"""
+
+import argparse
+import time
+
+import serial
+
+from fw_sim7600.base.serial_conn import SerialConnection
+from fw_sim7600.sim7600.device import Device
+from fw_sim7600.sim7600.virtual_modem import VirtualModem
+
+
+def _run_reopen(port, cycles) -> float:
+    start = time.monotonic()
+    for _ in range(cycles):
+        with serial.Serial(port, 115200, timeout=Device.RESPONSE_WAIT_TIME) as s:
+            Device.send_at(s, 'AT+CSQ', 'OK', Device.AT_CMD_TIMEOUT)
+    return (time.monotonic() - start) / cycles
+
+
+def _run_persistent(conn, cycles) -> float:
+    start = time.monotonic()
+    for _ in range(cycles):
+        Device.send_at(conn.ensure_open(), 'AT+CSQ', 'OK', Device.AT_CMD_TIMEOUT)
+    return (time.monotonic() - start) / cycles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial connection benchmark")
+    parser.add_argument("--cycles", type=int, default=200,
+                        help="Cycles to run for each connection mode (default: 200)")
+    args = parser.parse_args()
+
+    with VirtualModem(latency=0.0) as modem:
+        conn = SerialConnection(modem.port, 115200, Device.RESPONSE_WAIT_TIME)
+        try:
+            reopen = _run_reopen(modem.port, args.cycles)
+            persistent = _run_persistent(conn, args.cycles)
+        finally:
+            conn.close()
+
+    print("Reopen on each cycle: {:8.3f} ms/cycle".format(reopen * 1000))
+    print("Persistent:           {:8.3f} ms/cycle".format(persistent * 1000))
+    print("Saved per cycle:      {:8.3f} ms".format((reopen - persistent) * 1000))
+    print("Connection stats:     {}".format(conn.stats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""
+Benchmark for the settings' reads.
+
+It reads the settings used by the main loop's hot path (the cache's enable
+flag and time to reset for each property) from the `Settings` object, that
+resolves each `get_xxx` read with his `__getattr__()`, and from the
+`SettingsSnapshot`, that stores them as plain attributes, and prints the time
+per read.
+
+Usage:
+    $ python -m benchmarks.bench_settings --reads 1000000
+"""
+
+import argparse
+import time
+
+from fw_sim7600.base.settings import Settings
+
+
+def _run(settings, reads) -> float:
+    start = time.perf_counter()
+    for _ in range(reads // 2):
+        if settings.get_cache_enable:
+            settings.get_cache_time_to_reset
+    return (time.perf_counter() - start) / (reads // 2 * 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Settings reads benchmark")
+    parser.add_argument("--reads", type=int, default=1000000,
+                        help="Settings reads for each implementation (default: 1000000)")
+    args = parser.parse_args()
+
+    settings = Settings({Settings.CACHE_TIME_TO_RESET: 10 * 60})
+    dynamic_time = _run(settings, args.reads)
+    snapshot_time = _run(settings.snapshot(), args.reads)
+    print("Settings (__getattr__): {:8.1f} ns/read".format(dynamic_time * 1e9))
+    print("SettingsSnapshot:       {:8.1f} ns/read".format(snapshot_time * 1e9))
+    print("Speedup:                {:8.1f}x".format(dynamic_time / snapshot_time))
+
+
+if __name__ == '__main__':
+    main()
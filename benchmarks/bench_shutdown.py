@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Benchmark for the shutdown latency.
+
+It runs a main loop like the `DeviceRunner._internal_loop()` one (refresh, then
+wait for the main loop sleep) and, after a random delay, sends the `SIGTERM`
+signal to the current process. The time from the signal to the loop's exit is
+the shutdown latency, that includes the device's `close()`.
+
+The `simulator` device measures the main loop's sleep wake up only, the
+`virtual` device runs against a `VirtualModem` without GNSS fix, so the
+signal is received also while the device is reading AT responses or waiting
+between the GNSS retries.
+
+Usage:
+    $ python -m benchmarks.bench_shutdown --device virtual --runs 10
+"""
+
+import argparse
+import os
+import random
+import signal
+import threading
+import time
+
+from fw_sim7600.sim7600.device import Device
+from fw_sim7600.sim7600.simulator import DeviceSimulator
+from fw_sim7600.sim7600.virtual_modem import VirtualModem
+
+
+def _run_once(dev, loop_sleep, max_delay) -> float:
+    sent = []
+
+    def _send_signal():
+        sent.append(time.monotonic())
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    timer = threading.Timer(random.uniform(0, max_delay), _send_signal)
+    timer.start()
+    try:
+        while not dev.must_terminate:
+            dev.refresh(True)
+            dev.wait_or_terminate(loop_sleep)
+        dev.close()
+        return time.monotonic() - sent[0]
+    finally:
+        timer.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shutdown latency benchmark")
+    parser.add_argument("--device", default="virtual", choices=("virtual", "simulator"),
+                        help="Device to run: `virtual` modem or `simulator` (default: virtual)")
+    parser.add_argument("--runs", type=int, default=10,
+                        help="Shutdowns to measure (default: 10)")
+    parser.add_argument("--sleep", type=float, default=2.0,
+                        help="Main loop sleep in seconds (default: 2.0)")
+    parser.add_argument("--max-delay", type=float, default=5.0,
+                        help="Max seconds before sending the signal (default: 5.0)")
+    args = parser.parse_args()
+
+    latencies = []
+    with VirtualModem(latency=0.005, fix=False) as modem:
+        for i in range(args.runs):
+            if args.device == "virtual":
+                dev = Device(modem.port, 115200, auto_refresh=False)
+            else:
+                dev = DeviceSimulator("/dev/null_simulator", 115200)
+            latencies.append(_run_once(dev, args.sleep, args.max_delay))
+            print("Shutdown {}/{}: {:8.3f} ms".format(i + 1, args.runs, latencies[-1] * 1000))
+
+    latencies.sort()
+    print("Average shutdown: {:8.3f} ms".format(sum(latencies) / len(latencies) * 1000))
+    print("Median shutdown:  {:8.3f} ms".format(latencies[len(latencies) // 2] * 1000))
+    print("Max shutdown:     {:8.3f} ms".format(latencies[-1] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Benchmark for the timing layer's overhead.
+
+It calls a trivial function without the `timed` decorator, with the
+decorator and the timings disabled (the default) and with the timings
+enabled, and prints the time per call.
+
+Usage:
+    $ python -m benchmarks.bench_timings --calls 1000000
+"""
+
+import argparse
+import time
+
+from fw_sim7600.base.timing import TIMINGS, timed
+
+
+def _plain(value):
+    return value
+
+
+@timed("bench")
+def _timed(value):
+    return value
+
+
+@timed("bench_command", command=lambda value: "AT+CSQ")
+def _timed_command(value):
+    return value
+
+
+def _run(func, calls) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Timing layer's overhead benchmark")
+    parser.add_argument("--calls", type=int, default=1000000,
+                        help="Calls for each function (default: 1000000)")
+    args = parser.parse_args()
+
+    plain = _run(_plain, args.calls)
+    TIMINGS.enabled = False
+    disabled = _run(_timed, args.calls)
+    TIMINGS.enabled = True
+    enabled = _run(_timed, args.calls)
+    enabled_command = _run(_timed_command, args.calls)
+    print("Not decorated:             {:8.1f} ns/call".format(plain * 1e9))
+    print("Timings disabled:          {:8.1f} ns/call".format(disabled * 1e9))
+    print("Timings enabled:           {:8.1f} ns/call".format(enabled * 1e9))
+    print("Timings enabled (command): {:8.1f} ns/call".format(enabled_command * 1e9))
+
+
+if __name__ == '__main__':
+    main()
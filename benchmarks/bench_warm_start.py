@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Warm start benchmark and check, against a `VirtualModem`.
+
+It runs the `DeviceRunner`'s startup (like `DeviceRunner.run()`, but on a stub
+DBus) and some main loop cycles three times, sharing the same state file:
+
+* cold start: no state file, the first refresh blocks the startup
+* warm start: the state file's values are published before the first refresh
+* device changed: the state file's device is not the connected one
+
+It prints the time to the first publication of each start and checks the
+`data_stale` handling, exits with 1 if a check fails.
+
+Usage:
+    $ python -m benchmarks.bench_warm_start --latency 0.05
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.e2e.stubs import install_dbus_stubs
+
+install_dbus_stubs()
+
+from run import FW_SETTINGS
+from fw_sim7600.base.runner import DeviceRunner
+from fw_sim7600.base.settings import Settings
+from fw_sim7600.sim7600.device import Device
+from fw_sim7600.sim7600.mappings import PID, PROPS_CODES, CALC_PROPS_CODES
+from fw_sim7600.sim7600.virtual_modem import VirtualModem
+
+
+def create_runner(port: str, state_file: str) -> DeviceRunner:
+    settings = dict(FW_SETTINGS)
+    settings.update({
+        Settings.PARAM_SERIAL_PORT: port,
+        Settings.STATE_FILE: state_file,
+        Settings.MAIN_LOOP_SLEEP: 0,
+        Settings.DEV_CONN_RETRY: 0,
+        Settings.TIMINGS_PROMETHEUS_FILE: "",
+    })
+    runner = DeviceRunner(lambda device, speed, auto_refresh: Device(device, speed, auto_refresh), None,
+                          settings, PID, PROPS_CODES, CALC_PROPS_CODES)
+    runner.settings = runner.settings.snapshot()
+    return runner
+
+
+def start(runner: DeviceRunner, cycles: int) -> dict:
+    """ Runs the runner's startup and `cycles` main loop cycles, returns the startup's results. """
+    first_publish = []
+    start_time = time.perf_counter()
+
+    runner._load_warm_state()
+    warm_start = runner._warm_state is not None
+    runner.dev = runner._init_device(False, False, not warm_start)
+    dbus_obj = runner._init_dbus_object()
+    if warm_start:
+        runner._publish_warm_state(dbus_obj)
+        first_publish.append(time.perf_counter() - start_time)
+    warm_properties = dbus_obj.stats['properties_count']
+
+    def _cycle_end():
+        if len(first_publish) == 0:
+            first_publish.append(time.perf_counter() - start_time)
+
+    try:
+        runner._internal_loop(runner.dev, dbus_obj, cycles=cycles, on_cycle_end=_cycle_end)
+    finally:
+        runner._save_state(force=True)
+        runner.dev.close()
+
+    return {
+        'warm_start': warm_start,
+        'first_publish': first_publish[0] if len(first_publish) > 0 else float('nan'),
+        'stale': runner._stale,
+        'restart_required': runner._restart_required,
+        'published_after_warm': dbus_obj.stats['properties_count'] - warm_properties,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm start benchmark")
+    parser.add_argument("--cycles", type=int, default=3,
+                        help="Main loop cycles of each start (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="Virtual modem response latency in seconds (default: 0.005)")
+    args = parser.parse_args()
+
+    failures = []
+
+    def check(condition: bool, message: str):
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as folder, VirtualModem(latency=args.latency) as modem:
+        state_file = os.path.join(folder, "state.json")
+
+        cold = start(create_runner(modem.port, state_file), args.cycles)
+        check(not cold['warm_start'], "cold start loaded a state file")
+        check(cold['stale'] is False, "cold start not marked as up to date")
+        check(os.path.exists(state_file), "state file not written")
+
+        warm = start(create_runner(modem.port, state_file), args.cycles)
+        check(warm['warm_start'], "warm start didn't load the state file")
+        check(warm['stale'] is False, "warm start still stale after the first refresh")
+        check(not warm['restart_required'], "warm start required a restart")
+
+        with open(state_file) as f:
+            state = json.load(f)
+        saved_pid = state['identity']['device_pid']
+        state['identity']['device_pid'] = next(pid for pid in PID if pid != saved_pid)
+        with open(state_file, 'w') as f:
+            json.dump(state, f)
+        changed = start(create_runner(modem.port, state_file), args.cycles)
+        check(changed['restart_required'], "device change not detected")
+        check(changed['published_after_warm'] == 0, "changed device's values published")
+        check(not os.path.exists(state_file), "state file of the changed device not removed")
+
+    for name, result in (('Cold start', cold), ('Warm start', warm), ('Device changed', changed)):
+        print("{:<16} first publish: {:8.3f} s".format(name + ":", result['first_publish']))
+    for failure in failures:
+        print("FAIL: {}".format(failure))
+    sys.exit(1 if len(failures) > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+End-to-end benchmark of the `DeviceRunner`'s main loop.
+
+It runs the main loop with the `DeviceSimulator` and a stub DBus, without
+sleeps between cycles, and measures the cycles per second, the main loop's
+stages durations (eg: `process_property_avg` is the per-property processing
+time), the memory allocated per cycle and the emitted DBus signals. Time
+measurements are repeated and the best value of each metric is kept, to
+reduce the noise of other processes.
+
+Results can be stored as JSON and compared with a previous run (eg: before
+a change to `_process_property()` or to the calculators): metrics worse than
+the `--threshold` are reported as regressions and the script exits with 1.
+
+Usage:
+    $ python -m benchmarks.e2e --cycles 500 --output results-1.1.0.json
+    $ python -m benchmarks.e2e --cycles 500 --compare results-1.1.0.json
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+
+from benchmarks.e2e.suite import FW_SETTINGS, Settings, measure_throughput, measure_stages, measure_memory
+
+# Metrics that improve when they increase, all others improve when they decrease
+HIGHER_IS_BETTER = ('cycles_per_second',)
+# Metrics reported but never considered as regressions
+INFORMATIONAL = ('signals_per_cycle', 'properties_per_cycle', 'cycle_time_max')
+
+
+def _best_of(measure, repeat: int, cycles: int, seed: int) -> dict:
+    """ Run the `measure` function `repeat` times and returns the best value of each metric. """
+    best = {}
+    for _ in range(repeat):
+        for name, value in measure(cycles, seed).items():
+            if name not in best:
+                best[name] = value
+            elif name in HIGHER_IS_BETTER:
+                best[name] = max(best[name], value)
+            else:
+                best[name] = min(best[name], value)
+    return best
+
+
+def _compare(results: dict, baseline: dict, threshold: float) -> [str]:
+    """ Print the changes from the `baseline` and returns the regressed metrics. """
+    regressions = []
+    print("{:<34} {:>14} {:>14} {:>9}".format("Metric", "Baseline", "Current", "Change"))
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print("{:<34} {:>14} {:>14.6g} {:>9}".format(name, "-", value, "new"))
+            continue
+        change = (value - base) / base * 100 if base != 0 else 0.0
+        worse = -change if name in HIGHER_IS_BETTER else change
+        regressed = name not in INFORMATIONAL and worse > threshold
+        if regressed:
+            regressions.append(name)
+        print("{:<34} {:>14.6g} {:>14.6g} {:>+8.1f}%{}".format(name, base, value, change,
+                                                               " REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end main loop benchmark")
+    parser.add_argument("--cycles", type=int, default=500,
+                        help="Main loop cycles for each measurement (default: 500)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Repetitions of the time measurements, the best one is kept (default: 5)")
+    parser.add_argument("--seed", type=int, default=1,
+                        help="Seed for the simulated values (default: 1)")
+    parser.add_argument("--output", default=None,
+                        help="JSON file where store the results (default: None)")
+    parser.add_argument("--compare", default=None,
+                        help="JSON file with the results to compare with (default: None)")
+    parser.add_argument("--threshold", type=float, default=10.0,
+                        help="Change percentage reported as regression (default: 10.0)")
+    args = parser.parse_args()
+
+    # the main loop logs (eg: the published properties) are not part of the measurements
+    logging.getLogger().setLevel(logging.ERROR)
+
+    results = {}
+    results.update(_best_of(measure_throughput, args.repeat, args.cycles, args.seed))
+    results.update(_best_of(measure_stages, args.repeat, args.cycles, args.seed))
+    results.update(measure_memory(args.cycles, args.seed))
+    report = {
+        'version': FW_SETTINGS[Settings.FW_VERSION],
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'cycles': args.cycles,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': results,
+    }
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print("Results written to '{}'".format(args.output))
+
+    if args.compare is None:
+        for name, value in results.items():
+            print("{:<34} {:>14.6g}".format(name, value))
+        return
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    print("Baseline: version {} ({} cycles, {})".format(baseline['version'], baseline['cycles'], baseline['timestamp']))
+    regressions = _compare(results, baseline['results'], args.threshold)
+    if len(regressions) > 0:
+        print("Regressions: {}".format(", ".join(regressions)))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
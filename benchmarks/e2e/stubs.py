@@ -0,0 +1,66 @@
+#!/usr/bin/python3
+"""
+Stubs of the DBus modules (`pydbus` and `gi`) used by the end-to-end
+benchmarks, so the `DeviceRunner` and the `DBusObject` can be imported and
+executed without a DBus session (and without emitting real signals).
+
+The `install_dbus_stubs()` function must be called before importing any
+`fw_sim7600.base.runner` or `fw_sim7600.dbus` module.
+"""
+
+import sys
+import types
+
+
+class StubSignal:
+    """ Replaces the `pydbus.generic.signal` descriptor, emitted signals are only counted. """
+
+    def __init__(self):
+        self.emitted = 0
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return self._emit
+
+    def _emit(self, *args):
+        self.emitted += 1
+
+
+class StubBus:
+    """ Replaces the `pydbus.SessionBus` and `pydbus.SystemBus` classes. """
+
+    def publish(self, *args):
+        pass
+
+
+class StubMainLoop:
+    """ Replaces the `gi.repository.GLib.MainLoop` class. """
+
+    def run(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+def install_dbus_stubs():
+    """ Register the stub modules in place of `pydbus` and `gi`. """
+    pydbus = types.ModuleType("pydbus")
+    pydbus.SessionBus = StubBus
+    pydbus.SystemBus = StubBus
+    pydbus_generic = types.ModuleType("pydbus.generic")
+    pydbus_generic.signal = StubSignal
+    pydbus.generic = pydbus_generic
+
+    gi = types.ModuleType("gi")
+    gi_repository = types.ModuleType("gi.repository")
+    gi_repository.GLib = types.SimpleNamespace(MainLoop=StubMainLoop)
+    gi.repository = gi_repository
+
+    sys.modules.update({
+        "pydbus": pydbus,
+        "pydbus.generic": pydbus_generic,
+        "gi": gi,
+        "gi.repository": gi_repository,
+    })
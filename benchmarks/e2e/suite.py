@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""
+End-to-end measurements of the `DeviceRunner`'s main loop, driven by the
+`DeviceSimulator` and publishing on a stub DBus (see `stubs.py`).
+
+Each measurement runs the real `DeviceRunner._internal_loop()`, with the
+`FW_SETTINGS` of the `run.py` script but without sleeps between cycles, on a
+new runner, so the measurements don't affect each other.
+"""
+
+import random
+import time
+import tracemalloc
+
+from benchmarks.e2e.stubs import install_dbus_stubs
+
+install_dbus_stubs()
+
+from run import FW_SETTINGS
+from fw_sim7600.base.runner import DeviceRunner
+from fw_sim7600.base.settings import Settings
+from fw_sim7600.base.timing import TIMINGS
+from fw_sim7600.sim7600.mappings import PID, PROPS_CODES, CALC_PROPS_CODES
+from fw_sim7600.sim7600.simulator import DeviceSimulator
+
+
+def create_runner(seed: int) -> (DeviceRunner, object):
+    """ Returns a new runner, with his simulated device, and his DBus object. """
+    random.seed(seed)
+    settings = dict(FW_SETTINGS)
+    settings.update({
+        Settings.MAIN_LOOP_SLEEP: 0,
+        Settings.DEV_CONN_RETRY: 0,
+        Settings.MAIN_LOOP_PIPELINE: False,
+        Settings.TIMINGS_ENABLE: False,
+        Settings.TIMINGS_PROMETHEUS_FILE: "",
+    })
+    runner = DeviceRunner(None, lambda device, speed, auto_refresh: DeviceSimulator(device, speed),
+                          settings, PID, PROPS_CODES, CALC_PROPS_CODES)
+    runner.settings = runner.settings.snapshot()
+    runner.dev = runner._init_device(False, True)
+    return runner, runner._init_dbus_object()
+
+
+def _percentile(values: list, quantile: float) -> float:
+    values = sorted(values)
+    return values[round((len(values) - 1) * quantile)] if len(values) > 0 else 0.0
+
+
+def measure_throughput(cycles: int, seed: int) -> dict:
+    """ Cycles per second and cycle's duration percentiles, plus the DBus signals' counters. """
+    runner, dbus_obj = create_runner(seed)
+    durations = []
+    last = [time.perf_counter()]
+
+    def _cycle_end():
+        now = time.perf_counter()
+        durations.append(now - last[0])
+        last[0] = now
+
+    start = last[0]
+    runner._internal_loop(runner.dev, dbus_obj, cycles=cycles, on_cycle_end=_cycle_end)
+    elapsed = time.perf_counter() - start
+    runner.dev.close()
+
+    stats = dbus_obj.stats
+    return {
+        'cycles_per_second': cycles / elapsed,
+        'cycle_time_p50': _percentile(durations, 0.50),
+        'cycle_time_p95': _percentile(durations, 0.95),
+        'cycle_time_max': max(durations),
+        'signals_per_cycle': stats['signals_count'] / cycles,
+        'properties_per_cycle': stats['properties_count'] / cycles,
+    }
+
+
+def measure_stages(cycles: int, seed: int) -> dict:
+    """ Durations of the main loop's stages (eg: per-property processing), from the timing layer. """
+    runner, dbus_obj = create_runner(seed)
+    TIMINGS.reset()
+    TIMINGS.enabled = True
+    try:
+        runner._internal_loop(runner.dev, dbus_obj, cycles=cycles)
+    finally:
+        TIMINGS.enabled = False
+        runner.dev.close()
+
+    results = {}
+    for stage, stats in TIMINGS.stats.items():
+        if stats['count'] == 0:
+            continue
+        results[stage + '_avg'] = stats['sum'] / stats['count']
+        results[stage + '_p95'] = stats['p95']
+    TIMINGS.reset()
+    return results
+
+
+def measure_memory(cycles: int, seed: int) -> dict:
+    """ Memory allocated during each cycle (also if released before his end) and retained by the cycles. """
+    runner, dbus_obj = create_runner(seed)
+    allocated = []
+    # traced memory at the start of the current cycle and at the end of the first one
+    traced = {}
+
+    def _cycle_end():
+        current, peak = tracemalloc.get_traced_memory()
+        allocated.append(peak - traced['start'])
+        traced['start'] = current
+        traced.setdefault('first', current)
+        tracemalloc.reset_peak()
+
+    tracemalloc.start()
+    traced['start'] = tracemalloc.get_traced_memory()[0]
+    try:
+        runner._internal_loop(runner.dev, dbus_obj, cycles=cycles, on_cycle_end=_cycle_end)
+    finally:
+        tracemalloc.stop()
+        runner.dev.close()
+
+    # the first cycle is excluded from the retained memory, because it fills the caches
+    return {
+        'allocated_bytes_per_cycle': sum(allocated) / len(allocated),
+        'retained_bytes_per_cycle': (traced['start'] - traced['first']) / max(cycles - 1, 1),
+    }
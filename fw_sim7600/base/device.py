@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 
 import signal
+import threading
 
 
 # noinspection PyPropertyDefinition
@@ -11,6 +12,7 @@ class DeviceAbs:
 
     def __init__(self):
         self._must_terminate = False
+        self._terminate_event = threading.Event()
         self._register_kill_signals()
 
     def refresh(self, reset_data=False):
@@ -30,11 +32,27 @@ class DeviceAbs:
         """ Returns the local device (eg: '/dev/ttyUSB0') used to connect to the serial device """
         raise NotImplementedError()
 
+    def close(self):
+        """
+        Release all resources used to communicate with the device.
+        """
+        pass
+
     def terminate(self):
         """
-        Send the terminate signal to all device process and loops.
+        Send the terminate signal to all device process and loops, the waits
+        in progress (see `wait_or_terminate()`) return immediately.
         """
         self._must_terminate = True
+        self._terminate_event.set()
+
+    def wait_or_terminate(self, seconds) -> bool:
+        """
+        Sleep for `seconds` or until the device is terminated.
+
+        return: True if the device must terminate
+        """
+        return self._terminate_event.wait(seconds)
 
     @property
     def must_terminate(self) -> bool:
@@ -49,7 +67,10 @@ class DeviceAbs:
         print("Device received `{}` signal. Shutdown device...".format(signo))
         # SIGINT    2   <= Ctrl+C
         # SIGTERM   15  <= kill PID
-        self.terminate()
+        self._must_terminate = True
+        # the terminate event's lock can be held by the interrupted main
+        # thread, so it's set from another thread to avoid a deadlock
+        threading.Thread(target=self.terminate, name="DeviceTerminate").start()
 
     @property
     def device_pid(self) -> "str | None":
@@ -71,3 +92,9 @@ class DeviceAbs:
     @property
     def latest_data(self) -> dict:
         raise NotImplementedError()
+
+    @property
+    def latest_samples(self) -> dict:
+        """ Returns the latest `Sample` (already parsed value) for each
+        property's code. """
+        raise NotImplementedError()
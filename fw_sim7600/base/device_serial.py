@@ -2,10 +2,15 @@
 
 import logging
 import os
+import threading
+import time
 import serial
 
 from fw_sim7600.base.device import DeviceAbs
 from fw_sim7600.base.commons import dev_type_to_code
+from fw_sim7600.base.sample import Sample
+from fw_sim7600.base.serial_conn import SerialConnection
+from fw_sim7600.base.timing import timed
 
 logger = logging.getLogger()
 
@@ -15,7 +20,7 @@ class DeviceSerial(DeviceAbs):
     Serial device base classes.
     """
 
-    def __init__(self, device: str = '/dev/ttyAMA0', speed: int = 9600, pdu_delimiter="$", device_pid_index="PID", device_type_index="Type", auto_refresh=True):
+    def __init__(self, device: str = '/dev/ttyAMA0', speed: int = 9600, pdu_delimiter="$", device_pid_index="PID", device_type_index="Type", auto_refresh=True, serial_timeout=1, props_codes: dict = None):
         super().__init__()
 
         self.device = device
@@ -26,12 +31,20 @@ class DeviceSerial(DeviceAbs):
         self._device_pid_index = device_pid_index
         self._device_type_index = device_type_index
         self._data = {}
+        self._props_codes = props_codes if props_codes is not None else {}
+        self._samples = {}
 
+        self._conn = SerialConnection(self.device, self.speed, serial_timeout)
         self._is_connected = False
         if os.path.exists(device):
-            with serial.Serial(self.device, self.speed, timeout=1) as _s:
+            try:
+                self._conn.ensure_open()
                 self._is_connected = True
+            except serial.SerialException as err:
+                logger.warning("Error opening device ({})".format(err))
         self._is_reading = False
+        self._refresh_cond = threading.Condition()
+        self._refresh_count = 0
 
         self.cached_pid = None
         self.cached_type = None
@@ -44,23 +57,79 @@ class DeviceSerial(DeviceAbs):
         """
         Reads and parse data from the serial port.
 
+        If another refresh is already in progress (eg: called from a DBus
+        method's thread), then the caller sleeps until it ends and shares his
+        result, without reading the serial port again (so his wait is not
+        recorded in the `refresh` timings).
+
         return: True if it read data successfully
         """
-        if self._is_reading:
-            while self._is_reading or self.must_terminate:
-                pass
-            if self.must_terminate:
-                return False
-            return self._is_connected
+        with self._refresh_cond:
+            if self._is_reading:
+                refresh_count = self._refresh_count
+                while self._refresh_count == refresh_count and not self.must_terminate:
+                    # woken up by the refresh's end or by `terminate()`
+                    self._refresh_cond.wait()
+                if self.must_terminate:
+                    return False
+                return self._is_connected
+            self._is_reading = True
+
+        try:
+            self._read_data(reset_data)
+        finally:
+            with self._refresh_cond:
+                self._is_reading = False
+                self._refresh_count += 1
+                self._refresh_cond.notify_all()
+        return self._is_connected
 
-        self._is_reading = True
+    @timed("refresh")
+    def _read_data(self, reset_data):
+        """ Reads and parse data from the serial port, by the refresh in progress. """
         if reset_data:
-            self._data = {}
+            self._reset_data()
         frames = self._get_data()
         self._parse_pdu(frames)
 
-        self._is_reading = False
-        return self._is_connected
+    def terminate(self):
+        super().terminate()
+        with self._refresh_cond:
+            self._refresh_cond.notify_all()
+
+    def _reset_data(self):
+        """ Clear all values read on previous refreshes. """
+        self._data = {}
+        self._samples = {}
+
+    def _set_sample(self, code, raw_value, source=None):
+        """
+        Parse the `raw_value` with the property's parser (from `props_codes`)
+        and store it as the `code`'s sample. When the raw value is the same of
+        the current sample, the parsed value is reused and only the sample's
+        timestamp is updated.
+        """
+        if raw_value is None:
+            logger.warning("Property '{}' <raw value: {}> not available, skipped.".format(code, raw_value))
+            return
+        sample = self._samples.get(code)
+        if sample is not None and sample.raw == raw_value:
+            sample.source = source
+            sample.timestamp = time.monotonic()
+            return
+
+        try:
+            parser = self._props_codes[code]['parser']
+        except KeyError:
+            logger.warning("Read unknown property code '{}' <raw value: {}>, skipped.".format(code, raw_value))
+            return
+        try:
+            self._samples[code] = Sample(code, parser(raw_value), raw_value, source)
+        except (ValueError, TypeError):
+            logger.warning("Property '{}' <{}> raw value malformed, skipped.".format(code, raw_value))
+        except Exception as err:
+            logger.warning("Unknown error on parsing property '{}': [raw value: {}] {}"
+                           .format(code, raw_value, err))
 
     @property
     def is_connected(self) -> bool:
@@ -84,38 +153,43 @@ class DeviceSerial(DeviceAbs):
         """ Returns a PDU array, one entry per line."""
         data = []
         try:
-            with serial.Serial(self.device, self.speed, timeout=1) as s:
-                self._is_connected = True
-                # Wait for start of frame
-                while not self.must_terminate:
-                    frame = s.readline()
-                    if frame.startswith(self.pdu_delimiter_bytes):
-                        break
-
-                # slurp all frames
-                frame = b''
-                while not frame.startswith(self.pdu_delimiter_bytes) and not self.must_terminate:
-                    frame = s.readline()
-                    data.append(frame)
-
-                if len(data) == 0:
-                    logger.debug("Error querying device, no data received")
-                    self._is_connected = False
-                    return []
-                if not self._find_pid(data):
-                    logger.debug("Error querying device, no PID received")
-                    self._is_connected = False
-                    return []
+            s = self._conn.ensure_open()
+            self._is_connected = True
+            # Wait for start of frame
+            while not self.must_terminate:
+                frame = s.readline()
+                if frame.startswith(self.pdu_delimiter_bytes):
+                    break
+
+            # slurp all frames
+            frame = b''
+            while not frame.startswith(self.pdu_delimiter_bytes) and not self.must_terminate:
+                frame = s.readline()
+                data.append(frame)
+
+            if len(data) == 0:
+                logger.debug("Error querying device, no data received")
+                self._is_connected = False
+                return []
+            if not self._find_pid(data):
+                logger.debug("Error querying device, no PID received")
+                self._is_connected = False
+                return []
 
-                if self.must_terminate:
-                    self._is_connected = False
+            if self.must_terminate:
+                self._is_connected = False
 
         except serial.serialutil.SerialException as err:
             logger.warning("Error querying device ({})".format(err))
+            self._conn.handle_error(err)
             self._is_connected = False
 
         return data
 
+    def close(self):
+        """ Close the serial connection. """
+        self._conn.close()
+
     @property
     def conn_device(self) -> str:
         """ Returns the local device (eg: '/dev/ttyUSB0') used to connect to the serial device """
@@ -126,6 +200,11 @@ class DeviceSerial(DeviceAbs):
         """ Returns the speed used to communicate with the serial device """
         return self.speed
 
+    @property
+    def conn_stats(self) -> dict:
+        """ Returns the serial connection's open/close/reconnect counters """
+        return self._conn.stats
+
     @property
     def device_pid(self) -> "str | None":
         """
@@ -176,3 +255,7 @@ class DeviceSerial(DeviceAbs):
     @property
     def latest_data(self) -> dict:
         return self._data
+
+    @property
+    def latest_samples(self) -> dict:
+        return self._samples
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+# Overflow policies for the `SampleQueue`
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE_LATEST = "coalesce_latest"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE_LATEST)
+
+
+class SamplesBatch:
+    """
+    Samples read by the device on a single refresh, mapped by their codes,
+    and the `time.monotonic()` of the refresh's end.
+    """
+
+    __slots__ = ('samples', 'timestamp')
+
+    def __init__(self, samples: dict, timestamp: float = None):
+        self.samples = samples
+        self.timestamp = timestamp if timestamp is not None else time.monotonic()
+
+
+class StageMetrics:
+    """
+    Counters of a pipeline's stage: processed items, time spent processing
+    them and throughput since the stage's start.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy_time = 0.0
+        self.last_time = 0.0
+        self.start_time = time.monotonic()
+
+    def add(self, elapsed: float):
+        """ Count a processed item and the seconds spent processing it. """
+        self.items += 1
+        self.busy_time += elapsed
+        self.last_time = elapsed
+
+    @property
+    def throughput(self) -> float:
+        """ Items processed per second since the stage's start. """
+        elapsed = time.monotonic() - self.start_time
+        return self.items / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def avg_time(self) -> float:
+        """ Average seconds spent processing an item. """
+        return self.busy_time / self.items if self.items > 0 else 0.0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'items': self.items,
+            'throughput': self.throughput,
+            'avg_time': self.avg_time,
+            'last_time': self.last_time,
+        }
+
+
+class SampleQueue:
+    """
+    Bounded queue of `SamplesBatch` between the device's producer and the
+    publisher.
+
+    When the queue is full, the `overflow` policy decides what to do with
+    the new batch:
+
+    * `drop_oldest`: the oldest queued batch is discarded
+    * `coalesce_latest`: the new batch's samples are merged into the newest
+      queued batch, so the latest value of each property is kept
+    """
+
+    def __init__(self, size: int, overflow: str = OVERFLOW_DROP_OLDEST):
+        if size < 1:
+            raise ValueError("Pipeline's queue size must be at least 1, got {}".format(size))
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError("Unknown pipeline's overflow policy '{}', expected one of {}"
+                             .format(overflow, ", ".join(OVERFLOW_POLICIES)))
+        self.size = size
+        self.overflow = overflow
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.max_depth = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    @property
+    def depth(self) -> int:
+        """ Number of queued batches. """
+        return len(self._items)
+
+    def put(self, batch: SamplesBatch):
+        """ Enqueue the `batch`, applying the overflow policy if the queue is full. """
+        with self._cond:
+            if len(self._items) >= self.size:
+                if self.overflow == OVERFLOW_COALESCE_LATEST:
+                    latest = self._items[-1]
+                    latest.samples.update(batch.samples)
+                    latest.timestamp = batch.timestamp
+                    self.coalesced += 1
+                    return
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(batch)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify()
+
+    def get(self) -> Optional[SamplesBatch]:
+        """ Returns the oldest batch, waiting for it. Returns None once closed and empty. """
+        with self._cond:
+            while len(self._items) == 0 and not self._closed:
+                self._cond.wait()
+            return self._items.popleft() if len(self._items) > 0 else None
+
+    def close(self):
+        """ Wake up the consumer, no more batches will be enqueued. """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'dropped': self.dropped,
+            'coalesced': self.coalesced,
+        }
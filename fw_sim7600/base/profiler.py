@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+
+import cProfile
+import io
+import logging
+import pstats
+import tracemalloc
+
+logger = logging.getLogger()
+
+# Lines of each section of the profiler's report
+PROFILE_REPORT_TOP = 25
+# Frames stored by tracemalloc for each allocation
+PROFILE_TRACEMALLOC_FRAMES = 5
+
+
+class CyclesProfiler:
+    """
+    Profiler for the main loop's cycles, it runs them under `cProfile` and
+    `tracemalloc` and takes a memory snapshot at the end of each cycle.
+
+    On exit, it writes the `<path>.pstats` file (see the `pstats` module) and
+    the `<path>.txt` report with the top functions by cumulative time, the
+    top allocation sites and the memory growth from the end of the first
+    cycle to the end of the last one.
+
+    Only the thread that enters the profiler is profiled by `cProfile`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.cycles_memory = []
+        self._profile = cProfile.Profile()
+        self._first_snapshot = None
+        self._last_snapshot = None
+
+    def __enter__(self):
+        tracemalloc.start(PROFILE_TRACEMALLOC_FRAMES)
+        self._profile.enable()
+        return self
+
+    def cycle_end(self):
+        """ Take the memory snapshot of the ended cycle. """
+        self._profile.disable()
+        # without the allocations of the snapshots themselves
+        snapshot = tracemalloc.take_snapshot().filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+        self.cycles_memory.append(tracemalloc.get_traced_memory())
+        if self._first_snapshot is None:
+            self._first_snapshot = snapshot
+        self._last_snapshot = snapshot
+        self._profile.enable()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._profile.disable()
+        tracemalloc.stop()
+        self._profile.dump_stats(self.path + ".pstats")
+        with open(self.path + ".txt", 'w') as f:
+            f.write(self.report())
+        logger.info("Profile of {} cycles written to '{}.pstats' and '{}.txt'"
+                    .format(len(self.cycles_memory), self.path, self.path))
+
+    def report(self) -> str:
+        out = io.StringIO()
+        out.write("# Cycles: {}\n\n".format(len(self.cycles_memory)))
+
+        out.write("# Top {} functions by cumulative time\n".format(PROFILE_REPORT_TOP))
+        stats = pstats.Stats(self._profile, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_REPORT_TOP)
+
+        out.write("# Traced memory at each cycle's end (current / peak bytes)\n")
+        for count, (current, peak) in enumerate(self.cycles_memory, 1):
+            out.write("{:>5}: {:>12} / {:>12}\n".format(count, current, peak))
+
+        if self._last_snapshot is not None:
+            out.write("\n# Top {} allocation sites\n".format(PROFILE_REPORT_TOP))
+            for stat in self._last_snapshot.statistics('lineno')[:PROFILE_REPORT_TOP]:
+                out.write("{}\n".format(stat))
+
+            out.write("\n# Top {} memory growths from first to last cycle\n".format(PROFILE_REPORT_TOP))
+            for stat in self._last_snapshot.compare_to(self._first_snapshot, 'lineno')[:PROFILE_REPORT_TOP]:
+                out.write("{}\n".format(stat))
+        return out.getvalue()
@@ -0,0 +1,54 @@
+#!/usr/bin/python3
+
+import time
+
+
+class CachedProperty:
+    """
+    Latest published value of a property and his publication time, as
+    `time.monotonic_ns()`.
+
+    Entries are updated in place on each publication. For the calculators,
+    the `name` and `value` fields can be read also as items (eg:
+    `property_cache['model']['value']`).
+    """
+
+    __slots__ = ('name', 'value', 'time_ns')
+
+    def __init__(self, name: str, value, time_ns: int):
+        self.name = name
+        self.value = value
+        self.time_ns = time_ns
+
+    def __getitem__(self, key):
+        if key == 'value':
+            return self.value
+        if key == 'name':
+            return self.name
+        raise KeyError(key)
+
+    def __repr__(self):
+        return "CachedProperty({}={!r})".format(self.name, self.value)
+
+
+class PropertyCache(dict):
+    """
+    Published properties' cache, it maps each property name to his
+    `CachedProperty` entry.
+    """
+
+    def set(self, name: str, value, time_ns: int = None) -> CachedProperty:
+        """ Store the property's `value`, reusing his entry if any. """
+        time_ns = time_ns if time_ns is not None else time.monotonic_ns()
+        entry = self.get(name)
+        if entry is None:
+            entry = self[name] = CachedProperty(name, value, time_ns)
+        else:
+            entry.value = value
+            entry.time_ns = time_ns
+        return entry
+
+    def age_ns(self, name: str, now_ns: int = None) -> int:
+        """ Returns the nanoseconds since the property's latest publication. """
+        now_ns = now_ns if now_ns is not None else time.monotonic_ns()
+        return now_ns - self[name].time_ns
@@ -2,17 +2,27 @@
 import os
 import sys
 import argparse
-from datetime import datetime
-import time
 import logging
+import threading
+import time
 
 from fw_sim7600.base.settings import Settings
 from fw_sim7600.base.device import DeviceAbs
-from fw_sim7600.dbus.obj import DBusObject
-from fw_sim7600.dbus.daemon import *
+from fw_sim7600.base.property_cache import PropertyCache
+from fw_sim7600.base.scheduler import FixedRateScheduler
+from fw_sim7600.base.pipeline import SampleQueue, SamplesBatch, StageMetrics
+from fw_sim7600.base.timing import TIMINGS, timed
+from fw_sim7600.base.state import StateFile
+
+# DBus modules (`pydbus` and `gi`), the logging queue and the profiler are
+# imported only when used, so the `--version` and `--help` arguments don't
+# pay their import time
 
 logger = logging.getLogger()
 
+# DBus property that notifies if the published values are the last known ones (warm start)
+STALE_PROPERTY = "data_stale"
+
 
 class DeviceRunner:
 
@@ -26,7 +36,51 @@ class DeviceRunner:
         self.device_pids = device_pids
         self.properties_codes = properties_codes
         self.properties_calculated = properties_calculated
-        self.properties_cache = {}
+        self.properties_cache = PropertyCache()
+        self._log_listener = None
+        self._pipeline = None
+        self.scheduler = None
+        self._state_file = None
+        self._warm_state = None
+        # None until the first publication, True while publishing the last known values
+        self._stale = None
+        self._restart_required = False
+        self._calc_dependents, self._calc_order = self._build_calc_graph(properties_calculated)
+        self._deadbands = {prop['name']: prop['deadband'] for prop in properties_codes.values()
+                           if 'deadband' in prop}
+        self._deadbands.update({name: prop['deadband'] for name, prop in properties_calculated.items()
+                                if 'deadband' in prop})
+
+    @staticmethod
+    def _build_calc_graph(properties_calculated) -> (dict, list):
+        """
+        Returns the reverse dependency index (property name => calculated
+        properties that depend on it) and the calculated properties sorted in
+        topological order, so each one is calculated after his dependencies.
+
+        raise: ValueError if the calculated properties have a dependency cycle
+        """
+        dependents = {}
+        depends_on = {}
+        for c_property_name, c_property in properties_calculated.items():
+            deps = c_property['depends_on']
+            deps = [deps] if isinstance(deps, str) else list(deps)
+            depends_on[c_property_name] = [dep for dep in deps if dep in properties_calculated]
+            for dep in deps:
+                dependents.setdefault(dep, []).append(c_property_name)
+
+        # Kahn's algorithm, keeping the definition's order for independent properties
+        pending = {name: len(deps) for name, deps in depends_on.items()}
+        order = [name for name, count in pending.items() if count == 0]
+        for name in order:
+            for dependent in dependents.get(name, []):
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    order.append(dependent)
+        if len(order) != len(properties_calculated):
+            cycle = [name for name in properties_calculated if name not in order]
+            raise ValueError("Dependency cycle between calculated properties: {}".format(", ".join(cycle)))
+        return dependents, order
 
     @property
     def fw_name(self):
@@ -51,10 +105,32 @@ class DeviceRunner:
                                             self.settings.get_fw_version)
 
 
+    @property
+    def env_prefix(self):
+        """ Prefix of the environment variables that override the settings (eg: `FW_SIM7600_`). """
+
+        return self.settings.get_fw_name.upper().replace(' ', '_') + '_'
+
     def cli_args(self):
-        """ Configures, parses and returns arguments from cmd line. """
+        """
+        Configures, parses and returns arguments from cmd line.
+
+        Before parsing the arguments, it loads the settings from the config
+        file (if any) and from the environment variables, so they are used as
+        arguments' defaults.
+        """
+
+        pre_parser = argparse.ArgumentParser(add_help=False)
+        pre_parser.add_argument("--config")
+        config_file = pre_parser.parse_known_args()[0].config
+        if config_file is not None:
+            self.settings.load_file(config_file)
+        self.settings.load_env(self.env_prefix)
 
         parser = argparse.ArgumentParser(description=self.settings.get_fw_desc)
+        parser.add_argument("--config", default=None,
+                            help="INI config file with a `[settings]` section "
+                                 "(default: None)")
         group01 = parser.add_argument_group()
         group01.add_argument("--port", default=self.settings.get_param_serial_port,
                              help="Serial port name "
@@ -89,27 +165,47 @@ class DeviceRunner:
                              help="Set log level to debug")
         group04.add_argument("--quiet", action="store_true",
                              help="Set log level to error")
+        group04.add_argument("--profile", type=int, default=0, metavar="N",
+                             help="Run N main loop's cycles under cProfile and tracemalloc, "
+                                  "write the report on the logs folder and exit "
+                                  "(default: 0, disabled)")
 
         return parser.parse_args()
 
 
     def init_logging(self, dev, debug, quiet):
-        """ Init and configure logging system. """
+        """
+        Init and configure logging system.
+
+        Log records are enqueued by a `QueueHandler` and written to the console
+        and to the log file by a `QueueListener` thread, so the main loop never
+        waits for the writes. The log file is rotated when it exceeds the
+        `LOGGER_FILE_MAX_BYTES` setting, keeping `LOGGER_FILE_BACKUP_COUNT`
+        rotated files.
+        """
+
+        import atexit
+        import logging.handlers
+        import queue
 
         fw_name = self.settings.get_fw_name
         fw_name_code = fw_name.lower().replace(' ', '_')
-        now_date_time = datetime.today().strftime('%Y%m%d_%H%M%S')
 
         # setup logging file directory
         logger_file_folder = self.settings.get_logger_file_folder
         if not os.path.exists(logger_file_folder):
             os.mkdir(logger_file_folder)
 
-        # setup logging file
-        logging.basicConfig(level=self.settings.get_logger_file_level,
-                            format=self.settings.get_logger_file_format,
-                            datefmt=self.settings.get_logger_file_date_format,
-                            filename=f'{logger_file_folder}/{fw_name_code}-{now_date_time}.log')
+        # setup logging file, each execution starts from a new file
+        file_handler = logging.handlers.RotatingFileHandler(f'{logger_file_folder}/{fw_name_code}.log',
+                                                            maxBytes=self.settings.get_logger_file_max_bytes,
+                                                            backupCount=self.settings.get_logger_file_backup_count,
+                                                            delay=True)
+        if os.path.exists(file_handler.baseFilename) and os.path.getsize(file_handler.baseFilename) > 0:
+            file_handler.doRollover()
+        file_handler.setLevel(self.settings.get_logger_file_level)
+        file_handler.setFormatter(logging.Formatter(self.settings.get_logger_file_format,
+                                                    datefmt=self.settings.get_logger_file_date_format))
 
         logger_console_level = self.settings.get_logger_console_level if not debug and not quiet else logging.DEBUG if debug else logging.ERROR
         logger_console_format = self.settings.get_logger_console_format if not dev else self.settings.get_logger_console_dev_format
@@ -120,9 +216,16 @@ class DeviceRunner:
         handler = logging.StreamHandler(sys.stdout)
         handler.setLevel(logger_console_level)
         handler.setFormatter(formatter)
+
+        # setup logging queue, handlers are executed by the listener's thread
+        log_queue = queue.SimpleQueue()
+        self._log_listener = logging.handlers.QueueListener(log_queue, handler, file_handler,
+                                                            respect_handler_level=True)
+        self._log_listener.start()
+        atexit.register(self.stop_logging)
         root_logger = logging.getLogger()
-        root_logger.setLevel(logger_console_level)
-        root_logger.addHandler(handler)
+        root_logger.setLevel(min(logger_console_level, self.settings.get_logger_file_level))
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 
         logger.info(self.fw_full_version)
         logger.debug("Execution mode: " + ("QUIET" if quiet else
@@ -133,8 +236,21 @@ class DeviceRunner:
         return root_logger
 
 
-    def _init_device(self, wait_connection=True, simulate_dev=False) -> DeviceAbs:
-        """ Init and configure Device. """
+    def stop_logging(self):
+        """ Writes the enqueued log records and stops the logging listener's thread. """
+
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
+
+    def _init_device(self, wait_connection=True, simulate_dev=False, first_refresh=True) -> DeviceAbs:
+        """
+        Init and configure Device.
+
+        When `first_refresh` is False (eg: on warm start), the device is
+        returned without reading his data, his first refresh is executed by
+        the main loop.
+        """
 
         port = self.settings.get_param_serial_port
         speed = self.settings.get_param_serial_speed
@@ -146,6 +262,8 @@ class DeviceRunner:
 
         logger.info("Connecting to {} device...".format(self.fw_name))
         dev = self._init_device_physical(port, speed, auto_refresh)
+        if not first_refresh:
+            return dev
         logger.debug("Read first data from device...")
         dev.refresh()
 
@@ -155,8 +273,7 @@ class DeviceRunner:
             conn_retry = self.settings.get_dev_conn_retry
             logger.warning("Device not available, retry in {} seconds. Press (Ctrl+C) to exit.".format(conn_retry))
             try:
-                while True:
-                    time.sleep(conn_retry)
+                while not dev.wait_or_terminate(conn_retry):
                     dev.refresh()
                     if not dev.is_connected and not dev.must_terminate:
                         logger.debug("Device still not available, retry in {} seconds.".format(conn_retry))
@@ -177,26 +294,50 @@ class DeviceRunner:
 
 
     @property
-    def _device_pid_info(self):
+    def _device_read_pid(self) -> "str | None":
+        """ Returns the PID read from the device, None if not read yet (eg: before his first refresh). """
         assert self.dev is not None
-        assert self.dev.device_pid is not None
-        dev_pid_info = self.device_pids[self.dev.device_pid]
+        try:
+            return self.dev.device_pid
+        except SystemError:
+            return None
+
+    @property
+    def _device_identity(self) -> dict:
+        """
+        Returns the device's `device_pid` and `device_type_code`, read from
+        the device or, on warm start until the device reads them, from the
+        state file.
+        """
+        if self._device_read_pid is None:
+            if self._warm_state is not None:
+                return self._warm_state['identity']
+            return {'device_pid': None, 'device_type_code': None}
+        return {'device_pid': self.dev.device_pid, 'device_type_code': self.dev.device_type_code}
+
+    @property
+    def _device_pid_info(self):
+        device_pid = self._device_identity['device_pid']
+        assert device_pid is not None
+        dev_pid_info = self.device_pids[device_pid]
         if dev_pid_info is None:
-            raise NotImplementedError("Device PID '{}' not recognized".format(self.dev.device_pid))
+            raise NotImplementedError("Device PID '{}' not recognized".format(device_pid))
         return dev_pid_info
 
 
-    def _init_dbus_object(self) -> DBusObject:
+    def _init_dbus_object(self) -> 'DBusObject':
         """ Init and configure DBus object. """
+        from fw_sim7600.dbus.obj import DBusObject
 
         assert self.dev is not None
 
         dbus_name = self.settings.get_param_dbus_name
         assert dbus_name != ""
-        dev_id = self.dev.device_pid
+        identity = self._device_identity
+        dev_id = identity['device_pid']
         assert dev_id is not None
         dbus_obj_path = self.settings.get_param_dbus_obj_path
-        dbus_obj_path = dbus_obj_path if dbus_obj_path != "" else "/" + self.dev.device_type_code
+        dbus_obj_path = dbus_obj_path if dbus_obj_path != "" else "/" + identity['device_type_code']
         dbus_iface = self.settings.get_param_dbus_iface
         dbus_iface = dbus_iface if dbus_iface != "" else self._device_pid_info['dbus_iface']
         dbus_obj_definition = self._device_pid_info['dbus_desc']
@@ -223,7 +364,7 @@ class DeviceRunner:
                 if str(err).find("An object is already exported") == 0:
                     publish_retry_sleep = self.settings.get_dev_publish_retry_sleep
                     logger.debug("Object already published on DBus, retry in {} seconds.".format(publish_retry_sleep))
-                    time.sleep(publish_retry_sleep)
+                    self.dev.wait_or_terminate(publish_retry_sleep)
                 else:
                     raise RuntimeError("Can't publish the object on DBus") from err
 
@@ -231,8 +372,14 @@ class DeviceRunner:
             logger.warning("Received terminate signal during Object publication on DBus, exit.")
 
 
-    def _internal_loop(self, dev, dbus_obj, development=False):
-        """ Current script's main loop. """
+    def _internal_loop(self, dev, dbus_obj, development=False, cycles=0, on_cycle_end=None):
+        """
+        Current script's main loop.
+
+        When `cycles` is greater than 0, the loop ends after that number of
+        cycles. The `on_cycle_end` method (if any) is called at the end of
+        each cycle's work, before waiting for the next one.
+        """
 
         assert self.dev is not None
 
@@ -240,7 +387,10 @@ class DeviceRunner:
         fw_name = self.settings.get_fw_name
         loop_sleep = self.settings.get_main_loop_sleep
         conn_retry = self.settings.get_dev_conn_retry
+        self.scheduler = FixedRateScheduler(loop_sleep)
         logger.info("Start {} Main Loop. Press (Ctrl+C) to quit.".format(fw_name))
+        self.scheduler.start()
+        count = 0
         while not self.dev.must_terminate:
             if loop_sleep > 0:
                 logger.info("  ==== ==== ==== ====")
@@ -251,11 +401,11 @@ class DeviceRunner:
                 # print("{}/{}# [{}CONNECTED]: {}".format(dev.device_model, dev.device_serial,
                 #                                        "" if dev.is_connected else "NOT ", dev.battery_volts))
 
-                if len(dev.latest_data) == 0:
+                if len(dev.latest_samples) == 0:
                     logger.warning("No data read, nothing to update")
                 else:
-                    for property_code in dev.latest_data:
-                        self._process_property(dev, dbus_obj, property_code, development)
+                    self._publish_samples(dbus_obj, list(dev.latest_samples.values()), development)
+                self._dump_timings()
 
             except KeyboardInterrupt:
                 logger.info("Terminating required by the user.")
@@ -267,13 +417,16 @@ class DeviceRunner:
                     traceback.print_exc()
 
             logger.debug("End fetch/pull device")
+            if on_cycle_end is not None:
+                on_cycle_end()
+            count += 1
+            if 0 < cycles <= count:
+                break
 
-            sleepTime = loop_sleep if dev.is_connected else conn_retry
+            self.scheduler.period = loop_sleep if dev.is_connected else conn_retry
             try:
-                for i in range(sleepTime):
-                    if self.dev.must_terminate:
-                        break
-                    time.sleep(1)
+                # waits for the next cycle's deadline, returns as soon as the device is terminated
+                self.scheduler.wait(self.dev.wait_or_terminate)
 
             except KeyboardInterrupt:
                 logger.info("Terminating required by the user.")
@@ -282,52 +435,277 @@ class DeviceRunner:
         logger.info(fw_name + " Main Loop terminated.")
 
 
-    def _process_property(self, dev, dbus_obj, property_code, development=False):
+    def _profile_loop(self, dev, dbus_obj, cycles, development=False):
+        """
+        Run `cycles` main loop's cycles under the `CyclesProfiler` and write
+        his report on the logs folder.
+        """
+
+        from fw_sim7600.base.profiler import CyclesProfiler
+
+        logger_file_folder = self.settings.get_logger_file_folder
+        os.makedirs(logger_file_folder, exist_ok=True)
+        path = "{}/{}-profile-{}".format(logger_file_folder,
+                                         self.settings.get_fw_name.lower().replace(' ', '_'),
+                                         time.strftime('%Y%m%d_%H%M%S'))
+        logger.info("Profile {} main loop's cycles".format(cycles))
+        with CyclesProfiler(path) as profiler:
+            self._internal_loop(dev, dbus_obj, development, cycles, profiler.cycle_end)
+
+    def _pipeline_loop(self, dev, dbus_obj, development=False):
+        """
+        Current script's main loop, on pipeline mode.
+
+        A producer thread refreshes the device and enqueues his samples on a
+        bounded `SampleQueue`, while the current thread dequeues and publishes
+        them. So a slow calculator or DBus consumer doesn't delay the next
+        device's refresh.
+        """
+
+        assert self.dev is not None
+
+        fw_name = self.settings.get_fw_name
+        samples_queue = SampleQueue(self.settings.get_pipeline_queue_size, self.settings.get_pipeline_overflow)
+        producer_metrics = StageMetrics("device")
+        publisher_metrics = StageMetrics("publisher")
+        self._pipeline = (samples_queue, producer_metrics, publisher_metrics)
+
+        producer = threading.Thread(target=self._pipeline_producer, name="DeviceProducer",
+                                    args=(dev, samples_queue, producer_metrics, development))
+        logger.info("Start {} Main Loop (pipeline mode). Press (Ctrl+C) to quit.".format(fw_name))
+        producer.start()
+        try:
+            while True:
+                batch = samples_queue.get()
+                if batch is None:
+                    break
+                start = time.monotonic()
+                try:
+                    self._publish_samples(dbus_obj, list(batch.samples.values()), development)
+                except Exception as unknown_error:
+                    logger.error("Unknown error on publishing samples: {}".format(unknown_error))
+                    if development is True:
+                        import traceback
+                        traceback.print_exc()
+                self._dump_timings()
+                end = time.monotonic()
+                publisher_metrics.add(end - start)
+                logger.debug("Pipeline: queue depth %d (max %d, dropped %d, coalesced %d), "
+                             "device %.2f/s, publisher %.2f/s, latency %.3f ms",
+                             samples_queue.depth, samples_queue.max_depth,
+                             samples_queue.dropped, samples_queue.coalesced,
+                             producer_metrics.throughput, publisher_metrics.throughput,
+                             (end - batch.timestamp) * 1000)
+
+        except KeyboardInterrupt:
+            logger.info("Terminating required by the user.")
+            self.dev.terminate()
+        finally:
+            self.dev.terminate()
+            producer.join()
+
+        logger.info(fw_name + " Main Loop terminated.")
+
+    def _pipeline_producer(self, dev, samples_queue, metrics, development=False):
+        """ Pipeline's producer: refresh the device and enqueue his samples until terminated. """
+
+        loop_sleep = self.settings.get_main_loop_sleep
+        conn_retry = self.settings.get_dev_conn_retry
+        self.scheduler = FixedRateScheduler(loop_sleep)
+        self.scheduler.start()
+        try:
+            while not dev.must_terminate:
+                start = time.monotonic()
+                try:
+                    dev.refresh(True)
+                    if len(dev.latest_samples) == 0:
+                        logger.warning("No data read, nothing to update")
+                    else:
+                        samples_queue.put(SamplesBatch(dict(dev.latest_samples)))
+                except Exception as unknown_error:
+                    logger.error("Unknown error on refreshing device: {}, retry later".format(unknown_error))
+                    if development is True:
+                        import traceback
+                        traceback.print_exc()
+                metrics.add(time.monotonic() - start)
+
+                self.scheduler.period = loop_sleep if dev.is_connected else conn_retry
+                self.scheduler.wait(dev.wait_or_terminate)
+        finally:
+            samples_queue.close()
+
+    @property
+    def pipeline_stats(self) -> dict:
+        """ Queue's and stages' metrics of the pipeline mode, empty if not running on pipeline mode. """
+
+        if self._pipeline is None:
+            return {}
+        samples_queue, producer_metrics, publisher_metrics = self._pipeline
+        return {
+            'queue': samples_queue.stats,
+            producer_metrics.name: producer_metrics.stats,
+            publisher_metrics.name: publisher_metrics.stats,
+        }
+
+    @timed("publish")
+    def _publish_samples(self, dbus_obj, samples, development=False):
+        """ Publish the device's `samples` and the calculated properties that depend on them. """
+
+        if self._stale and not self._check_warm_identity():
+            return
+
+        # all properties changed on this cycle are notified with a single DBus signal
+        with dbus_obj.batch():
+            updated = set()
+            for sample in samples:
+                if self._process_property(dbus_obj, sample, development):
+                    updated.add(self.properties_codes[sample.code]['name'])
+            self._update_calculated_properties(dbus_obj, updated, development)
+            if self._stale is not False:
+                self._end_stale(dbus_obj)
+        self._discard_failed(dbus_obj)
+        logger.debug("Published %d properties with %d DBus signals in %.3f ms",
+                     dbus_obj.last_batch_properties, dbus_obj.last_batch_signals,
+                     dbus_obj.last_batch_emit_time * 1000)
+        self._save_state()
+
+    def _discard_failed(self, dbus_obj):
+        """ Remove the properties not emitted by the latest DBus batch from
+        the properties' cache, so they are published again on next cycle. """
+
+        for property_name in dbus_obj.last_batch_failed:
+            self.properties_cache.pop(property_name, None)
+
+    def _load_warm_state(self):
+        """ Load the last known state from the `STATE_FILE` (if any), for the warm start. """
+
+        path = self.settings.get_state_file
+        if path == "":
+            return
+        self._state_file = StateFile(path, self.settings.get_state_save_interval, self.settings.get_state_max_age)
+        state = self._state_file.load()
+        if state is None:
+            return
+        identity = state['identity']
+        if identity.get('device_pid') not in self.device_pids or not identity.get('device_type_code'):
+            logger.warning("State file '{}' without a valid device identity, ignored".format(path))
+            return
+        logger.info("Warm start from the state saved at {}"
+                    .format(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(state['saved_at']))))
+        self._warm_state = state
+
+    def _publish_warm_state(self, dbus_obj):
         """
-        Get and parse the Device's property and, if it used to elaborate a
-        calculated value, the calculated value will be refreshed.
+        Publish the last known properties' values, with the `data_stale`
+        property set to True until the first refresh's publication.
+
+        Published values are stored also into the properties' cache, so after
+        the first refresh only the changed values are published again.
         """
 
-        property_value_raw = dev.latest_data[property_code]
-        if property_value_raw is None:
-            logger.warning("Property '{}' <raw value: {}> not available, skipped.".format(property_code, property_value_raw))
+        known = {prop['name'] for prop in self.properties_codes.values()}
+        known.update(self.properties_calculated.keys())
+        properties = {name: value for name, value in self._warm_state['properties'].items() if name in known}
+        with dbus_obj.batch():
+            for property_name, property_value in properties.items():
+                self.properties_cache.set(property_name, property_value)
+                dbus_obj.update_property(property_name, property_value)
+            dbus_obj.update_property(STALE_PROPERTY, True)
+        self._discard_failed(dbus_obj)
+        self._stale = True
+        logger.info("Published {} last known properties, marked as stale".format(len(properties)))
+
+    def _check_warm_identity(self) -> bool:
+        """
+        Returns True if the device read by the first refresh is the same of
+        the state file, so his samples can be published on the DBus object
+        initialized from the state file.
+
+        Otherwise, no sample is published: the state file is removed and the
+        script terminates with the `EXIT_DEVICE_CHANGED` code, so the next
+        start is a cold start with the new device's DBus object.
+        """
+
+        device_pid = self._device_read_pid
+        if device_pid is None:
+            logger.debug("Device's identity not read yet, samples not published")
+            return False
+        saved_pid = self._warm_state['identity']['device_pid']
+        if device_pid == saved_pid:
+            return True
+        logger.warning("Device changed from '{}' to '{}' since the state was saved, restart required."
+                       .format(saved_pid, device_pid))
+        self._state_file.delete()
+        self._restart_required = True
+        self.dev.terminate()
+        return False
+
+    def _end_stale(self, dbus_obj):
+        """ Publish the `data_stale` property as False, once the device read his identity. """
+
+        if self._device_read_pid is None:
+            return
+        if self._stale:
+            logger.info("First refresh published, values are up to date")
+        dbus_obj.update_property(STALE_PROPERTY, False)
+        self._stale = False
+
+    def _save_state(self, force=False):
+        """ Store the published properties' values to the `STATE_FILE` (if any), at most every `STATE_SAVE_INTERVAL`. """
+
+        if self._state_file is None or self._stale is not False or not self._state_file.is_due(force):
+            return
+        identity = self._device_identity
+        if identity['device_pid'] is None:
             return
+        self._state_file.save(identity, {name: entry.value for name, entry in self.properties_cache.items()}, force)
+
+    def _dump_timings(self):
+        """ Write the timings to the `TIMINGS_PROMETHEUS_FILE` (if any), for the Prometheus' textfile collector. """
 
+        path = self.settings.get_timings_prometheus_file
+        if not TIMINGS.enabled or path == "":
+            return
         try:
-            property_name = self.properties_codes[property_code]['name']
-            property_parser = self.properties_codes[property_code]['parser']
+            TIMINGS.dump_prometheus(path, self.settings.get_fw_name.lower().replace(' ', '_'))
+        except OSError as err:
+            logger.warning("Error writing timings to '{}' ({})".format(path, err))
+
+
+    @timed("process_property")
+    def _process_property(self, dbus_obj, sample, development=False) -> bool:
+        """
+        Publish the Device's property sample (already parsed by the device).
+
+        return: True if the property was updated, so the calculated properties
+                that depend on it must be refreshed
+        """
+
+        try:
+            property_name = self.properties_codes[sample.code]['name']
         except KeyError:
-            logger.warning("Read unknown property code '{}' <raw value: {}>, skipped.".format(property_code, property_value_raw))
-            return
+            logger.warning("Read unknown property code '{}' <value: {}>, skipped.".format(sample.code, sample.value))
+            return False
 
         try:
-            cache_enable = self.settings.get_cache_enable
-            cache_time_to_reset = self.settings.get_cache_time_to_reset
-            property_value = property_parser(property_value_raw)
-
-            # check if value is the same and it can be skipped
-            if cache_enable \
-                    and property_name in self.properties_cache \
-                    and self.properties_cache[property_name]['value'] == property_value \
-                    and (datetime.now() - self.properties_cache[property_name]['time']).total_seconds() < cache_time_to_reset:
-                return
-
-            self.properties_cache[property_name] = {
-                'name': property_name,
-                'value': property_value,
-                'time': datetime.now()
-            }
+            property_value = sample.value
+
+            # check if value is not changed (or changed less than his deadband) and it can be skipped
+            if not self._must_publish(property_name, property_value):
+                return False
+
+            self.properties_cache.set(property_name, property_value)
             dbus_obj.update_property(property_name, property_value)
-            logger.info("R ==> {:<16} = '{}'".format(property_name, str(property_value)))
-            self._update_property_derivatives(dbus_obj, property_name, development)
+            logger.info("R ==> %-16s = '%s'", property_name, property_value)
+            return True
 
         except ValueError:
-            logger.warning("Property '{}' <{}> raw value malformed, skipped.".format(property_name, property_value_raw))
+            logger.warning("Property '{}' <{}> value malformed, skipped.".format(property_name, sample.value))
             if development is True:
                 import traceback
                 traceback.print_exc()
         except TypeError:
-            logger.warning("DBus property '{}' <{}> malformed, skipped.".format(property_name, property_value_raw))
+            logger.warning("DBus property '{}' <{}> malformed, skipped.".format(property_name, sample.value))
             if development is True:
                 import traceback
                 traceback.print_exc()
@@ -339,45 +717,87 @@ class DeviceRunner:
         except KeyboardInterrupt as err:
             raise err
         except Exception as err:
-            logger.warning("Unknown error on parsing and updating property '{}': [raw value: {}] {}"
-                           .format(property_name, type(err), str(err)))
+            logger.warning("Unknown error on updating property '{}': [value: {}] {}"
+                           .format(property_name, sample.value, str(err)))
             if development is True:
                 import traceback
                 traceback.print_exc()
 
 
-    def _update_property_derivatives(self, dbus_obj, property_name, development=False):
-        """ Get and parse the Device's property and notify his update on DBus. """
+    def _must_publish(self, property_name, value) -> bool:
+        """
+        Returns True if the property's `value` must be published, comparing it
+        with the latest published value (from the properties' cache) and using
+        the property's `deadband` (if any) with following optional fields:
+
+        * `abs_tol`: numeric changes up to this absolute tolerance are skipped
+        * `rel_tol`: numeric changes up to this tolerance, relative to the
+          latest published value, are skipped
+        * `min_interval`: seconds after a publication when all changes are
+          skipped, also the ones over the tolerances (eg: to rate limit a
+          property that changes a lot on each read)
+        * `max_interval`: seconds after a publication when the value is
+          published again also if not changed (default: the
+          `CACHE_TIME_TO_RESET` setting)
+
+        Because changes are compared with the latest published value, and not
+        with the latest read one, slow drifts are published anyway once they
+        exceed the tolerance.
+        """
+        if not self.settings.get_cache_enable or property_name not in self.properties_cache:
+            return True
+
+        deadband = self._deadbands.get(property_name, {})
+        elapsed_ns = self.properties_cache.age_ns(property_name)
+        if elapsed_ns >= deadband.get('max_interval', self.settings.get_cache_time_to_reset) * 1_000_000_000:
+            return True
+        if elapsed_ns < deadband.get('min_interval', 0) * 1_000_000_000:
+            return False
+
+        last_value = self.properties_cache[property_name].value
+        if last_value == value:
+            return False
+        if isinstance(value, (int, float)) and not isinstance(value, bool) \
+                and isinstance(last_value, (int, float)) and not isinstance(last_value, bool):
+            tolerance = max(deadband.get('abs_tol', 0), deadband.get('rel_tol', 0) * abs(last_value))
+            return abs(value - last_value) > tolerance
+        return True
+
+    def _update_calculated_properties(self, dbus_obj, updated_properties, development=False):
+        """
+        Calculate the properties that depend on the `updated_properties` and
+        notify their update on DBus.
+
+        Calculated properties are evaluated in topological order, each one
+        at most once per call, and only when at least one of his dependencies
+        was updated (also by a previous calculated property).
+        """
 
-        cache_enable = self.settings.get_cache_enable
-        cache_time_to_reset = self.settings.get_cache_time_to_reset
+        updated = set(updated_properties)
+        affected = set()
+        for property_name in updated:
+            affected.update(self._calc_dependents.get(property_name, []))
 
-        for c_property_name in self.properties_calculated:
+        for c_property_name in self._calc_order:
+            if c_property_name not in affected:
+                continue
             try:
-                if property_name in self.properties_calculated[c_property_name]['depends_on']:
-                    c_property_value = self.properties_calculated[c_property_name]['calculator'](self.properties_cache)
-                    if c_property_value is None:
-                        logger.debug("No value calculated for '{}', skipped".format(c_property_name))
-                        continue
-
-                    # Check cached value
-                    if cache_enable \
-                            and c_property_name in self.properties_cache \
-                            and self.properties_cache[c_property_name]['value'] == c_property_value \
-                            and (datetime.now() - self.properties_cache[c_property_name]['time']).total_seconds() < cache_time_to_reset:
-                        logger.debug("Value cached for '{}' <{}>".format(c_property_name, c_property_value))
-                        continue
-
-                    # Update property's value
-                    self.properties_cache[c_property_name] = {
-                        'name': c_property_name,
-                        'value': c_property_value,
-                        'time': datetime.now()
-                    }
-                    # Update property
-                    dbus_obj.update_property(c_property_name, c_property_value)
-                    logger.info("C ==> {:<16} = '{}'".format(c_property_name, str(c_property_value)))
-                    self._update_property_derivatives(dbus_obj, c_property_name)
+                c_property_value = self.properties_calculated[c_property_name]['calculator'](self.properties_cache)
+                if c_property_value is None:
+                    logger.debug("No value calculated for '%s', skipped", c_property_name)
+                    continue
+
+                # Check cached value
+                if not self._must_publish(c_property_name, c_property_value):
+                    logger.debug("Value cached for '%s' <%s>", c_property_name, c_property_value)
+                    continue
+
+                # Update property's value
+                self.properties_cache.set(c_property_name, c_property_value)
+                # Update property
+                dbus_obj.update_property(c_property_name, c_property_value)
+                logger.info("C ==> %-16s = '%s'", c_property_name, c_property_value)
+                affected.update(self._calc_dependents.get(c_property_name, []))
 
             except Exception as err:
                 logger.warning("Error calculating '{}' property: {}".format(c_property_name, err))
@@ -386,18 +806,33 @@ class DeviceRunner:
                     traceback.print_exc()
 
 
-    def run(self, simulate_dev=False, development=False):
-        """ Initialize a Device to read data and a DBus Object to share collected data. """
+    def run(self, simulate_dev=False, development=False, profile_cycles=0):
+        """
+        Initialize a Device to read data and a DBus Object to share collected data.
+
+        When `profile_cycles` is greater than 0, only that number of main
+        loop's cycles are executed, under the profiler (see `_profile_loop()`).
+        """
+        from fw_sim7600.dbus.daemon import get_dbus, start_dbus_thread, stop_dbus_thread
         
         if self.dev is not None:
             raise RuntimeError("Device {} already initialized" % self.dev.settings.get_fw_name)
 
+        # From now on, settings are read from an immutable snapshot
+        if isinstance(self.settings, Settings):
+            self.settings = self.settings.snapshot()
+        TIMINGS.enabled = self.settings.get_timings_enable
+
+        # Load last known state, on warm start the device's first refresh is executed by the main loop
+        self._load_warm_state()
+        warm_start = self._warm_state is not None
+
         # Init Device
         try:
-            self.dev = self._init_device(True, simulate_dev)
+            self.dev = self._init_device(True, simulate_dev, not warm_start)
             if not self.dev.is_connected and self.dev.must_terminate:
                 exit(0)
-            if self.dev.device_type_code == "":
+            if not warm_start and self.dev.device_type_code == "":
                 logger.warning("Device not recognized, exit.")
                 exit(-1)
         except Exception as err:
@@ -442,13 +877,31 @@ class DeviceRunner:
             traceback.print_exc()
             exit(-1)
 
+        # Publish last known values
+        if warm_start:
+            try:
+                self._publish_warm_state(dbus_obj)
+            except Exception as err:
+                logger.warning("Error on publishing last known values: " + str(err))
+
         try:
-            self._internal_loop(self.dev, dbus_obj, development)
+            if profile_cycles > 0:
+                self._profile_loop(self.dev, dbus_obj, profile_cycles, development)
+            elif self.settings.get_main_loop_pipeline:
+                self._pipeline_loop(self.dev, dbus_obj, development)
+            else:
+                self._internal_loop(self.dev, dbus_obj, development)
         except Exception as err:
             logger.warning("Error on main thread: " + str(err))
             exit(-1)
+        finally:
+            self._save_state(force=True)
+            self.dev.close()
 
         try:
             stop_dbus_thread()
         except Exception as err:
             logger.warning("Error on stopping DBus threads: " + str(err))
+
+        if self._restart_required:
+            exit(self.settings.get_exit_device_changed)
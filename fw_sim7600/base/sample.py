@@ -0,0 +1,28 @@
+#!/usr/bin/python3
+
+import time
+
+
+class Sample:
+    """
+    Value of a device's property, already parsed to his final type.
+
+    Samples are created by the device when a property's value is read, so
+    consumers (eg: the `DeviceRunner`) can use the `value` without parsing
+    it again. The `raw` value is kept to skip the parsing when the device
+    reads the same raw value again, the `source` is the AT command (or the
+    stream) the value was read from and the `timestamp` is the
+    `time.monotonic()` of the latest read.
+    """
+
+    __slots__ = ('code', 'value', 'raw', 'source', 'timestamp')
+
+    def __init__(self, code: str, value, raw=None, source: str = None, timestamp: float = None):
+        self.code = code
+        self.value = value
+        self.raw = raw
+        self.source = source
+        self.timestamp = timestamp if timestamp is not None else time.monotonic()
+
+    def __repr__(self):
+        return "Sample({}={!r}, source={})".format(self.code, self.value, self.source)
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+
+import logging
+import time
+from typing import Callable
+
+logger = logging.getLogger()
+
+
+class FixedRateScheduler:
+    """
+    Fixed-rate scheduler for the main loop's cycles.
+
+    Each cycle starts on an absolute deadline of the `time.monotonic()`
+    clock, the previous deadline plus the `period` (also fractional, eg:
+    0.5 seconds), so the cycle's work time doesn't add to the period and the
+    loop doesn't drift. The `period` can be changed between cycles (eg: when
+    the device is disconnected).
+
+    When a cycle takes longer than his period (an overrun), the next cycle
+    starts immediately and the missed deadlines are skipped, so the cycles
+    keep their phase without bursts to catch up. Overruns are counted in the
+    `stats`, only the ones longer than all the previous are logged as
+    warnings.
+    """
+
+    def __init__(self, period: float, clock: Callable[[], float] = time.monotonic):
+        self.period = period
+        self._clock = clock
+        self._deadline = None
+        self.cycles = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_lateness = 0.0
+        self.max_lateness = 0.0
+
+    def start(self):
+        """ Set the current time as the first cycle's deadline. """
+        self._deadline = self._clock()
+
+    def next_timeout(self) -> float:
+        """
+        Move to the next cycle's deadline and returns the seconds to wait
+        for it, 0 if the current cycle overran his period.
+        """
+        now = self._clock()
+        if self._deadline is None:
+            self._deadline = now
+        self.cycles += 1
+        if self.period <= 0:
+            self._deadline = now
+            return 0.0
+
+        self._deadline += self.period
+        lateness = now - self._deadline
+        if lateness < 0:
+            return -lateness
+
+        # overrun, skip the missed deadlines keeping the cycles' phase
+        skipped = int(lateness // self.period)
+        self._deadline += skipped * self.period
+        self.overruns += 1
+        self.skipped += skipped
+        self.last_lateness = lateness
+        level = logging.WARNING if lateness > self.max_lateness else logging.DEBUG
+        self.max_lateness = max(self.max_lateness, lateness)
+        logger.log(level, "Main loop overrun by %.3f s (period %.3f s, %d cycles skipped, %d overruns)",
+                   lateness, self.period, skipped, self.overruns)
+        return 0.0
+
+    def wait(self, wait_method: Callable[[float], bool]) -> bool:
+        """
+        Wait for the next cycle's deadline with the `wait_method` (eg: the
+        `DeviceAbs.wait_or_terminate()`) and returns his result.
+        """
+        return wait_method(self.next_timeout())
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'cycles': self.cycles,
+            'overruns': self.overruns,
+            'skipped': self.skipped,
+            'last_lateness': self.last_lateness,
+            'max_lateness': self.max_lateness,
+        }
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+
+import logging
+import time
+from typing import Optional
+
+import serial
+
+logger = logging.getLogger()
+
+
+class SerialConnection:
+    """
+    Long-lived serial connection owned by a device.
+
+    The serial port is opened once and kept open between devices' refreshes.
+    When an error occurs, the owner must call the `handle_error()` method: the
+    port is closed and reopened by the next `ensure_open()` call, after a
+    backoff time that doubles on each failed attempt (from `backoff_min` up to
+    `backoff_max` seconds).
+    """
+
+    def __init__(self, device: str, speed: int, timeout: float = 1,
+                 backoff_min: float = 0.5, backoff_max: float = 30.0):
+        self.device = device
+        self.speed = speed
+        self.timeout = timeout
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+
+        self._serial: Optional[serial.Serial] = None
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+
+        self.open_count = 0
+        self.close_count = 0
+        self.reconnect_count = 0
+        self.error_count = 0
+
+    @property
+    def is_open(self) -> bool:
+        """ Returns True if the serial port is currently open. """
+        return self._serial is not None and self._serial.is_open
+
+    @property
+    def stats(self) -> dict:
+        """ Returns the connection's counters. """
+        return {
+            'open_count': self.open_count,
+            'close_count': self.close_count,
+            'reconnect_count': self.reconnect_count,
+            'error_count': self.error_count,
+        }
+
+    def ensure_open(self) -> serial.Serial:
+        """
+        Returns the open serial port, opening it if required.
+
+        raise: serial.SerialException if the port can't be opened or if the
+               backoff time after latest error is not expired yet
+        """
+        if self.is_open:
+            return self._serial
+
+        now = time.monotonic()
+        if now < self._next_attempt:
+            raise serial.SerialException(
+                "Serial port '{}' not available, retry in {:.1f} seconds"
+                .format(self.device, self._next_attempt - now))
+
+        try:
+            self._serial = serial.Serial(self.device, self.speed, timeout=self.timeout)
+        except serial.SerialException:
+            self._serial = None
+            self.error_count += 1
+            self._schedule_retry()
+            raise
+
+        self.open_count += 1
+        if self.open_count > 1:
+            self.reconnect_count += 1
+            logger.info("Serial port '{}' reconnected".format(self.device))
+        self._backoff = 0.0
+        self._next_attempt = 0.0
+        return self._serial
+
+    def handle_error(self, err: Exception):
+        """ Close the serial port after an error, it will be reopened later. """
+        if self._serial is None:
+            # error raised by `ensure_open()`, retry already scheduled
+            return
+        self.error_count += 1
+        logger.debug("Serial port '{}' error ({}), close it".format(self.device, err))
+        self.close()
+        self._schedule_retry()
+
+    def close(self):
+        """ Close the serial port, if open. """
+        if self._serial is None:
+            return
+        try:
+            self._serial.close()
+        except serial.SerialException as err:
+            logger.debug("Error closing serial port '{}' ({})".format(self.device, err))
+        self._serial = None
+        self.close_count += 1
+
+    def _schedule_retry(self):
+        self._backoff = min(self._backoff * 2, self.backoff_max) if self._backoff > 0 else self.backoff_min
+        self._next_attempt = time.monotonic() + self._backoff
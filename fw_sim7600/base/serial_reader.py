@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+
+import logging
+import threading
+from typing import Callable, Optional
+
+import serial
+
+logger = logging.getLogger()
+
+
+class SerialReader:
+    """
+    Background reader for serial ports that receive unsolicited messages.
+
+    A dedicated thread reads all bytes from the serial port and splits them in
+    lines: lines starting with one of the `urc_prefixes` are passed to the
+    `on_urc` callback, all others are buffered for the commands' responses.
+
+    The object exposes the `write()`, `read()`, `in_waiting` and
+    `reset_input_buffer()` members of the `serial.Serial` class, so it can
+    replace the serial port for methods that send commands and read their
+    responses (eg: `Device.send_at()`). Errors raised by the serial port in
+    the reader thread are raised again by those members.
+    """
+
+    def __init__(self, ser: serial.Serial, urc_prefixes: "tuple[bytes, ...]",
+                 on_urc: Callable[[bytes], None]):
+        self.ser = ser
+        self.timeout = ser.timeout
+        self.urc_prefixes = urc_prefixes
+        self._on_urc = on_urc
+
+        self._buffer = b''
+        self._line = b''
+        self._error: Optional[Exception] = None
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        """ Returns True if the reader thread is running. """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """ Start the reader thread. """
+        self._running = True
+        self._thread = threading.Thread(target=self._read_loop, name="SerialReader", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stop the reader thread and wait for his termination. """
+        self._running = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def write(self, data: bytes) -> int:
+        self._raise_error()
+        return self.ser.write(data)
+
+    @property
+    def in_waiting(self) -> int:
+        self._raise_error()
+        return len(self._buffer)
+
+    def read(self, size: int = 1) -> bytes:
+        """ Read up to `size` bytes, waiting at most `timeout` seconds. """
+        with self._cond:
+            if len(self._buffer) == 0 and self._error is None:
+                self._cond.wait(self.timeout)
+            self._raise_error()
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def reset_input_buffer(self):
+        with self._cond:
+            self._buffer = b''
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _read_loop(self):
+        while self._running:
+            try:
+                chunk = self.ser.read(self.ser.in_waiting or 1)
+            except (serial.SerialException, OSError, TypeError) as err:
+                # TypeError is raised by pyserial when the port is closed
+                # while reading
+                if self._running:
+                    logger.debug("Serial reader error ({})".format(err))
+                    with self._cond:
+                        self._error = err if isinstance(err, serial.SerialException) \
+                            else serial.SerialException(str(err))
+                        self._cond.notify_all()
+                return
+            if chunk:
+                self._process(chunk)
+
+    def _process(self, chunk: bytes):
+        self._line += chunk
+        responses = b''
+        while b'\n' in self._line:
+            line, self._line = self._line.split(b'\n', 1)
+            line += b'\n'
+            if line.strip().startswith(self.urc_prefixes):
+                self._dispatch_urc(line)
+            else:
+                responses += line
+        # forward partial lines, unless they can be the begin of an URC
+        partial = self._line.lstrip()
+        if partial and not any(prefix.startswith(partial) or partial.startswith(prefix)
+                               for prefix in self.urc_prefixes):
+            responses += self._line
+            self._line = b''
+
+        if responses:
+            with self._cond:
+                self._buffer += responses
+                self._cond.notify_all()
+
+    def _dispatch_urc(self, line: bytes):
+        try:
+            self._on_urc(line)
+        except Exception as err:
+            logger.warning("Error processing unsolicited message {}: {}".format(line, err))
+
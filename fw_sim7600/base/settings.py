@@ -1,4 +1,13 @@
+import configparser
 import logging
+import os
+
+# Section of the config file that contains the settings
+CONFIG_FILE_SECTION = "settings"
+
+# Values accepted as `True` by boolean settings from the config file or the environment
+TRUE_STRINGS = frozenset(("1", "true", "yes", "on"))
+
 
 class Settings:
 
@@ -24,7 +33,8 @@ class Settings:
 
     # Enable local cache for properties (default: True)
     CACHE_ENABLE = "cache_enable"
-    # Maximum time a property can be stored on the cache before sending his value again. (default: 300)
+    # Maximum time a property can be stored on the cache before sending his value again. It applies only to
+    # properties without a `deadband`, or without the `max_interval` field in their `deadband` (default: 300)
     CACHE_TIME_TO_RESET = "cache_time_to_reset"
 
     # Log level for console messages (default: logging.WARN)
@@ -45,14 +55,47 @@ class Settings:
     LOGGER_FILE_FORMAT = "logger_file_format"
     # Format for logging date on file (default: "%Y-%m-%d %H:%M:%S")
     LOGGER_FILE_DATE_FORMAT = "logger_file_format_date"
+    # Max size in bytes of the log file before rotating it, 0 to disable the rotation (default: 1048576)
+    LOGGER_FILE_MAX_BYTES = "logger_file_max_bytes"
+    # Number of rotated log files kept, older ones are deleted (default: 5)
+    LOGGER_FILE_BACKUP_COUNT = "logger_file_backup_count"
 
     # Seconds between each device connection retry (default: 5)
     DEV_CONN_RETRY = "dev_connection_retry"
     # Seconds between each publish retry (default: 30)
     DEV_PUBLISH_RETRY_SLEEP = "dev_publish_retry_sleep"
 
-    # Seconds between each main loop iteration (default: 10)
+    # GNSS session policy: "always_on", "idle_timeout" or "per_cycle" (default: "per_cycle")
+    DEV_GNSS_SESSION = "dev_gnss_session"
+    # Seconds with an unchanged GNSS position before stopping the GNSS session, and then before restarting it, used by the "idle_timeout" policy (default: 60)
+    DEV_GNSS_SESSION_IDLE_TIMEOUT = "dev_gnss_session_idle_timeout"
+    # Seconds between each GNSS auto-report, 0 to poll the GNSS data (default: 0)
+    DEV_GNSS_AUTO_REPORT = "dev_gnss_auto_report"
+    # Serial port that streams the NMEA sentences, empty to read the GNSS data from the AT port (default: "")
+    DEV_NMEA_PORT = "dev_nmea_port"
+    # Serial port speed for the NMEA port (default: 115200)
+    DEV_NMEA_SPEED = "dev_nmea_speed"
+
+    # Seconds between the start of each main loop iteration, also fractional (eg: 0.5) (default: 10)
     MAIN_LOOP_SLEEP = "main_loop_sleep"
+    # Run the device's refresh and the DBus publication on separated threads, linked by a queue (default: False)
+    MAIN_LOOP_PIPELINE = "main_loop_pipeline"
+    # Max refreshes queued on pipeline mode (default: 4)
+    PIPELINE_QUEUE_SIZE = "pipeline_queue_size"
+    # Pipeline's queue overflow policy: "drop_oldest" or "coalesce_latest" (default: "coalesce_latest")
+    PIPELINE_OVERFLOW = "pipeline_overflow"
+
+    # File where the latest published values are stored and published on startup (warm start), empty to disable (default: "")
+    STATE_FILE = "state_file"
+    # Min seconds between the state file's updates (default: 60)
+    STATE_SAVE_INTERVAL = "state_save_interval"
+    # Max age in seconds of the state file to publish his values on startup, 0 for no limit (default: 3600)
+    STATE_MAX_AGE = "state_max_age"
+
+    # Record the durations of the AT commands and of the main loop's stages (default: False)
+    TIMINGS_ENABLE = "timings_enable"
+    # File where the timings are written on each cycle in the Prometheus text format, empty to disable (default: "")
+    TIMINGS_PROMETHEUS_FILE = "timings_prometheus_file"
 
     # Exit code for success (default: 0)
     EXIT_SUCCESS = "exit_success"
@@ -62,17 +105,87 @@ class Settings:
     EXIT_INIT_ERROR_DEV = "exit_init_error_dev"
     # Exit code for DBus initialization error (default: 3)
     EXIT_INIT_ERROR_DBUS = "exit_init_error_dbus"
+    # Exit code for device changed since the warm start's state was saved, restart required (default: 4)
+    EXIT_DEVICE_CHANGED = "exit_device_changed"
+    # Exit code for calculated properties with a dependency cycle (default: 5)
+    EXIT_INIT_ERROR_PROPS = "exit_init_error_props"
 
     def __init__(self, values: dict):
         self.custom_vals = values
         self.default_vals = DEFAULT_SETTINGS
 
+    @classmethod
+    def names(cls) -> dict:
+        """ Returns the settings' names (eg: `MAIN_LOOP_SLEEP`) mapped to their keys. """
+        return {name: key for name, key in vars(cls).items()
+                if name.isupper() and key in DEFAULT_SETTINGS}
+
     def _get_setting(self, key):
         val = self.custom_vals.get(key, self.default_vals.get(key, None))
         if val is None:
             raise ValueError("Option '{}' not found".format(key))
         return val
 
+    def _cast(self, key, value: str):
+        """ Converts a string value to the type of the current setting's value. """
+        current = self.custom_vals.get(key, self.default_vals.get(key, None))
+        if isinstance(current, bool):
+            return value.strip().lower() in TRUE_STRINGS
+        if isinstance(current, int):
+            # log levels can be set also by name (eg: `DEBUG`)
+            level = logging.getLevelName(value.strip().upper())
+            if isinstance(level, int):
+                return level
+            try:
+                return int(value)
+            except ValueError:
+                # seconds can be fractional (eg: `dev_conn_retry = 2.5`)
+                return float(value)
+        if isinstance(current, float):
+            return float(value)
+        return value
+
+    def load_file(self, path: str):
+        """
+        Loads the settings from the `[settings]` section of an INI config
+        file, using the settings' names as keys (eg: `main_loop_sleep = 5`).
+
+        Loaded values override the current ones.
+        """
+        parser = configparser.ConfigParser(interpolation=None)
+        if not parser.read(path):
+            raise FileNotFoundError("Config file '{}' not found".format(path))
+        if not parser.has_section(CONFIG_FILE_SECTION):
+            raise ValueError("Config file '{}' without the '[{}]' section".format(path, CONFIG_FILE_SECTION))
+        names = self.names()
+        for option, value in parser.items(CONFIG_FILE_SECTION):
+            key = names.get(option.upper())
+            if key is None:
+                raise ValueError("Unknown option '{}' in config file '{}'".format(option, path))
+            self.custom_vals[key] = self._cast(key, value)
+
+    def load_env(self, prefix: str, environ: dict = None):
+        """
+        Loads the settings from the environment variables named as the
+        settings' names with the given `prefix` (eg: `FW_SIM7600_MAIN_LOOP_SLEEP`).
+
+        Loaded values override the current ones.
+        """
+        environ = environ if environ is not None else os.environ
+        for name, key in self.names().items():
+            value = environ.get(prefix + name)
+            if value is not None:
+                self.custom_vals[key] = self._cast(key, value)
+
+    def snapshot(self) -> 'SettingsSnapshot':
+        """ Resolves the current settings' values into an immutable snapshot. """
+        values = {}
+        for name, key in self.names().items():
+            val = self.custom_vals.get(key, self.default_vals.get(key, None))
+            if val is not None:
+                values["get_" + name.lower()] = val
+        return SettingsSnapshot(values)
+
     def __getattr__(self, name):
         if name.startswith("get_"):
             key = name[4:].upper()
@@ -81,6 +194,31 @@ class Settings:
         raise AttributeError(f"'Settings' object has no attribute '{name}'")
 
 
+class SettingsSnapshot:
+    """
+    Immutable settings' values, resolved once by `Settings.snapshot()`.
+
+    Values are read with the same `get_xxx` names of the `Settings` class,
+    but as plain attributes, so they don't need the `Settings.__getattr__()`
+    lookup on each read.
+    """
+
+    def __init__(self, values: dict):
+        self.__dict__.update(values)
+
+    def __getattr__(self, name):
+        # called only for not resolved values
+        if name.startswith("get_") and hasattr(Settings, name[4:].upper()):
+            raise ValueError("Option '{}' not found".format(getattr(Settings, name[4:].upper())))
+        raise AttributeError(f"'SettingsSnapshot' object has no attribute '{name}'")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Settings' snapshot is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Settings' snapshot is immutable")
+
+
 DEFAULT_SETTINGS = {
     Settings.FW_GROUP: None,
     Settings.FW_NAME: None,
@@ -105,14 +243,33 @@ DEFAULT_SETTINGS = {
     Settings.LOGGER_FILE_LEVEL: logging.INFO,
     Settings.LOGGER_FILE_FORMAT: "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     Settings.LOGGER_FILE_DATE_FORMAT: "%Y-%m-%d %H:%M:%S",
+    Settings.LOGGER_FILE_MAX_BYTES: 1024 * 1024,
+    Settings.LOGGER_FILE_BACKUP_COUNT: 5,
 
     Settings.DEV_CONN_RETRY: 5,
     Settings.DEV_PUBLISH_RETRY_SLEEP: 30,
+    Settings.DEV_GNSS_SESSION: "per_cycle",
+    Settings.DEV_GNSS_SESSION_IDLE_TIMEOUT: 60,
+    Settings.DEV_GNSS_AUTO_REPORT: 0,
+    Settings.DEV_NMEA_PORT: "",
+    Settings.DEV_NMEA_SPEED: 115200,
 
     Settings.MAIN_LOOP_SLEEP: 10,
+    Settings.MAIN_LOOP_PIPELINE: False,
+    Settings.PIPELINE_QUEUE_SIZE: 4,
+    Settings.PIPELINE_OVERFLOW: "coalesce_latest",
+
+    Settings.STATE_FILE: "",
+    Settings.STATE_SAVE_INTERVAL: 60,
+    Settings.STATE_MAX_AGE: 3600,
+
+    Settings.TIMINGS_ENABLE: False,
+    Settings.TIMINGS_PROMETHEUS_FILE: "",
 
     Settings.EXIT_SUCCESS: 0,
     Settings.EXIT_INIT_TERMINATED: 1,
     Settings.EXIT_INIT_ERROR_DEV: 2,
-    Settings.EXIT_INIT_ERROR_DBUS: 3
+    Settings.EXIT_INIT_ERROR_DBUS: 3,
+    Settings.EXIT_DEVICE_CHANGED: 4,
+    Settings.EXIT_INIT_ERROR_PROPS: 5
 }
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+logger = logging.getLogger()
+
+# Version of the state file's format, files with other versions are ignored
+STATE_FORMAT = 1
+
+
+class StateFile:
+    """
+    Local JSON file with the latest published properties' values and the
+    device's identity (`device_pid` and `device_type_code`), used by the
+    `DeviceRunner` to publish the last known values on startup (warm start).
+
+    The file is written at most once every `save_interval` seconds (the
+    `force` argument skips this limit, eg: on shutdown) and it's replaced
+    atomically: the new content is synced to the disk before the rename, and
+    the rename before returning, so a power loss never leaves a partial file.
+    """
+
+    def __init__(self, path: str, save_interval: float = 60, max_age: float = 0):
+        self.path = path
+        self.save_interval = save_interval
+        self.max_age = max_age
+        self._last_save = None
+
+    def load(self) -> Optional[dict]:
+        """
+        Returns the stored state, with the `identity`, `properties` and
+        `saved_at` (as `time.time()`) fields, or None if the file is missing,
+        not valid or older than `max_age` seconds (when `max_age` > 0).
+        """
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            logger.warning("Error reading state file '{}' ({}), ignored".format(self.path, err))
+            return None
+
+        if not isinstance(state, dict) or state.get('format') != STATE_FORMAT \
+                or not isinstance(state.get('identity'), dict) or not isinstance(state.get('properties'), dict):
+            logger.warning("State file '{}' not valid, ignored".format(self.path))
+            return None
+        age = time.time() - state.get('saved_at', 0)
+        if 0 < self.max_age < age:
+            logger.info("State file '{}' older than {} seconds, ignored".format(self.path, self.max_age))
+            return None
+        return state
+
+    def is_due(self, force=False) -> bool:
+        """ Returns True if the `save_interval` elapsed since the latest save (or if `force` is true). """
+        return force or self._last_save is None or time.monotonic() - self._last_save >= self.save_interval
+
+    def save(self, identity: dict, properties: dict, force=False) -> bool:
+        """ Store the `identity` and the `properties` values, returns True if the file was written. """
+        if not self.is_due(force):
+            return False
+
+        state = {
+            'format': STATE_FORMAT,
+            'saved_at': time.time(),
+            'identity': identity,
+            'properties': properties,
+        }
+        folder = os.path.dirname(self.path)
+        tmp_path = self.path + ".tmp"
+        try:
+            if folder != "":
+                os.makedirs(folder, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            _fsync_folder(folder)
+        except (OSError, TypeError, ValueError) as err:
+            logger.warning("Error writing state file '{}' ({})".format(self.path, err))
+            return False
+        self._last_save = time.monotonic()
+        return True
+
+    def delete(self):
+        """ Remove the state file, so next startup is a cold start. """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            logger.warning("Error removing state file '{}' ({})".format(self.path, err))
+
+
+def _fsync_folder(folder: str):
+    """ Sync the `folder`'s entries (eg: a renamed file) to the disk. """
+    fd = os.open(folder if folder != "" else ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+# Durations kept by each histogram to compute his percentiles
+TIMINGS_WINDOW = 1024
+
+
+class RollingHistogram:
+    """
+    Durations of a timed stage: total count and sum, plus the latest
+    `window` durations used to compute the percentiles and the max.
+    """
+
+    __slots__ = ('count', 'sum', '_window')
+
+    def __init__(self, window: int = TIMINGS_WINDOW):
+        self.count = 0
+        self.sum = 0.0
+        self._window = deque(maxlen=window)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        self._window.append(seconds)
+
+    @property
+    def stats(self) -> dict:
+        """ Returns the `count`, `sum`, `p50`, `p95`, `p99` and `max` durations, in seconds. """
+        values = sorted(self._window)
+        if len(values) == 0:
+            return {'count': self.count, 'sum': self.sum, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0, 'max': 0.0}
+        last = len(values) - 1
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'p50': values[round(last * 0.50)],
+            'p95': values[round(last * 0.95)],
+            'p99': values[round(last * 0.99)],
+            'max': values[last],
+        }
+
+
+class Timings:
+    """
+    Registry of the `RollingHistogram` of each timed stage, optionally
+    labelled with the AT command (eg: `send_at:AT+CSQ`).
+
+    Timings are recorded only when `enabled`, so the disabled timing layer
+    costs a single attribute check per call.
+    """
+
+    def __init__(self, window: int = TIMINGS_WINDOW):
+        self.enabled = False
+        self.window = window
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, command: str = None):
+        key = (stage, command)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = RollingHistogram(self.window)
+            histogram.add(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    @property
+    def stats(self) -> dict:
+        """ Returns the stats of each histogram, by `stage` or `stage:command` name. """
+        with self._lock:
+            return {stage if command is None else "{}:{}".format(stage, command): histogram.stats
+                    for (stage, command), histogram in self._histograms.items()}
+
+    def prometheus_text(self, prefix: str) -> str:
+        """
+        Returns all histograms in the Prometheus text format, as a summary
+        with the `stage` (and `command`) labels, plus a gauge for the max.
+        """
+        name = prefix + "_timing_seconds"
+        lines = ["# HELP {} Duration of the timed stages.".format(name),
+                 "# TYPE {} summary".format(name)]
+        max_lines = ["# HELP {}_max Max duration of the timed stages, on the latest {} calls."
+                     .format(name, self.window),
+                     "# TYPE {}_max gauge".format(name)]
+        with self._lock:
+            items = [(stage, command, histogram.stats) for (stage, command), histogram in self._histograms.items()]
+        for stage, command, stats in sorted(items, key=lambda item: (item[0], item[1] or "")):
+            labels = 'stage="{}"'.format(_escape_label(stage))
+            if command is not None:
+                labels += ',command="{}"'.format(_escape_label(command))
+            for stat, quantile in (('p50', '0.5'), ('p95', '0.95'), ('p99', '0.99')):
+                lines.append('{}{{{},quantile="{}"}} {:.9f}'.format(name, labels, quantile, stats[stat]))
+            lines.append('{}_sum{{{}}} {:.9f}'.format(name, labels, stats['sum']))
+            lines.append('{}_count{{{}}} {}'.format(name, labels, stats['count']))
+            max_lines.append('{}_max{{{}}} {:.9f}'.format(name, labels, stats['max']))
+        return "\n".join(lines + max_lines) + "\n"
+
+    def dump_prometheus(self, path: str, prefix: str):
+        """
+        Write the `prometheus_text()` to `path`, replacing it atomically so
+        a textfile collector never reads a partial file.
+        """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.prometheus_text(prefix))
+        os.replace(tmp_path, path)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Timings of the current process
+TIMINGS = Timings()
+
+
+def timed(stage: str, command: Optional[Callable[..., str]] = None):
+    """
+    Decorator that records the decorated function's durations on the
+    `TIMINGS` registry, as `stage`. The optional `command` function receives
+    the call's arguments and returns the AT command to label the duration.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TIMINGS.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TIMINGS.record(stage, time.perf_counter() - start,
+                               command(*args, **kwargs) if command is not None else None)
+        return wrapper
+    return decorator
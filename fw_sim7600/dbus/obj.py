@@ -1,8 +1,12 @@
 #!/usr/bin/python3
 
 import logging
+import time
+from contextlib import contextmanager
 from pydbus.generic import signal
 
+from fw_sim7600.base.timing import TIMINGS, timed
+
 
 logger = logging.getLogger()
 
@@ -18,6 +22,14 @@ class DBusObject:
         self.dbus_iface = dbus_iface
         self.dbus_obj_definition = dbus_obj_definition
         self._cached_properties = {} if enable_cache else None
+        self._batch = None
+        self.signals_count = 0
+        self.properties_count = 0
+        self.emit_time_total = 0.0
+        self.last_batch_signals = 0
+        self.last_batch_properties = 0
+        self.last_batch_emit_time = 0.0
+        self.last_batch_failed = set()
 
     def publish(self, dbus):
         logger.info(
@@ -26,6 +38,7 @@ class DBusObject:
         dbus_obj_pub = self.dbus_obj_path, self, self.dbus_obj_definition
         dbus.publish(self.dbus_name, dbus_obj_pub)
 
+    @timed("update_property")
     def update_property(self, property_name, value):
         if self._cached_properties is not None:
             if property_name in self._cached_properties:
@@ -35,11 +48,101 @@ class DBusObject:
 
         logger.debug("Object '{}' property update '{}.{} = {}'."
                      .format(self.dbus_obj_path, self.dbus_iface, property_name, value))
+        if self._batch is not None:
+            self._batch[property_name] = value
+            return
+
         try:
-            self.PropertiesChanged(self.dbus_iface, {property_name: value}, [])
+            self._emit({property_name: value})
         except KeyError as err:
             raise NameError("Property {} not registered on current DBUs iface".format(err)) from err
 
+    @contextmanager
+    def batch(self):
+        """
+        Collect all properties updated inside the `with` block and notify
+        them with a single `PropertiesChanged` signal at the block's end.
+
+        Properties not registered on current DBus iface are skipped (with a
+        warning), so they don't prevent the notification of the others. On
+        any other emit's error (eg: a value not convertible to his DBus type),
+        the properties are notified one by one and the failed ones are stored
+        into `last_batch_failed`.
+        """
+        if self._batch is not None:
+            # nested batch, the outer one emits the signal
+            yield
+            return
+
+        self._batch = {}
+        signals_count, emit_time_total = self.signals_count, self.emit_time_total
+        try:
+            yield
+        finally:
+            changed, self._batch = self._batch, None
+            failed = set()
+            while len(changed) > 0:
+                try:
+                    self._emit(changed)
+                    break
+                except KeyError as err:
+                    if len(err.args) > 0 and err.args[0] in changed:
+                        logger.warning("Property '{}' not used by current DBus object definition, skipped."
+                                       .format(err.args[0]))
+                        del changed[err.args[0]]
+                        continue
+                    error = err
+                except Exception as err:
+                    error = err
+                logger.warning("Error emitting {} changed properties ({}), emit them one by one."
+                               .format(len(changed), error))
+                changed = self._emit_each(changed, failed)
+                break
+            self.last_batch_failed = failed
+            self.last_batch_signals = self.signals_count - signals_count
+            self.last_batch_properties = len(changed)
+            self.last_batch_emit_time = self.emit_time_total - emit_time_total
+
+    def _emit_each(self, changed: dict, failed: set) -> dict:
+        """ Emit a signal for each changed property, returns the emitted ones
+        and adds the others to `failed`. """
+        emitted = {}
+        for property_name, value in changed.items():
+            try:
+                self._emit({property_name: value})
+                emitted[property_name] = value
+            except Exception as err:
+                logger.warning("DBus property '{}' <{}> malformed, skipped ({})."
+                               .format(property_name, value, err))
+                failed.add(property_name)
+        return emitted
+
+    def _emit(self, changed: dict):
+        start = time.perf_counter()
+        self.PropertiesChanged(self.dbus_iface, changed, [])
+        self.emit_time_total += time.perf_counter() - start
+        self.signals_count += 1
+        self.properties_count += len(changed)
+
+    @property
+    def stats(self) -> dict:
+        """ Returns the emitted `PropertiesChanged` signals counters, total
+        and for the latest batch. """
+        return {
+            'signals_count': self.signals_count,
+            'properties_count': self.properties_count,
+            'emit_time_total': self.emit_time_total,
+            'last_batch_signals': self.last_batch_signals,
+            'last_batch_properties': self.last_batch_properties,
+            'last_batch_emit_time': self.last_batch_emit_time,
+        }
+
+    def get_timings(self) -> dict:
+        """ DBus method, returns the timed stages' histograms (empty if the
+        timings are disabled). """
+        return {name: {stat: float(value) for stat, value in stats.items()}
+                for name, stats in TIMINGS.stats.items()}
+
     def __getattr__(self, attr):
         if attr not in self.__dict__:
             return getattr(self._obj, attr)
@@ -159,14 +159,29 @@ DEV_DBUS_DESC_SIM7600 = '''<node>
       <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
        value="true"/>
     </property>
+    <property name="pos_gnss_sat_snr" type="a{{si}}" access="read">
+      <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+       value="true"/>
+    </property>
+    <property name="pos_gnss_sat_in_view" type="i" access="read">
+      <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+       value="true"/>
+    </property>
     
     <property name="power_module_state" type="b" access="read">
       <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
        value="true"/>
     </property>
+    <property name="data_stale" type="b" access="read">
+      <annotation name="org.freedesktop.DBus.Property.EmitsChangedSignal"
+       value="true"/>
+    </property>
     <method name="power_module">
       <arg direction="in" name="value" type="b"/>
     </method>
+    <method name="get_timings">
+      <arg direction="out" name="timings" type="a{{sa{{sd}}}}"/>
+    </method>
     
   </interface>
 </node>
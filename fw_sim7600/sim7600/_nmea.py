@@ -0,0 +1,195 @@
+#!/usr/bin/python3
+
+from typing import Callable, Iterable, Iterator
+
+
+# NMEA talker ids mapped to the GNSS system used as satellites' count key
+
+NMEA_TALKERS_SYSTEMS = {
+    'GP': 'gps',
+    'GL': 'glonass',
+    'BD': 'beidou',
+    'GB': 'beidou',
+    'GA': 'galileo',
+}
+
+# GSA sentences' GNSS system ids (NMEA 4.10), for the `GN` talker
+NMEA_GSA_SYSTEMS = {
+    '1': 'gps',
+    '2': 'glonass',
+    '3': 'galileo',
+    '4': 'beidou',
+}
+
+# Satellites' PRN ranges of each GNSS system, for `GN` GSA sentences without
+# the system id
+NMEA_PRN_SYSTEMS = (
+    (range(1, 33), 'gps'),
+    (range(65, 97), 'glonass'),
+    (range(201, 264), 'beidou'),
+    (range(401, 438), 'beidou'),
+)
+
+# GNSS systems with a satellites' count key (`CGNSSINFO_sat_<system>_count`)
+NMEA_COUNTED_SYSTEMS = ('gps', 'glonass', 'beidou')
+
+
+# Generator pipeline stages, from the serial port bytes to the device's values
+
+def nmea_read_lines(ser, must_stop: Callable[[], bool]) -> Iterator[bytes]:
+    """
+    Read the serial port incrementally and yield each complete line, without
+    the line terminator.
+    """
+    buff = b''
+    while not must_stop():
+        chunk = ser.read(ser.in_waiting or 1)
+        if not chunk:
+            continue
+        buff += chunk
+        while b'\n' in buff:
+            line, buff = buff.split(b'\n', 1)
+            yield line.strip()
+
+
+def nmea_checksum(body: bytes) -> int:
+    """ Returns the XOR of all bytes between the `$` and the `*` chars. """
+    checksum = 0
+    for byte in body:
+        checksum ^= byte
+    return checksum
+
+
+def nmea_parse_sentences(lines: Iterable[bytes], stats: dict = None) -> Iterator[list]:
+    """
+    Yield the fields of each NMEA sentence with a valid checksum, the first
+    field is the sentence's address (eg: `GPGGA`).
+
+    If `stats` is given, the `sentences` and `checksum_errors` counters are
+    updated.
+    """
+    for line in lines:
+        if not line.startswith(b'$') or b'*' not in line:
+            continue
+        body, checksum = line[1:].rsplit(b'*', 1)
+        try:
+            valid = int(checksum[:2], 16) == nmea_checksum(body)
+        except ValueError:
+            valid = False
+        if stats is not None:
+            key = 'sentences' if valid else 'checksum_errors'
+            stats[key] = stats.get(key, 0) + 1
+        if valid:
+            yield body.decode('ascii', errors='replace').split(',')
+
+
+def nmea_to_values(sentences: Iterable[list]) -> Iterator[dict]:
+    """
+    Convert the NMEA sentences into the same values (and keys) that
+    `Device._parse_pdu()` extracts from the `AT+CGPSINFO` and `AT+CGNSSINFO`
+    responses. The satellites' SNR, from GSV sentences, are returned with the
+    `NMEA_sat_snr` key as dict `{<talker><prn>: <snr>}` and their count with
+    the `NMEA_sat_in_view` key.
+
+    Like the `AT+CGNSSINFO` response, the `CGNSSINFO_sat_<system>_count` keys
+    are the satellites used by the fix (the PRNs listed by GSA sentences),
+    not the satellites in view.
+
+    Supported sentences: GGA, RMC, GSA and GSV.
+    """
+    satellites = {}
+    gsv_parts = {}
+    for fields in sentences:
+        if len(fields[0]) < 5:
+            continue
+        talker, kind = fields[0][:2], fields[0][2:]
+        try:
+            if kind == 'GGA':
+                values = _gga_to_values(fields)
+            elif kind == 'RMC':
+                values = _rmc_to_values(fields)
+            elif kind == 'GSA':
+                values = _gsa_to_values(talker, fields)
+            elif kind == 'GSV':
+                values = _gsv_to_values(talker, fields, gsv_parts, satellites)
+            else:
+                continue
+        except (IndexError, ValueError):
+            continue
+        if values:
+            yield values
+
+
+def _gga_to_values(fields) -> dict:
+    # $GPGGA,194627.00,4629.822936,N,01120.199998,E,1,06,1.7,323.3,M,,M,,*hh
+    if fields[6] in ('', '0') or fields[2] == '':
+        return {}
+    values = {}
+    for prefix in ('CGPSINFO', 'CGNSSINFO'):
+        values[prefix + '_lat_degrees'] = fields[2]
+        values[prefix + '_lat_dir'] = fields[3]
+        values[prefix + '_log_degrees'] = fields[4]
+        values[prefix + '_log_dir'] = fields[5]
+        values[prefix + '_alt'] = fields[9]
+    return values
+
+
+def _rmc_to_values(fields) -> dict:
+    # $GPRMC,194627.00,A,4629.822936,N,01120.199998,E,0.0,,051023,,,A*hh
+    if fields[2] != 'A':
+        return {}
+    values = {}
+    for prefix in ('CGPSINFO', 'CGNSSINFO'):
+        values[prefix + '_speed'] = fields[7] if fields[7] != "" else "0.0"
+        values[prefix + '_course'] = fields[8] if fields[8] != "" else "-1"
+    return values
+
+
+def _gsa_to_values(talker, fields) -> dict:
+    # $GNGSA,A,3,01,03,...,,2.0,1.7,1.0,1*hh
+    if fields[2] not in ('2', '3'):
+        return {}
+    values = {
+        'CGNSSINFO_mode': fields[2],
+        'CGNSSINFO_pdop': fields[15],
+        'CGNSSINFO_hdop': fields[16],
+        'CGNSSINFO_vdop': fields[17],
+    }
+
+    # satellites used by the fix, counted by GNSS system
+    prns = [int(prn) for prn in fields[3:15] if prn != '']
+    system = NMEA_TALKERS_SYSTEMS.get(talker)
+    if system is None and len(fields) > 18:
+        system = NMEA_GSA_SYSTEMS.get(fields[18])
+    if system is not None:
+        counts = {system: len(prns)}
+    else:
+        counts = {}
+        for prn in prns:
+            prn_system = next((name for prns_range, name in NMEA_PRN_SYSTEMS if prn in prns_range), None)
+            if prn_system is not None:
+                counts[prn_system] = counts.get(prn_system, 0) + 1
+    for system, count in counts.items():
+        if system in NMEA_COUNTED_SYSTEMS:
+            values['CGNSSINFO_sat_{}_count'.format(system)] = "{:02d}".format(count)
+    return values
+
+
+def _gsv_to_values(talker, fields, gsv_parts, satellites) -> dict:
+    # $GPGSV,3,1,11,01,45,120,38,03,30,210,42,...*hh
+    total, number = int(fields[1]), int(fields[2])
+    if number == 1:
+        gsv_parts[talker] = {}
+    parts = gsv_parts.setdefault(talker, {})
+    for i in range(4, len(fields) - 3, 4):
+        prn, snr = fields[i], fields[i + 3]
+        if prn != '':
+            parts[talker + prn] = int(snr) if snr != '' else 0
+    if number != total:
+        return {}
+
+    # message completed, replace the talker's satellites
+    for key in [key for key in satellites if key.startswith(talker)]:
+        del satellites[key]
+    satellites.update(gsv_parts.pop(talker))
+    return {'NMEA_sat_snr': dict(satellites), 'NMEA_sat_in_view': str(len(satellites))}
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+
+from typing import Callable, Optional
+
+
+# AT commands responses' frames splitting and values extractors, used by the
+# `AT_CMDS_PARSERS` table to convert each frame into the device's values
+
+# lines ignored by the extractors: empty lines and final result codes
+PDU_SKIPPED_LINES = frozenset(('', 'OK', 'ERROR'))
+
+
+def pdu_split(frame: bytes) -> (Optional[str], [str]):
+    """
+    Decode the frame and split it into the command and his information
+    lines (without empty lines and final result codes).
+
+    The command is the echoed one (eg: `AT+CREG?`) or, for frames without
+    echo like the unsolicited reports, it's built from the first information
+    line's prefix (eg: `+CGPSINFO: ...` is returned as `AT+CGPSINFO`).
+
+    Lines before the echo or the first prefixed line (eg: empty lines or a
+    previous command's `OK`) are skipped.
+    """
+    lines = frame.decode(errors='replace').split('\r\n')
+    for index, line in enumerate(lines):
+        if line.startswith('AT'):
+            # echo is terminated by `\r\r\n`
+            return line.rstrip('\r'), [line for line in lines[index + 1:] if line not in PDU_SKIPPED_LINES]
+        if line.startswith('+') and ':' in line:
+            return 'AT' + line.split(':', 1)[0], [line for line in lines[index:] if line not in PDU_SKIPPED_LINES]
+    return None, [line for line in lines if line not in PDU_SKIPPED_LINES]
+
+
+def pdu_line(key: str) -> Callable[[list], dict]:
+    """ Extractor for the whole first information line. """
+    def extract(lines) -> dict:
+        return {key: lines[0]}
+    return extract
+
+
+def pdu_prefixed(prefix: str, *keys: str) -> Callable[[list], dict]:
+    """
+    Extractor for one information line per key, without the response's
+    `prefix` (eg: `+CGMR:`).
+    """
+    size = len(prefix)
+
+    def extract(lines) -> dict:
+        if len(lines) < len(keys):
+            raise ValueError("expected {} lines, got {}".format(len(keys), len(lines)))
+        return {key: line[size:].strip() for key, line in zip(keys, lines)}
+    return extract
+
+
+def pdu_fields(prefix: str, keys: tuple, empty_defaults: dict = None) -> Callable[[list], dict]:
+    """
+    Extractor for the comma separated fields of the first information line,
+    without the response's `prefix` (eg: `+CSQ:`). Fields with `None` key
+    are ignored, empty fields with a key in `empty_defaults` are replaced by
+    his default value.
+    """
+    size = len(prefix)
+    indexed_keys = [(i, key) for i, key in enumerate(keys) if key is not None]
+    empty_defaults = empty_defaults or {}
+
+    def extract(lines) -> dict:
+        fields = lines[0][size:].strip().split(',')
+        if len(fields) < len(keys):
+            raise ValueError("expected {} fields, got {}".format(len(keys), len(fields)))
+        values = {key: fields[i] for i, key in indexed_keys}
+        for key, default in empty_defaults.items():
+            if values[key] == "":
+                values[key] = default
+        return values
+    return extract
@@ -1,22 +1,36 @@
 #!/usr/bin/python3
 import logging
+import threading
 from typing import Optional
 import serial
 import time
 
-try:
-    import RPi.GPIO as GPIO
-
-    _gpio_loaded = True
-except:
-    print("WARN: RPi.GPIO module disabled.")
-    _gpio_loaded = False
-
 from fw_sim7600.sim7600.mappings import *
 from fw_sim7600.base.device_serial import DeviceSerial
+from fw_sim7600.base.serial_conn import SerialConnection
+from fw_sim7600.base.serial_reader import SerialReader
+from fw_sim7600.base.timing import timed
+from fw_sim7600.sim7600._nmea import nmea_read_lines, nmea_parse_sentences, nmea_to_values
 
 logger = logging.getLogger()
 
+# `RPi.GPIO` module, imported on first use by `_load_gpio()`
+_GPIO = None
+_gpio_loaded = None
+
+
+def _load_gpio():
+    """ Returns the `RPi.GPIO` module, or None if it's not available. """
+    global _GPIO, _gpio_loaded
+    if _gpio_loaded is None:
+        try:
+            import RPi.GPIO as GPIO
+            _GPIO, _gpio_loaded = GPIO, True
+        except Exception:
+            print("WARN: RPi.GPIO module disabled.")
+            _gpio_loaded = False
+    return _GPIO
+
 
 class Device(DeviceSerial):
     """
@@ -30,145 +44,527 @@ class Device(DeviceSerial):
     RETRY_TIME_SEC = 1.0
     RESPONSE_WAIT_TIME = 0.01
     AT_CMD_TIMEOUT = 1.0
+    # Polled values expire when their command didn't succeed for this number
+    # of his polling intervals
+    POLL_EXPIRE_INTERVALS = 3
+    # NMEA values expire when not received for this number of seconds (the
+    # NMEA port streams his sentences every second)
+    NMEA_EXPIRE_TIME = 10
+    FINAL_RESULT_CODES = (b'OK', b'ERROR')
+    FINAL_RESULT_CODES_PREFIXES = (b'+CME ERROR', b'+CMS ERROR')
     POWER_PIN = 6
+    PRODUCT_INFO_COMMANDS = ['AT+CGMI', 'AT+CGMM', 'AT+CGSN', 'AT+CSUB',
+                             'AT+CGMR', 'AT+CSQ', 'AT+CREG?', 'AT+CPIN?',
+                             'AT+COPS?']
+    GNSS_URC_PREFIXES = (b'+CGPSINFO:', b'+CGNSSINFO:')
+    # GNSS session started once and never stopped
+    GNSS_SESSION_ALWAYS_ON = "always_on"
+    # GNSS session stopped when idle (see `_gnss_session_idle()`) and
+    # restarted after the idle timeout
+    GNSS_SESSION_IDLE_TIMEOUT = "idle_timeout"
+    # Min change of the fix's latitude or longitude (`ddmm.mmmm` format, 0.01
+    # minutes is about 18 m) that resets the GNSS session's idle time
+    GNSS_IDLE_MIN_MOVE = 0.01
+    # GNSS session started and stopped on each refresh
+    GNSS_SESSION_PER_CYCLE = "per_cycle"
+    GNSS_SESSIONS = (GNSS_SESSION_ALWAYS_ON, GNSS_SESSION_IDLE_TIMEOUT,
+                     GNSS_SESSION_PER_CYCLE)
 
     def __init__(self, device: str = '/dev/ttyAMA0', speed: int = 115200,
-                 auto_refresh=True):
-        super().__init__(device, speed, self.DELIMITER, self.FIELD_PID, self.FIELD_TYPE, auto_refresh)
+                 auto_refresh=True, batch_commands=True,
+                 polling_intervals: "dict | None" = AT_CMDS_INTERVALS,
+                 gnss_auto_report: int = 0,
+                 gnss_session: str = GNSS_SESSION_PER_CYCLE,
+                 gnss_session_idle_timeout: float = 60,
+                 nmea_port: str = None, nmea_speed: int = 115200):
+        if gnss_session not in self.GNSS_SESSIONS:
+            raise ValueError("Unknown GNSS session policy '{}', valid values: {}"
+                             .format(gnss_session, ", ".join(self.GNSS_SESSIONS)))
+        self.batch_commands = batch_commands
+        self.gnss_auto_report = gnss_auto_report
+        self.gnss_session = gnss_session
+        self.gnss_session_idle_timeout = gnss_session_idle_timeout
+        self._gnss_session_active = False
+        self._gnss_session_start = 0.0
+        self._gnss_last_move = 0.0
+        self._gnss_last_position = None
+        self._gnss_idle_since = None
+        self._gnss_fix_pending = False
+        self.gnss_session_starts = 0
+        self.gnss_fix_count = 0
+        self.gnss_fix_latency_last = None
+        self._gnss_fix_latency_total = 0.0
+        self._gnss_fix_latency_count = 0
+        self.nmea_port = nmea_port
+        self._nmea_conn = SerialConnection(nmea_port, nmea_speed, self.RESPONSE_WAIT_TIME) \
+            if nmea_port is not None else None
+        self._nmea_thread: Optional[threading.Thread] = None
+        self._nmea_stop = threading.Event()
+        self._nmea_values = {}
+        self._nmea_values_lock = threading.Lock()
+        self._nmea_stats = {}
+        self._reader: Optional[SerialReader] = None
+        self._gnss_reports = {}
+        self._gnss_reports_lock = threading.Lock()
+        self.polling_intervals = polling_intervals
+        self._polls_next = {}
+        self._polls_last_success = {}
+        self._polls_reconnect_count = 0
+        self._polled_commands = set()
+
+        super().__init__(device, speed, self.DELIMITER, self.FIELD_PID, self.FIELD_TYPE, auto_refresh,
+                         serial_timeout=self.RESPONSE_WAIT_TIME, props_codes=PROPS_CODES)
 
         self.cached_pid = None
 
         self._power_state = True
 
+    def _reset_data(self):
+        """
+        When the polling scheduler is enabled, the values read by not due
+        commands are kept, so only the due commands update their values.
+
+        Values of commands that didn't succeed for `POLL_EXPIRE_INTERVALS` of
+        their intervals (eg: the modem stopped answering) are removed, like
+        the NMEA ones not received for `NMEA_EXPIRE_TIME` seconds (eg: the
+        NMEA port stopped streaming), except the GNSS ones while the GNSS
+        session is idle.
+        """
+        if self.polling_intervals is None:
+            super()._reset_data()
+            return
+
+        now = time.monotonic()
+        for code, sample in list(self._samples.items()):
+            if sample.source == 'NMEA':
+                interval, last_success = self.NMEA_EXPIRE_TIME, sample.timestamp
+            else:
+                interval = self.polling_intervals.get(sample.source)
+                last_success = self._polls_last_success.get(sample.source)
+                if interval is not None:
+                    interval *= self.POLL_EXPIRE_INTERVALS
+            if interval is None or last_success is None or now - last_success <= interval:
+                continue
+            if self._gnss_idle_since is not None and sample.source in ('AT+CGPSINFO', 'AT+CGNSSINFO', 'NMEA'):
+                continue
+            logger.debug("Property '{}' expired, '{}' not answered for {:.0f} seconds"
+                         .format(code, sample.source, now - last_success))
+            del self._samples[code]
+            self._data.pop(code, None)
+
+    def reset_polling(self):
+        """ Makes all AT queries due on next refresh. """
+        self._polls_next = {}
+
+    def _due_commands(self, commands) -> list:
+        """ Returns the given commands that must be sent on current refresh. """
+        if self.polling_intervals is None:
+            return list(commands)
+        now = time.monotonic()
+        return [cmd for cmd in commands if self._polls_next.get(cmd, 0) <= now]
+
+    def _mark_polled(self, command, success):
+        """
+        Register the command as sent on current refresh and, if it succeeded,
+        schedule his next polling. Failed commands are due on next refresh.
+        """
+        self._polled_commands.add(command)
+        if self.polling_intervals is None or not success:
+            return
+        self._polls_last_success[command] = time.monotonic()
+        interval = self.polling_intervals.get(command, 0)
+        self._polls_next[command] = time.monotonic() + interval \
+            if interval is not None else float('inf')
+
     def _get_data(self) -> [bytes]:
         """ Returns a PDU array, one entry per line."""
+        self._polled_commands = set()
         if not self._power_state:
             return []
 
         data = []
         try:
-            with serial.Serial(self.device, self.speed, timeout=1) as s:
-                self._is_connected = True
-
-                data += self._query_product_info(s)
-
-                if len(data) == 0:
-                    logger.debug("Error querying device, no data received")
-                    self._is_connected = False
-                    return []
-                if not self._find_pid(data):
-                    logger.debug("Error querying device, no PID received")
-                    self._is_connected = False
-                    return []
-
-                data += self._query_gnss_info(s)
-                if self._must_terminate:
-                    self._is_connected = False
+            s = self._open_port()
+            self._is_connected = True
+
+            data += self._query_product_info(s)
+
+            # without product info (also when none is due), the link is
+            # checked with the cheapest command
+            if len(data) == 0 \
+                    and self.send_at(s, 'AT', 'OK', self.AT_CMD_TIMEOUT,
+                                     self._terminate_event) is None:
+                logger.debug("Error querying device, no data received")
+                self._is_connected = False
+                return []
+            if 'AT+CGMM' in self._polled_commands and not self._find_pid(data):
+                logger.debug("Error querying device, no PID received")
+                self._is_connected = False
+                return []
+
+            data += self._query_gnss_info(s)
+            if self._must_terminate:
+                self._is_connected = False
 
         except serial.serialutil.SerialException as err:
             logger.warning("Error querying device ({})".format(err))
+            self._conn.handle_error(err)
             self._is_connected = False
 
         return data
 
+    def _open_port(self):
+        """
+        Returns the serial port to use to send AT commands.
+
+        When the GNSS auto-report is enabled, the serial port is wrapped by a
+        `SerialReader` that collects the unsolicited GNSS reports in
+        background. The reader is (re)started, and the auto-report enabled,
+        each time the serial port is (re)opened.
+
+        On a reconnection, the polling schedule and the GNSS session's state
+        are reset before the reader's restart, as the module may have lost
+        them.
+        """
+        s = self._conn.ensure_open()
+        if self._conn.reconnect_count != self._polls_reconnect_count:
+            self._polls_reconnect_count = self._conn.reconnect_count
+            self.reset_polling()
+            self._gnss_session_active = False
+        if self.gnss_auto_report <= 0:
+            return s
+        if self._reader is not None and self._reader.ser is s \
+                and self._reader.is_running:
+            return self._reader
+
+        self._stop_reader()
+        self._reader = SerialReader(s, self.GNSS_URC_PREFIXES,
+                                    self._on_gnss_report)
+        self._reader.start()
+        self._enable_gnss_auto_report(self._reader, self.gnss_auto_report)
+        return self._reader
+
+    def _stop_reader(self):
+        if self._reader is not None:
+            self._reader.stop()
+            self._reader = None
+
+    def _enable_gnss_auto_report(self, s, interval):
+        """ Start the GNSS session and enable (or disable if `interval` is 0)
+        the periodic GNSS reports. """
+        logger.debug('{} GNSS auto-report every {} seconds...'
+                     .format("Enable" if interval > 0 else "Disable", interval))
+        if interval > 0:
+            self._start_gnss_session(s)
+        self.send_at(s, 'AT+CGPSINFO={}'.format(interval), 'OK',
+                     self.AT_CMD_TIMEOUT, self._terminate_event)
+        self.send_at(s, 'AT+CGNSSINFO={}'.format(interval), 'OK',
+                     self.AT_CMD_TIMEOUT, self._terminate_event)
+        if interval <= 0:
+            self._stop_gnss_session(s)
+
+    def _on_gnss_report(self, line: bytes):
+        """ Keep the latest unsolicited GNSS report with a valid fix. """
+        prefix = line.strip().split(b':', 1)[0] + b':'
+        values = line.strip()[len(prefix):].strip()
+        if values.strip(b',') == b'':
+            return
+        with self._gnss_reports_lock:
+            self._gnss_reports[prefix] = line
+        self._register_gnss_fix(self._gnss_position(line))
+
+    def _start_gnss_session(self, s):
+        """ Start the GNSS session, if not already active. """
+        if self._gnss_session_active:
+            return
+        logger.debug('Start GPS session...')
+        self.send_at(s, 'AT+CGPS=1', 'OK', self.AT_CMD_TIMEOUT,
+                     self._terminate_event)
+        self._gnss_session_active = True
+        self._gnss_session_start = time.monotonic()
+        self._gnss_last_move = self._gnss_session_start
+        self._gnss_idle_since = None
+        self._gnss_fix_pending = True
+        self.gnss_session_starts += 1
+
+    def _stop_gnss_session(self, s):
+        """ Stop the GNSS session, if active. """
+        if not self._gnss_session_active:
+            return
+        logger.debug('End GPS session...')
+        self._gnss_session_active = False
+        self._gnss_fix_pending = False
+        self.send_at(s, 'AT+CGPS=0', 'OK', self.AT_CMD_TIMEOUT,
+                     self._terminate_event)
+
+    def _gnss_session_idle(self, s) -> bool:
+        """
+        Apply the `idle_timeout` GNSS session policy, returns True if the
+        session is stopped because idle, so no GNSS value must be read.
+
+        The session is idle when, after his first fix, the position didn't
+        move more than `GNSS_IDLE_MIN_MOVE` for `gnss_session_idle_timeout`
+        seconds (eg: a parked vehicle). An idle session is stopped and, after
+        other `gnss_session_idle_timeout` seconds, started again to check the
+        position. Sessions without a fix are never idle, so the first fix is
+        not interrupted.
+        """
+        if self.gnss_session != self.GNSS_SESSION_IDLE_TIMEOUT:
+            return False
+        now = time.monotonic()
+        if self._gnss_idle_since is not None:
+            if now - self._gnss_idle_since < self.gnss_session_idle_timeout:
+                return True
+            logger.debug("GNSS session idle for {} seconds, restart it to check the position"
+                         .format(self.gnss_session_idle_timeout))
+            self._gnss_idle_since = None
+            return False
+        if self._gnss_session_active and not self._gnss_fix_pending \
+                and now - self._gnss_last_move > self.gnss_session_idle_timeout:
+            logger.debug("GNSS position not changed for {} seconds, stop the session"
+                         .format(self.gnss_session_idle_timeout))
+            self._stop_gnss_session(s)
+            self._gnss_idle_since = now
+            return True
+        return False
+
+    @staticmethod
+    def _gnss_position(frame: bytes) -> Optional[tuple]:
+        """ Returns the fix's latitude and longitude (`ddmm.mmmm` format) of a
+        `+CGPSINFO` or `+CGNSSINFO` response, None if not available. """
+        for line in frame.split(b'\r\n'):
+            line = line.strip()
+            if line.startswith(b'+CGPSINFO:'):
+                index = 0
+            elif line.startswith(b'+CGNSSINFO:'):
+                index = 4
+            else:
+                continue
+            fields = line.split(b':', 1)[1].split(b',')
+            try:
+                return float(fields[index]), float(fields[index + 2])
+            except (IndexError, ValueError):
+                return None
+        return None
+
+    def _register_gnss_fix(self, position: tuple = None):
+        """ Update the fix counters, the latest position's move and, for the
+        first fix of current session, the fix latency. """
+        self.gnss_fix_count += 1
+        if position is not None:
+            last = self._gnss_last_position
+            if last is None or abs(position[0] - last[0]) > self.GNSS_IDLE_MIN_MOVE \
+                    or abs(position[1] - last[1]) > self.GNSS_IDLE_MIN_MOVE:
+                self._gnss_last_position = position
+                self._gnss_last_move = time.monotonic()
+        if self._gnss_fix_pending:
+            self._gnss_fix_pending = False
+            self.gnss_fix_latency_last = time.monotonic() - self._gnss_session_start
+            self._gnss_fix_latency_total += self.gnss_fix_latency_last
+            self._gnss_fix_latency_count += 1
+            logger.debug("GNSS fix after {:.1f} seconds".format(self.gnss_fix_latency_last))
+
+    @property
+    def gnss_stats(self) -> dict:
+        """ Returns the GNSS session's counters. """
+        return {
+            'session_policy': self.gnss_session,
+            'session_active': self._gnss_session_active,
+            'session_starts': self.gnss_session_starts,
+            'fix_count': self.gnss_fix_count,
+            'fix_latency_last': self.gnss_fix_latency_last,
+            'fix_latency_avg': self._gnss_fix_latency_total / self._gnss_fix_latency_count
+            if self._gnss_fix_latency_count > 0 else None,
+        }
+
+    def _start_nmea_reader(self):
+        if self._nmea_thread is not None and self._nmea_thread.is_alive():
+            return
+        self._nmea_stop.clear()
+        self._nmea_thread = threading.Thread(target=self._nmea_read_loop,
+                                             name="NMEAReader", daemon=True)
+        self._nmea_thread.start()
+
+    def _stop_nmea_reader(self):
+        if self._nmea_thread is None:
+            return
+        self._nmea_stop.set()
+        self._nmea_thread.join()
+        self._nmea_thread = None
+        self._nmea_conn.close()
+
+    def _nmea_read_loop(self):
+        """ Read the NMEA port and collect the latest values, until stopped. """
+        must_stop = lambda: self._nmea_stop.is_set() or self._must_terminate
+        logger.debug("NMEA reader started on '{}'".format(self.nmea_port))
+        while not must_stop():
+            try:
+                ser = self._nmea_conn.ensure_open()
+                lines = nmea_read_lines(ser, must_stop)
+                for values in nmea_to_values(nmea_parse_sentences(lines, self._nmea_stats)):
+                    if 'CGNSSINFO_lat_degrees' in values:
+                        try:
+                            position = float(values['CGNSSINFO_lat_degrees']), \
+                                float(values['CGNSSINFO_log_degrees'])
+                        except ValueError:
+                            position = None
+                        self._register_gnss_fix(position)
+                    with self._nmea_values_lock:
+                        self._nmea_values.update(values)
+            except serial.SerialException as err:
+                logger.warning("Error reading NMEA port ({})".format(err))
+                self._nmea_conn.handle_error(err)
+                self._nmea_stop.wait(self._nmea_conn.backoff_min)
+        logger.debug("NMEA reader stopped")
+
+    @property
+    def nmea_stats(self) -> dict:
+        """ Returns the NMEA sentences counters and the NMEA port's
+        connection counters. """
+        stats = {'sentences': 0, 'checksum_errors': 0}
+        stats.update(self._nmea_stats)
+        if self._nmea_conn is not None:
+            stats.update(self._nmea_conn.stats)
+        return stats
+
+    def close(self):
+        """ Disable the GNSS auto-report, stop the GNSS session and close the
+        serial connection. """
+        if self._nmea_conn is not None:
+            self._stop_nmea_reader()
+        try:
+            if self._reader is not None and self._reader.is_running:
+                self._enable_gnss_auto_report(self._reader, 0)
+            elif self._gnss_session_active and self._conn.is_open:
+                self._stop_gnss_session(self._conn.ensure_open())
+        except serial.SerialException as err:
+            logger.debug("Error stopping GNSS session ({})".format(err))
+        self._stop_reader()
+        super().close()
+
+    @timed("query_product_info")
     def _query_product_info(self, s) -> [bytes]:
         data = []
-        if not self._must_terminate:
-            logger.debug('Query product info...')
-            data.append(self.send_at(s, 'AT+CGMI', 'OK', self.AT_CMD_TIMEOUT))
-            data.append(self.send_at(s, 'AT+CGMM', 'OK', self.AT_CMD_TIMEOUT))
-            data.append(self.send_at(s, 'AT+CGSN', 'OK', self.AT_CMD_TIMEOUT))
-            data.append(self.send_at(s, 'AT+CSUB', 'OK', self.AT_CMD_TIMEOUT))
-            data.append(self.send_at(s, 'AT+CGMR', 'OK', self.AT_CMD_TIMEOUT))
-            data.append(self.send_at(s, 'AT+CSQ', 'OK', self.AT_CMD_TIMEOUT))
-            data.append(self.send_at(s, 'AT+CREG?', 'OK', self.AT_CMD_TIMEOUT))
-            data.append(self.send_at(s, 'AT+CPIN?', 'OK', self.AT_CMD_TIMEOUT))
-            data.append(self.send_at(s, 'AT+COPS?', 'OK', self.AT_CMD_TIMEOUT))
+        commands = self._due_commands(self.PRODUCT_INFO_COMMANDS)
+        if not self._must_terminate and len(commands) > 0:
+            logger.debug('Query product info ({})...'.format(", ".join(commands)))
+            if self.batch_commands:
+                data = self.send_at_batch(s, commands, self.AT_CMD_TIMEOUT,
+                                          self._terminate_event)
+            else:
+                for command in commands:
+                    data.append(self.send_at(s, command, 'OK',
+                                             self.AT_CMD_TIMEOUT,
+                                             self._terminate_event))
             res = []
-            for val in data:
+            for command, val in zip(commands, data):
+                self._mark_polled(command, val is not None)
                 if val is not None:
                     res.append(val)
             data = res
         return data
 
+    @timed("query_gnss_info")
     def _query_gnss_info(self, s) -> [bytes]:
+        if self._gnss_session_idle(s):
+            return []
+
+        if self.nmea_port is not None:
+            # values read from the NMEA port, merged by `_parse_pdu()`
+            self._start_gnss_session(s)
+            self._start_nmea_reader()
+            return []
+
+        if self.gnss_auto_report > 0:
+            # reports received since latest refresh, no command to send
+            self._start_gnss_session(s)
+            with self._gnss_reports_lock:
+                data = list(self._gnss_reports.values())
+                self._gnss_reports = {}
+            return data
+
         data = []
-        if not self._must_terminate:
-            logger.debug('Start GPS session...')
-            self.send_at(s, 'AT+CGPS=1', 'OK', self.AT_CMD_TIMEOUT)
+        commands = self._due_commands(['AT+CGPSINFO', 'AT+CGNSSINFO'])
+        if not self._must_terminate and len(commands) > 0:
+            self._start_gnss_session(s)
 
             # gps request
-            gps_answer = None
-            count = 0
-            while count < self.RETRY_TIMES \
-                    and not self._must_terminate:
-                gps_answer = self.send_at(s,
-                                          'AT+CGPSINFO',
-                                          '+CGPSINFO: ',
-                                          self.AT_CMD_TIMEOUT)
-
-                if gps_answer is None or "+CGPSINFO: ,,,,,,,," in str(gps_answer):
-                    gps_answer = None
-                    logger.debug("No data for GPS, attempt {}/{}"
-                                 .format(count + 1, self.RETRY_TIMES))
-                else:
-                    logger.debug("GPS data received")
-                    break
-                time.sleep(self.RETRY_TIME_SEC)
-                count += 1
-            if gps_answer is not None:
-                data.append(gps_answer)
+            if 'AT+CGPSINFO' in commands:
+                gps_answer = self._query_gnss_command(
+                    s, 'AT+CGPSINFO', '+CGPSINFO: ', "+CGPSINFO: ,,,,,,,,", "GPS")
+                self._mark_polled('AT+CGPSINFO', gps_answer is not None)
+                if gps_answer is not None:
+                    data.append(gps_answer)
 
             # gnss request
-            gnss_answer = None
-            count = 0
-            while count < self.RETRY_TIMES \
-                    and not self._must_terminate:
-                gnss_answer = self.send_at(s,
-                                           'AT+CGNSSINFO',
-                                           '+CGNSSINFO: ',
-                                           self.AT_CMD_TIMEOUT)
-
-                if gnss_answer is None or "+CGNSSINFO: ,,,,,,,,,,,,,,," in str(gnss_answer):
-                    gnss_answer = None
-                    logger.debug("No data for GNSS, attempt {}/{}"
-                                 .format(count + 1, self.RETRY_TIMES))
-                else:
-                    logger.debug("GNSS data received")
-                    break
-                time.sleep(self.RETRY_TIME_SEC)
-                count += 1
-            if gnss_answer is not None:
-                data.append(gnss_answer)
-
-            logger.debug('End GPS session...')
-            self.send_at(s,
-                          'AT+CGPS=0',
-                          'OK',
-                          self.AT_CMD_TIMEOUT)
+            if 'AT+CGNSSINFO' in commands:
+                gnss_answer = self._query_gnss_command(
+                    s, 'AT+CGNSSINFO', '+CGNSSINFO: ', "+CGNSSINFO: ,,,,,,,,,,,,,,,", "GNSS")
+                self._mark_polled('AT+CGNSSINFO', gnss_answer is not None)
+                if gnss_answer is not None:
+                    data.append(gnss_answer)
+
+            if len(data) > 0:
+                self._register_gnss_fix(self._gnss_position(data[-1]))
+            if self.gnss_session == self.GNSS_SESSION_PER_CYCLE:
+                self._stop_gnss_session(s)
         return data
 
+    def _query_gnss_command(self, s, command, back, no_fix, system) -> Optional[bytes]:
+        """ Send the GNSS command until a fix is returned or `RETRY_TIMES`. """
+        count = 0
+        while count < self.RETRY_TIMES \
+                and not self._must_terminate:
+            answer = self.send_at(s, command, back, self.AT_CMD_TIMEOUT,
+                                  self._terminate_event)
+
+            if answer is None or no_fix in str(answer):
+                logger.debug("No data for %s, attempt %d/%d", system, count + 1, self.RETRY_TIMES)
+            else:
+                logger.debug("%s data received", system)
+                return answer
+            if self.wait_or_terminate(self.RETRY_TIME_SEC):
+                break
+            count += 1
+        return None
+
     @staticmethod
-    def send_at(ser, command, back, timeout) -> Optional[bytes]:
+    @timed("send_at", command=lambda ser, command, *args, **kwargs: command)
+    def send_at(ser, command, back, timeout, stop: threading.Event = None) -> Optional[bytes]:
+        """
+        Send an AT command and read his response.
+
+        The response is read as soon as bytes are available on the serial port
+        and the method returns when a final result code (see
+        `Device.FINAL_RESULT_CODES`) or the expected `back` line was received.
+        The `timeout` is only the upper bound for the whole response, the read
+        is also interrupted when the `stop` event is set.
+
+        Bytes left on the port by previous commands (eg: an `OK` received
+        after their read ended) are discarded before sending the command.
+
+        return: the raw response, or None if no (or a wrong) response was
+                received
+        """
         try:
-            rec_buff = ''
+            ser.reset_input_buffer()
             ser.write((command + '\r\n').encode())
-            time.sleep(timeout)
-            if ser.inWaiting():
-                time.sleep(Device.RESPONSE_WAIT_TIME)
-                rec_buff = ser.read(ser.inWaiting())
+            # echo is terminated by `\r`, so `AT` doesn't match other lines
+            rec_buff = Device.read_response(ser, back.encode(), timeout, stop, (command + '\r').encode())
 
-            if rec_buff == '':
+            if rec_buff == b'':
                 return None
 
             if back not in rec_buff.decode():
-                logger.debug(
-                    "AT command '{}' returned wrong response".format(command))
+                logger.debug("AT command '%s' returned wrong response", command)
                 logger.debug(rec_buff)
                 return None
 
             return rec_buff
 
+        except serial.SerialException:
+            # handled by the caller, that must reconnect the serial port
+            raise
         except Exception as err:
             logger.warning(
                 "Unknown exception sending '{}' AT command: {};"
@@ -178,116 +574,179 @@ class Device(DeviceSerial):
             traceback.print_exc()
             return None
 
+    @staticmethod
+    @timed("send_at_batch", command=lambda ser, commands, *args, **kwargs: ";".join(commands))
+    def send_at_batch(ser, commands, timeout, stop: threading.Event = None) -> [Optional[bytes]]:
+        """
+        Send many AT commands concatenated in a single command line (eg:
+        `AT+CSQ;+CREG?;+CPIN?`) and split the combined response into one
+        frame per command, formatted like the `send_at()` responses.
+
+        Only query commands can be batched, because each command must return
+        exactly one information response.
+
+        When the command line fails (eg: `ERROR` on the 3rd command), the
+        responses received before the error are kept and the remaining
+        commands are sent one by one, so a failing command does not lose the
+        others' responses.
+
+        return: a list with one frame (or None) per command
+        """
+        if len(commands) == 0:
+            return []
+        if len(commands) == 1:
+            return [Device.send_at(ser, commands[0], 'OK', timeout, stop)]
+
+        command_line = 'AT' + ';'.join(cmd[len('AT'):] for cmd in commands)
+        try:
+            ser.reset_input_buffer()
+            ser.write((command_line + '\r\n').encode())
+            rec_buff = Device.read_response(ser, b'OK',
+                                            timeout * len(commands), stop,
+                                            (command_line + '\r').encode())
+            blocks, final_code = Device._split_batch_response(rec_buff)
+        except serial.SerialException:
+            raise
+        except Exception as err:
+            logger.warning("Unknown exception sending '{}' AT command: {}"
+                           .format(command_line, err))
+            blocks, final_code = [], None
+
+        if final_code == 'OK' and len(blocks) == len(commands):
+            return [Device._build_frame(cmd, block)
+                    for cmd, block in zip(commands, blocks)]
+
+        if len(blocks) >= len(commands):
+            blocks = []
+        logger.debug("AT command '{}' failed after {}/{} responses ({}), "
+                     "send remaining commands one by one"
+                     .format(command_line, len(blocks), len(commands),
+                             final_code))
+        frames = [Device._build_frame(cmd, block)
+                  for cmd, block in zip(commands, blocks)]
+        for cmd in commands[len(blocks):]:
+            frames.append(Device.send_at(ser, cmd, 'OK', timeout, stop))
+        return frames
+
+    @staticmethod
+    def _split_batch_response(rec_buff: bytes) -> ([str], Optional[str]):
+        """
+        Split a concatenated command line response into the information
+        responses and the final result code (None if not received).
+        """
+        text = rec_buff.decode(errors='replace')
+        # remove command's echo
+        if text.startswith('AT'):
+            text = text[text.find('\r\n') + len('\r\n'):] \
+                if '\r\n' in text else ''
+        chunks = [chunk.strip('\r\n') for chunk in text.split('\r\n\r\n')]
+        chunks = [chunk for chunk in chunks if chunk != '']
+        if len(chunks) == 0:
+            return [], None
+        last_lines = chunks[-1].split('\r\n')
+        final = last_lines[-1].strip().encode()
+        if final in Device.FINAL_RESULT_CODES \
+                or final.startswith(Device.FINAL_RESULT_CODES_PREFIXES):
+            last_info = '\r\n'.join(last_lines[:-1]).strip('\r\n')
+            return chunks[:-1] + ([last_info] if last_info != '' else []), \
+                final.decode()
+        return chunks, None
+
+    @staticmethod
+    def _build_frame(command, block) -> bytes:
+        """ Build a single command frame as returned by `send_at()`. """
+        return '{}\r\r\n{}\r\n\r\nOK\r\n'.format(command, block).encode()
+
+    @staticmethod
+    def read_response(ser, back: bytes, timeout, stop: threading.Event = None,
+                      echo: bytes = None) -> bytes:
+        """
+        Read from the serial port until the response is complete, the
+        `timeout` expired or the `stop` event is set.
+
+        When a line containing `back` was received, but not yet the final
+        result code, the read continues for `Device.RESPONSE_WAIT_TIME` only,
+        so the trailing `OK` is not left on the port for the next command.
+
+        When the command's `echo` is given, the response starts from his
+        echo: bytes received before are discarded and their final result
+        codes (eg: an `OK` of a previous command) don't end the response. If
+        the modem's echo is disabled (`ATE0`), the response starts from the
+        first non-empty line received, as the port's input buffer is reset
+        before the command is sent.
+
+        The wait for new bytes relies on the serial port's read timeout, so
+        the port should be opened with a short timeout (eg:
+        `Device.RESPONSE_WAIT_TIME`).
+        """
+        rec_buff = b''
+        deadline = time.monotonic() + timeout
+        back_found = False
+        started = echo is None
+        while time.monotonic() < deadline \
+                and (stop is None or not stop.is_set()):
+            chunk = ser.read(ser.in_waiting or 1)
+            if not chunk:
+                continue
+            rec_buff += chunk
+            if not started:
+                start = rec_buff.find(echo)
+                if start >= 0:
+                    rec_buff = rec_buff[start:]
+                    started = True
+            # last item is an incomplete line (or an empty string)
+            for line in rec_buff.split(b'\r\n')[:-1]:
+                line = line.strip()
+                if not started:
+                    # no echo before a complete line, echo disabled
+                    if line == b'':
+                        continue
+                    started = True
+                if line in Device.FINAL_RESULT_CODES \
+                        or line.startswith(Device.FINAL_RESULT_CODES_PREFIXES):
+                    return rec_buff
+                if not back_found and back not in Device.FINAL_RESULT_CODES \
+                        and back in line:
+                    back_found = True
+                    deadline = min(deadline,
+                                   time.monotonic() + Device.RESPONSE_WAIT_TIME)
+        return rec_buff
+
+    @timed("parse_pdu")
     def _parse_pdu(self, frames):
-        """ AT commands responses, one per frame. """
+        """ AT commands responses, one per frame, parsed with the extractor
+        registered for his command in `AT_CMDS_PARSERS`. """
 
         at_cpin_set = False
-        count = 1
-        for frame in frames:
-            if b'AT+CGMI' in frame:
-                # AT+CGMI\r\r\nSIMCOM INCORPORATED\r\n\r\nOK\r\n
-                frame_lines = frame.decode().split("\r\n")
-                self._data['AT+CGMI'] = frame_lines[1]
-
-            elif b'AT+CGMM' in frame:
-                # AT+CGMM\r\r\nSIMCOM_SIM7600E-H\r\n\r\nOK\r\n
-                frame_lines = frame.decode().split("\r\n")
-                self._data['AT+CGMM'] = frame_lines[1]
-
-            elif b'AT+CGSN' in frame:
-                # AT + CGSN\r\r\n860147054839863\r\n\r\nOK\r\n
-                frame_lines = frame.decode().split("\r\n")
-                self._data['AT+CGSN'] = frame_lines[1]
-
-            elif b'AT+CSUB' in frame:
-                # AT+CSUB\r\r\n+CSUB: B04V03\r\n+CSUB: MDM9x07_LE20_S_22_V1.03_210527\r\n\r\nOK\r\n
-                frame_lines = frame.decode().split("\r\n")
-                self._data['AT+CSUB'] = frame_lines[1][
-                                        len("CSUB:") + 1:].strip()
-                self._data['AT+CSUB_B'] = frame_lines[2][
-                                          len("CSUB:") + 1:].strip()
-
-            elif b'AT+CGMR' in frame:
-                # AT+CGMR\r\r\n+CGMR: LE20B04SIM7600M22\r\n\r\nOK\r\n
-                frame_lines = frame.decode().split("\r\n")
-                self._data['AT+CGMR'] = frame_lines[1][
-                                        len("CGMR:") + 1:].strip()
-
-            elif b'AT+CSQ' in frame:
-                # AT+CSQ\r\r\n+CSQ: 4,99\r\n\r\nOK\r\n
-                frame_lines = frame.decode().split("\r\n")
-                values = frame_lines[1][len("CSQ:") + 1:].strip().split(',')
-                self._data['AT+CSQ_rssi'] = values[0]
-                self._data['AT+CSQ_ber'] = values[1]
-
-            elif b'AT+CREG' in frame:
-                # AT+CREG...
-                frame_lines = frame.decode().split("\r\n")
-                self._data['AT+CREG'] = frame_lines[1]
-
-            elif b'AT+CPIN' in frame:
-                # AT+CPIN...
-                frame_lines = frame.decode().split("\r\n")
-                self._data['AT+CPIN'] = frame_lines[1]
-                at_cpin_set = True
-
-            elif b'AT+COPS' in frame:
-                # AT+COPS...
-                frame_lines = frame.decode().split("\r\n")
-                self._data['AT+COPS'] = frame_lines[1]
-
-            elif b'+CGPSINFO:' in frame:
-                # {...}+CGPSINFO: 4629.830411,N,01120.202419,E,051023,185112.0,290.5,0.0,{...}
-                frame_lines = frame.decode().split("\r\n")
-                line: str
-                for line in frame_lines:
-                    if "+CGPSINFO:" in line:
-                        line = line[len("+CGPSINFO:"):].strip()
-                        values = line.split(",")
-                        self._data['CGPSINFO_lat_degrees'] = values[0]
-                        self._data['CGPSINFO_lat_dir'] = values[1]
-                        self._data['CGPSINFO_log_degrees'] = values[2]
-                        self._data['CGPSINFO_log_dir'] = values[3]
-                        # self._data['CGPSINFO_date'] = values[4]
-                        # self._data['CGPSINFO_utc_date'] = values[5]
-                        self._data['CGPSINFO_alt'] = values[6]
-                        self._data['CGPSINFO_speed'] = values[7]
-                        self._data['CGPSINFO_course'] = values[8] if values[8] != "" else "-1"
-
-            elif b'+CGNSSINFO:' in frame:
-                # {...}+CGNSSINFO: 2,02,03,00,4629.822936,N,01120.199998,E,051023,194627.0,323.3,0.0,,2.0,1.7,1.0{...}
-                frame_lines = frame.decode().split("\r\n")
-                line: str
-                for line in frame_lines:
-                    if "+CGNSSINFO:" in line:
-                        line = line[len("+CGNSSINFO:"):].strip()
-                        values = line.split(",")
-                        self._data['CGNSSINFO_mode'] = values[0]
-                        self._data['CGNSSINFO_sat_gps_count'] = values[1]
-                        self._data['CGNSSINFO_sat_glonass_count'] = values[2]
-                        self._data['CGNSSINFO_sat_beidou_count'] = values[3]
-                        self._data['CGNSSINFO_lat_degrees'] = values[4]
-                        self._data['CGNSSINFO_lat_dir'] = values[5]
-                        self._data['CGNSSINFO_log_degrees'] = values[6]
-                        self._data['CGNSSINFO_log_dir'] = values[7]
-                        # self._data['CGNSSINFO_date'] = values[8]
-                        # self._data['CGNSSINFO_utc_date'] = values[9]
-                        self._data['CGNSSINFO_alt'] = values[10]
-                        self._data['CGNSSINFO_speed'] = values[11]
-                        self._data['CGNSSINFO_course'] = values[12] if values[
-                                                                           12] != "" else "-1"
-                        self._data['CGNSSINFO_pdop'] = values[13]
-                        self._data['CGNSSINFO_hdop'] = values[14]
-                        self._data['CGNSSINFO_vdop'] = values[15]
-
-            else:
-                logger.debug("Unknown frame {}/{}:".format(count, len(frames)))
+        for count, frame in enumerate(frames, 1):
+            command, lines = pdu_split(frame)
+            parser = AT_CMDS_PARSERS.get(command)
+            if parser is None:
+                logger.debug("Unknown frame %d/%d:", count, len(frames))
+                logger.debug(frame)
+                continue
+            try:
+                values = parser(lines)
+            except (IndexError, ValueError) as err:
+                logger.debug("Malformed frame %d/%d (%s):", count, len(frames), err)
                 logger.debug(frame)
+                continue
+            self._data.update(values)
+            for code, raw_value in values.items():
+                self._set_sample(code, raw_value, command)
+            at_cpin_set = at_cpin_set or 'AT+CPIN' in values
 
-            count += 1
-        if not at_cpin_set:
+        if not at_cpin_set and 'AT+CPIN?' in self._polled_commands:
             self._data['AT+CPIN'] = "NoSIM"
+            self._set_sample('AT+CPIN', "NoSIM", 'AT+CPIN?')
+        if self.nmea_port is not None:
+            with self._nmea_values_lock:
+                nmea_values, self._nmea_values = self._nmea_values, {}
+            self._data.update(nmea_values)
+            for code, raw_value in nmea_values.items():
+                self._set_sample(code, raw_value, 'NMEA')
         self._data['power_module_state'] = str(self._power_state)
+        self._set_sample('power_module_state', self._power_state)
 
         # for k in self._data.keys():
         #     print("'{}': '{}',".format(k, self._data[k]))
@@ -319,28 +778,43 @@ class Device(DeviceSerial):
             self._power_down()
 
     def _power_on(self):
-        if _gpio_loaded:
+        GPIO = _load_gpio()
+        if GPIO is not None:
             logger.debug('SIM7600X is starting:')
             GPIO.setmode(GPIO.BCM)
             GPIO.setwarnings(False)
             GPIO.setup(self.POWER_PIN, GPIO.OUT)
-            time.sleep(0.1)
+            if self.wait_or_terminate(0.1):
+                logger.debug('SIM7600X start interrupted')
+                return
             GPIO.output(self.POWER_PIN, GPIO.HIGH)
-            time.sleep(2)
+            # the pin is released also when terminated during the pulse
+            self.wait_or_terminate(2)
             GPIO.output(self.POWER_PIN, GPIO.LOW)
-            time.sleep(20)
-            with serial.Serial(self.device, self.speed, timeout=1) as s:
-                s.flushInput()
+            if self.wait_or_terminate(20):
+                logger.debug('SIM7600X start interrupted')
+                return
+            # module restarted, the auto-report will be enabled again
+            self._stop_reader()
+            self._gnss_session_active = False
+            try:
+                self._conn.ensure_open().reset_input_buffer()
+            except serial.SerialException as err:
+                self._conn.handle_error(err)
             logger.debug('SIM7600X is ready')
             self._power_state = True
+            self.reset_polling()
 
     def _power_down(self):
-        if _gpio_loaded:
+        GPIO = _load_gpio()
+        if GPIO is not None:
             logger.debug('SIM7600X is shutdown:')
             GPIO.output(self.POWER_PIN, GPIO.HIGH)
-            time.sleep(3)
+            self.wait_or_terminate(3)
             GPIO.output(self.POWER_PIN, GPIO.LOW)
-            time.sleep(18)
+            if self.wait_or_terminate(18):
+                logger.debug('SIM7600X shutdown interrupted')
+                return
             logger.debug('SIM7600X is down')
             self._power_state = True
 
@@ -4,6 +4,7 @@ from fw_sim7600.base.commons import *
 from fw_sim7600.sim7600._dbus_descs import *
 from fw_sim7600.sim7600._parsers import *
 from fw_sim7600.sim7600._calculated import *
+from fw_sim7600.sim7600._pdu import *
 
 # Given an PID, this object returns all his info and meta-data
 # SimCom SIM7600G       https://www.simcom.com/product/SIM7600G-1.html
@@ -59,6 +60,17 @@ PID = {
                           'dbus_desc': DEV_DBUS_DESC_SIM7600},
 }
 
+# Deadbands for properties that jitter on each read: changes smaller than the
+# tolerance are not published (see `DeviceRunner._must_publish()` for all
+# available fields)
+DEADBAND_COORDINATES = {"abs_tol": 0.00005}     # decimal degrees, ~5 meters
+DEADBAND_ALTITUDE = {"abs_tol": 2.0}            # meters
+DEADBAND_SPEED = {"abs_tol": 0.5}               # knots
+DEADBAND_COURSE = {"abs_tol": 5.0}              # degrees
+DEADBAND_DOP = {"rel_tol": 0.1}
+DEADBAND_RSSI = {"abs_tol": 2}                  # dBm
+DEADBAND_SIGNAL_QUALITY = {"abs_tol": 5.0}      # percentage
+
 PROPS_CODES = {
     "AT+CGMI": {"name": "manufacturer", "desc": "Product's manufacturer",
                 "parser": props_parser_str},
@@ -76,7 +88,8 @@ PROPS_CODES = {
     "AT+CSQ_rssi": {"name": "network_signal_quality_rssi",
                     "desc": "Cellular network quality as signal strength "
                             "indication <rssi>",
-                    "parser": parse_network_signal_quality_rssi},
+                    "parser": parse_network_signal_quality_rssi,
+                    "deadband": DEADBAND_RSSI},
     "AT+CSQ_ber": {"name": "network_signal_quality_ber",
                    "desc": "Cellular network quality as channel bit error "
                            "rate <ber>",
@@ -93,55 +106,68 @@ PROPS_CODES = {
                          "parser": props_parser_lat},
     "CGPSINFO_lat_degrees": {"name": "pos_gps_lat_degrees",
                              "desc": "GPS latitude in decimal degrees",
-                             "parser": props_parser_gpsinfo_coordinates},
+                             "parser": props_parser_gpsinfo_coordinates,
+                             "deadband": DEADBAND_COORDINATES},
     "CGPSINFO_log_dir": {"name": "pos_gps_log_dir",
                          "desc": "GPS longitude (West -> True, East -> False)",
                          "parser": props_parser_lon},
     "CGPSINFO_log_degrees": {"name": "pos_gps_log_degrees",
                              "desc": "GPS longitude in decimal degrees",
-                             "parser": props_parser_gpsinfo_coordinates},
+                             "parser": props_parser_gpsinfo_coordinates,
+                             "deadband": DEADBAND_COORDINATES},
     "CGPSINFO_alt": {"name": "pos_gps_alt",
                      "desc": "GPS position MSL Altitude. Unit is meters.",
-                     "parser": props_parser_float},
+                     "parser": props_parser_float,
+                     "deadband": DEADBAND_ALTITUDE},
     "CGPSINFO_speed": {"name": "pos_gps_speed",
                        "desc": "GPS position Speed Over Ground. Unit is knots.",
-                       "parser": props_parser_float},
+                       "parser": props_parser_float,
+                       "deadband": DEADBAND_SPEED},
     "CGPSINFO_course": {"name": "pos_gps_course",
                         "desc": "GPS position course in degrees",
-                        "parser": props_parser_float},
+                        "parser": props_parser_float,
+                        "deadband": DEADBAND_COURSE},
 
     "CGNSSINFO_lat_dir": {"name": "pos_gnss_lat_dir",
                           "desc": "GNSS latitude (North -> True, South -> False)",
                           "parser": props_parser_lat},
     "CGNSSINFO_lat_degrees": {"name": "pos_gnss_lat_degrees",
                               "desc": "GNSS latitude in decimal degrees",
-                              "parser": props_parser_gpsinfo_coordinates},
+                              "parser": props_parser_gpsinfo_coordinates,
+                              "deadband": DEADBAND_COORDINATES},
     "CGNSSINFO_log_dir": {"name": "pos_gnss_log_dir",
                           "desc": "GNSS longitude (West -> True, East -> False)",
                           "parser": props_parser_lon},
     "CGNSSINFO_log_degrees": {"name": "pos_gnss_log_degrees",
                               "desc": "GNSS longitude in decimal degrees",
-                              "parser": props_parser_gpsinfo_coordinates},
+                              "parser": props_parser_gpsinfo_coordinates,
+                              "deadband": DEADBAND_COORDINATES},
     "CGNSSINFO_alt": {"name": "pos_gnss_alt",
                       "desc": "GNSS position MSL Altitude. Unit is meters.",
-                      "parser": props_parser_float},
+                      "parser": props_parser_float,
+                      "deadband": DEADBAND_ALTITUDE},
     "CGNSSINFO_speed": {"name": "pos_gnss_speed",
                         "desc": "GNSS position Speed Over Ground. Unit is "
                                 "knots.",
-                        "parser": props_parser_float},
+                        "parser": props_parser_float,
+                        "deadband": DEADBAND_SPEED},
     "CGNSSINFO_course": {"name": "pos_gnss_course",
                          "desc": "GNSS position course in degrees.",
-                         "parser": props_parser_float},
+                         "parser": props_parser_float,
+                         "deadband": DEADBAND_COURSE},
 
     "CGNSSINFO_pdop": {"name": "pos_gnss_pdop",
                        "desc": "Position Dilution Of Precision.",
-                       "parser": props_parser_float},
+                       "parser": props_parser_float,
+                       "deadband": DEADBAND_DOP},
     "CGNSSINFO_hdop": {"name": "pos_gnss_hdop",
                        "desc": "Horizontal Dilution Of Precision.",
-                       "parser": props_parser_float},
+                       "parser": props_parser_float,
+                       "deadband": DEADBAND_DOP},
     "CGNSSINFO_vdop": {"name": "pos_gnss_vdop",
                        "desc": "Vertical Dilution Of Precision.",
-                       "parser": props_parser_float},
+                       "parser": props_parser_float,
+                       "deadband": DEADBAND_DOP},
 
     "CGNSSINFO_mode": {"name": "pos_gnss_mode",
                        "desc": "Fix mode 2=2D fix 3=3D fix",
@@ -158,6 +184,14 @@ PROPS_CODES = {
                                    "desc": "BEIDOU satellite valid numbers "
                                            "scope: 00-12",
                                    "parser": props_parser_int},
+    "NMEA_sat_snr": {"name": "pos_gnss_sat_snr",
+                     "desc": "Satellites in view SNR in dB-Hz, by talker and "
+                             "PRN (eg: 'GP12'). Read from the NMEA port only.",
+                     "parser": props_parser_none},
+    "NMEA_sat_in_view": {"name": "pos_gnss_sat_in_view",
+                         "desc": "Satellites in view, of all GNSS systems. "
+                                 "Read from the NMEA port only.",
+                         "parser": props_parser_int},
 
     "power_module_state": {"name": "power_module_state",
                            "desc": "State of the module: true is power on, "
@@ -165,6 +199,65 @@ PROPS_CODES = {
                            "parser": props_parser_bool},
 }
 
+# Polling intervals for each AT query, in seconds. Queries with `None` interval
+# are sent only once (at startup and after each device's reconnection), queries
+# with `0` interval are sent on each refresh. The main loop sleep is the lower
+# bound for all intervals.
+AT_CMDS_INTERVALS = {
+    "AT+CGMI": None,
+    "AT+CGMM": None,
+    "AT+CGSN": None,
+    "AT+CSUB": None,
+    "AT+CGMR": None,
+    "AT+CSQ": 5,
+    "AT+CREG?": 5,
+    "AT+CPIN?": 30,
+    "AT+COPS?": 60,
+    "AT+CGPSINFO": 1,
+    "AT+CGNSSINFO": 1,
+}
+
+# Values extractors for each AT command's response, the key is the echoed
+# command (or, for the unsolicited reports, the response's prefix with `AT`).
+# Examples of the parsed frames are reported on each line.
+AT_CMDS_PARSERS = {
+    # AT+CGMI\r\r\nSIMCOM INCORPORATED\r\n\r\nOK\r\n
+    "AT+CGMI": pdu_line("AT+CGMI"),
+    # AT+CGMM\r\r\nSIMCOM_SIM7600E-H\r\n\r\nOK\r\n
+    "AT+CGMM": pdu_line("AT+CGMM"),
+    # AT+CGSN\r\r\n860147054839863\r\n\r\nOK\r\n
+    "AT+CGSN": pdu_line("AT+CGSN"),
+    # AT+CSUB\r\r\n+CSUB: B04V03\r\n+CSUB: MDM9x07_LE20_S_22_V1.03_210527\r\n\r\nOK\r\n
+    "AT+CSUB": pdu_prefixed("+CSUB:", "AT+CSUB", "AT+CSUB_B"),
+    # AT+CGMR\r\r\n+CGMR: LE20B04SIM7600M22\r\n\r\nOK\r\n
+    "AT+CGMR": pdu_prefixed("+CGMR:", "AT+CGMR"),
+    # AT+CSQ\r\r\n+CSQ: 4,99\r\n\r\nOK\r\n
+    "AT+CSQ": pdu_fields("+CSQ:", ("AT+CSQ_rssi", "AT+CSQ_ber")),
+    # AT+CREG?\r\r\n+CREG: 0,1\r\n\r\nOK\r\n
+    "AT+CREG?": pdu_line("AT+CREG"),
+    # AT+CPIN?\r\r\n+CPIN: READY\r\n\r\nOK\r\n
+    "AT+CPIN?": pdu_line("AT+CPIN"),
+    # AT+COPS?\r\r\n+COPS: 0,0,"vodafone IT",7\r\n\r\nOK\r\n
+    "AT+COPS?": pdu_line("AT+COPS"),
+    # +CGPSINFO: 4629.830411,N,01120.202419,E,051023,185112.0,290.5,0.0,
+    "AT+CGPSINFO": pdu_fields("+CGPSINFO:", (
+        "CGPSINFO_lat_degrees", "CGPSINFO_lat_dir",
+        "CGPSINFO_log_degrees", "CGPSINFO_log_dir",
+        None, None,     # date, utc_date
+        "CGPSINFO_alt", "CGPSINFO_speed", "CGPSINFO_course",
+    ), {"CGPSINFO_course": "-1"}),
+    # +CGNSSINFO: 2,02,03,00,4629.822936,N,01120.199998,E,051023,194627.0,323.3,0.0,,2.0,1.7,1.0
+    "AT+CGNSSINFO": pdu_fields("+CGNSSINFO:", (
+        "CGNSSINFO_mode", "CGNSSINFO_sat_gps_count",
+        "CGNSSINFO_sat_glonass_count", "CGNSSINFO_sat_beidou_count",
+        "CGNSSINFO_lat_degrees", "CGNSSINFO_lat_dir",
+        "CGNSSINFO_log_degrees", "CGNSSINFO_log_dir",
+        None, None,     # date, utc_date
+        "CGNSSINFO_alt", "CGNSSINFO_speed", "CGNSSINFO_course",
+        "CGNSSINFO_pdop", "CGNSSINFO_hdop", "CGNSSINFO_vdop",
+    ), {"CGNSSINFO_course": "-1"}),
+}
+
 CALC_PROPS_CODES = {
     "network_registration": {"depends_on": "network_status_code",
                              "calculator": calc_network_registration},
@@ -173,7 +266,8 @@ CALC_PROPS_CODES = {
     "network_roaming": {"depends_on": "network_status_code",
                         "calculator": calc_network_roaming},
     "network_signal_quality": {"depends_on": ["network_signal_quality_rssi", "network_signal_quality_ber"],
-                               "calculator": calc_network_signal_quality},
+                               "calculator": calc_network_signal_quality,
+                               "deadband": DEADBAND_SIGNAL_QUALITY},
     "network_sim_status": {"depends_on": "network_sim_status_code",
                             "calculator": calc_network_sim_status},
     "pos_gnss_sat_count": {"depends_on": "pos_gnss_sat_gps_count",
@@ -1,8 +1,12 @@
 #!/usr/bin/python3
 import logging
+import time
 
 from fw_sim7600.sim7600.device import Device
+from fw_sim7600.sim7600._definitions import SIM_STATUSES_WORKING_KEY
 from fw_sim7600.base.commons import regenerateValueMaxMin
+from fw_sim7600.base.sample import Sample
+from fw_sim7600.base.timing import timed
 
 
 logger = logging.getLogger()
@@ -10,6 +14,9 @@ logger = logging.getLogger()
 
 class DeviceSimulator(Device):
 
+    # Sample's source for all simulated values
+    SOURCE = "simulator"
+
     def __init__(self, device, speed):
         super().__init__(device, speed, auto_refresh=False)
         self._data = {
@@ -19,77 +26,77 @@ class DeviceSimulator(Device):
             'AT+CSUB': 'B04V03',
             'AT+CSUB_B': 'MDM9x07_LE20_S_22_V1.03_210527',
             'AT+CGMR': 'LE20B04SIM7600M22',
-            'AT+CSQ_rssi': '6',
-            'AT+CSQ_ber': '7',
-            'AT+CPIN': '+CPIN: READY',
-            'AT+COPS': '+COPS: 0,0,"China Mobile Com",0',
-            'AT+CREG': '+CREG: 0, 0',
-            'CGPSINFO_lat_degrees': '4629.837756',
-            'CGPSINFO_lat_dir': 'N',
-            'CGPSINFO_log_degrees': '01120.203911',
-            'CGPSINFO_log_dir': 'E',
-            'CGPSINFO_alt': '276.8',
-            'CGPSINFO_speed': '0.0',
-            'CGPSINFO_course': '-1',
-            'CGNSSINFO_mode': '2',
-            'CGNSSINFO_sat_gps_count': '06',
-            'CGNSSINFO_sat_glonass_count': '04',
-            'CGNSSINFO_sat_beidou_count': '00',
-            'CGNSSINFO_lat_degrees': '4629.837221',       # 46°17'54.1"N
-            'CGNSSINFO_lat_dir': 'N',
-            'CGNSSINFO_log_degrees': '01120.204242',      # 11°12'15.3"E
-            'CGNSSINFO_log_dir': 'E',
-            'CGNSSINFO_alt': '274.9',
-            'CGNSSINFO_speed': '0.0',
-            'CGNSSINFO_course': '-1',
-            'CGNSSINFO_pdop': '1.3',
-            'CGNSSINFO_hdop': '1.0',
-            'CGNSSINFO_vdop': '0.8',
-            'power_module_state': str(self._power_state),
         }
+        # Simulated values, already in their final type (as returned by the
+        # `PROPS_CODES` parsers)
+        self._values = {
+            'AT+CSQ_rssi': -101,
+            'AT+CSQ_ber': 6.0,
+            'AT+CPIN': SIM_STATUSES_WORKING_KEY,
+            'AT+COPS': 'China Mobile Com',
+            'AT+CREG': 0,
+            'CGPSINFO_lat_degrees': 46.497296,          # 4629.837756
+            'CGPSINFO_lat_dir': True,                   # N
+            'CGPSINFO_log_degrees': 11.336732,          # 01120.203911
+            'CGPSINFO_log_dir': False,                  # E
+            'CGPSINFO_alt': 276.8,
+            'CGPSINFO_speed': 0.0,
+            'CGPSINFO_course': -1.0,
+            'CGNSSINFO_mode': 2,
+            'CGNSSINFO_sat_gps_count': 6,
+            'CGNSSINFO_sat_glonass_count': 4,
+            'CGNSSINFO_sat_beidou_count': 0,
+            'CGNSSINFO_lat_degrees': 46.497287,         # 46°17'54.1"N
+            'CGNSSINFO_lat_dir': True,                  # N
+            'CGNSSINFO_log_degrees': 11.336737,         # 11°12'15.3"E
+            'CGNSSINFO_log_dir': False,                 # E
+            'CGNSSINFO_alt': 274.9,
+            'CGNSSINFO_speed': 0.0,
+            'CGNSSINFO_course': -1.0,
+            'CGNSSINFO_pdop': 1.3,
+            'CGNSSINFO_hdop': 1.0,
+            'CGNSSINFO_vdop': 0.8,
+        }
+        self._update_samples()
         self._is_connected = True
 
+    @timed("refresh")
     def refresh(self, reset_data=False) -> bool:
         if not self._power_state:
             return False
 
-        self._data = {
-            'AT+CGMI': 'SIMCOM INCORPORATED',
-            'AT+CGMM': 'SIMCOM_SIM7600E-H',
-            'AT+CGSN': '860147054839863',
-            'AT+CSUB': 'B04V03',
-            'AT+CSUB_B': 'MDM9x07_LE20_S_22_V1.03_210527',
-            'AT+CGMR': 'LE20B04SIM7600M22',
-            'AT+CSQ_rssi': str(int(regenerateValueMaxMin(self._data['AT+CSQ_rssi'], 1, 0, 31))),
-            'AT+CSQ_ber': str(int(regenerateValueMaxMin(self._data['AT+CSQ_ber'], 1, 0, 7))),
-            'AT+CPIN': '+CPIN: READY',
-            'AT+COPS': '+COPS: 0,0,"China Mobile Com",0',
-            'AT+CREG': '+CREG: 0, 0',
-            'CGPSINFO_lat_degrees': regenerateValueMaxMin(self._data['CGPSINFO_lat_degrees'], 0.01, 0, 9000),
-            'CGPSINFO_lat_dir': 'N',    # 'S' or "N" if random.randint(0, 1) else "N",
-            'CGPSINFO_log_degrees': str(regenerateValueMaxMin(self._data['CGPSINFO_log_degrees'], 0.01, 0, 18000)),
-            'CGPSINFO_log_dir': 'E',    # 'W' or "E" if random.randint(0, 1) else "W",
-            'CGPSINFO_alt': str(regenerateValueMaxMin(self._data['CGPSINFO_alt'], 0.1, 0, 500)),
-            'CGPSINFO_speed': str(regenerateValueMaxMin(self._data['CGPSINFO_speed'], 0.1, 0, 20)),
-            'CGPSINFO_course': str(regenerateValueMaxMin(self._data['CGPSINFO_course'], 0.1, 0, 360)),
-            'CGNSSINFO_mode': '2',      # '3' or "2" if random.randint(0, 1) else "3",
-            'CGNSSINFO_sat_gps_count': str(int(regenerateValueMaxMin(self._data['CGNSSINFO_sat_gps_count'], 1, 0, 12))),
-            'CGNSSINFO_sat_glonass_count': str(int(regenerateValueMaxMin(self._data['CGNSSINFO_sat_glonass_count'], 1, 0, 12))),
-            'CGNSSINFO_sat_beidou_count': str(int(regenerateValueMaxMin(self._data['CGNSSINFO_sat_beidou_count'], 1, 0, 12))),
-            'CGNSSINFO_lat_degrees': str(regenerateValueMaxMin(self._data['CGNSSINFO_lat_degrees'], 0.01, 0, 9000)),
-            'CGNSSINFO_lat_dir': 'N',   # 'S' or "N" if random.randint(0, 1) else "N",
-            'CGNSSINFO_log_degrees': str(regenerateValueMaxMin(self._data['CGNSSINFO_log_degrees'], 0.01, 0, 18000)),
-            'CGNSSINFO_log_dir': 'E',   # 'W' or "E" if random.randint(0, 1) else "W",
-            'CGNSSINFO_alt': str(regenerateValueMaxMin(self._data['CGNSSINFO_alt'], 0.1, 0, 500)),
-            'CGNSSINFO_speed': str(regenerateValueMaxMin(self._data['CGNSSINFO_speed'], 0.1, 0, 20)),
-            'CGNSSINFO_course': str(regenerateValueMaxMin(self._data['CGNSSINFO_course'], 0.1, 0, 360)),
-            'CGNSSINFO_pdop': str(regenerateValueMaxMin(self._data['CGNSSINFO_pdop'], 0.1, 0, 4)),
-            'CGNSSINFO_hdop': str(regenerateValueMaxMin(self._data['CGNSSINFO_hdop'], 0.1, 0, 4)),
-            'CGNSSINFO_vdop': str(regenerateValueMaxMin(self._data['CGNSSINFO_vdop'], 0.1, 0, 4)),
-            'power_module_state': str(self._power_state),
-        }
+        v = self._values
+        v['AT+CSQ_rssi'] = int(regenerateValueMaxMin(v['AT+CSQ_rssi'], 2, -113, -51))
+        v['AT+CSQ_ber'] = regenerateValueMaxMin(v['AT+CSQ_ber'], 0.5, 0, 10)
+        v['CGPSINFO_lat_degrees'] = regenerateValueMaxMin(v['CGPSINFO_lat_degrees'], 0.0002, 0, 90)
+        v['CGPSINFO_log_degrees'] = regenerateValueMaxMin(v['CGPSINFO_log_degrees'], 0.0002, 0, 180)
+        v['CGPSINFO_alt'] = regenerateValueMaxMin(v['CGPSINFO_alt'], 0.1, 0, 500)
+        v['CGPSINFO_speed'] = regenerateValueMaxMin(v['CGPSINFO_speed'], 0.1, 0, 20)
+        v['CGPSINFO_course'] = regenerateValueMaxMin(v['CGPSINFO_course'], 0.1, 0, 360)
+        v['CGNSSINFO_sat_gps_count'] = int(regenerateValueMaxMin(v['CGNSSINFO_sat_gps_count'], 1, 0, 12))
+        v['CGNSSINFO_sat_glonass_count'] = int(regenerateValueMaxMin(v['CGNSSINFO_sat_glonass_count'], 1, 0, 12))
+        v['CGNSSINFO_sat_beidou_count'] = int(regenerateValueMaxMin(v['CGNSSINFO_sat_beidou_count'], 1, 0, 12))
+        v['CGNSSINFO_lat_degrees'] = regenerateValueMaxMin(v['CGNSSINFO_lat_degrees'], 0.0002, 0, 90)
+        v['CGNSSINFO_log_degrees'] = regenerateValueMaxMin(v['CGNSSINFO_log_degrees'], 0.0002, 0, 180)
+        v['CGNSSINFO_alt'] = regenerateValueMaxMin(v['CGNSSINFO_alt'], 0.1, 0, 500)
+        v['CGNSSINFO_speed'] = regenerateValueMaxMin(v['CGNSSINFO_speed'], 0.1, 0, 20)
+        v['CGNSSINFO_course'] = regenerateValueMaxMin(v['CGNSSINFO_course'], 0.1, 0, 360)
+        v['CGNSSINFO_pdop'] = regenerateValueMaxMin(v['CGNSSINFO_pdop'], 0.1, 0, 4)
+        v['CGNSSINFO_hdop'] = regenerateValueMaxMin(v['CGNSSINFO_hdop'], 0.1, 0, 4)
+        v['CGNSSINFO_vdop'] = regenerateValueMaxMin(v['CGNSSINFO_vdop'], 0.1, 0, 4)
+        self._update_samples()
         return True
 
+    def _update_samples(self):
+        """ Store the simulated values as samples, without any parsing. """
+        now = time.monotonic()
+        self._samples = {code: Sample(code, self._data[code], self._data[code], self.SOURCE, now)
+                         for code in self._data}
+        for code, value in self._values.items():
+            self._samples[code] = Sample(code, value, source=self.SOURCE, timestamp=now)
+        self._samples['power_module_state'] = Sample('power_module_state', self._power_state,
+                                                     source=self.SOURCE, timestamp=now)
+
     def power_module(self, value: bool):
         logger.info("EXECUTE power_module with {} val".format(value))
         if self._power_state == value:
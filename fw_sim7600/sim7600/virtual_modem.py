@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+"""
+Virtual SIM7600 modem behind a pseudo-terminal.
+
+It answers to the AT commands used by the `Device` class with the same framing
+of the real modem (`<echo>\\r\\r\\n<info>\\r\\n\\r\\nOK\\r\\n`), so the whole serial
+path (`send_at`, `_get_data`, `_parse_pdu` and the GNSS logic) can be executed
+without the hardware. Response latency, errors rate and GNSS fix behaviour are
+configurable.
+
+Usage:
+    $ python -m fw_sim7600.sim7600.virtual_modem --latency 0.005 --fix-after 3
+    Virtual SIM7600 modem available on /dev/pts/3 (Ctrl+C to quit)
+    $ python run.py --port /dev/pts/3
+"""
+
+import argparse
+import logging
+import os
+import random
+import select
+import threading
+import time
+import tty
+from typing import Optional
+
+from fw_sim7600.base.commons import regenerateValueMaxMin
+
+logger = logging.getLogger()
+
+
+class VirtualModem:
+    """
+    Virtual SIM7600 modem, it runs on a dedicated thread and it's available on
+    the `port` pseudo-terminal.
+    """
+
+    IDENTITY = {
+        'AT+CGMI': 'SIMCOM INCORPORATED',
+        'AT+CGMM': 'SIMCOM_SIM7600E-H',
+        'AT+CGSN': '862798066497344',
+        'AT+CSUB': '+CSUB: B04V03\r\n+CSUB: MDM9x07_LE20_S_22_V1.03_210527',
+        'AT+CGMR': '+CGMR: LE20B04SIM7600M22',
+    }
+
+    def __init__(self, latency: float = 0.005, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, fix: bool = True,
+                 fix_after: float = 0.0, sim_ready: bool = True,
+                 provider: str = "vodafone IT"):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.fix = fix
+        self.fix_after = fix_after
+        self.sim_ready = sim_ready
+        self.provider = provider
+
+        self._master_fd: Optional[int] = None
+        self._slave_fd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._report_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._write_lock = threading.Lock()
+
+        self._echo = True
+        self._gps_on = False
+        self._gps_start = 0.0
+        self._auto_report = {'AT+CGPSINFO': 0, 'AT+CGNSSINFO': 0}
+        self._position = {'lat': '4629.822936', 'lon': '01120.199998',
+                          'alt': '323.3', 'speed': '0.0'}
+
+        self.commands_count = 0
+        self.errors_count = 0
+
+    @property
+    def port(self) -> str:
+        """ Returns the pseudo-terminal to use as serial port. """
+        assert self._slave_fd is not None, "Virtual modem not started"
+        return os.ttyname(self._slave_fd)
+
+    def start(self):
+        """ Open the pseudo-terminal and start the modem's threads. """
+        self._master_fd, self._slave_fd = os.openpty()
+        tty.setraw(self._slave_fd)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, name="VirtualModem", daemon=True)
+        self._thread.start()
+        self._report_thread = threading.Thread(target=self._auto_report_loop, name="VirtualModemReports",
+                                               daemon=True)
+        self._report_thread.start()
+
+    def stop(self):
+        """ Stop the modem's threads and close the pseudo-terminal. """
+        self._stop.set()
+        for thread in (self._thread, self._report_thread):
+            if thread is not None:
+                thread.join()
+        self._thread = self._report_thread = None
+        for fd in (self._slave_fd, self._master_fd):
+            if fd is not None:
+                os.close(fd)
+        self._slave_fd = self._master_fd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_args):
+        self.stop()
+
+    # Commands processing
+
+    def _serve(self):
+        buff = b''
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([self._master_fd], [], [], 0.05)
+                if not readable:
+                    continue
+                chunk = os.read(self._master_fd, 1024)
+            except OSError:
+                return
+            if not chunk:
+                continue
+            buff += chunk
+            while b'\r' in buff:
+                line, buff = buff.split(b'\r', 1)
+                line = line.strip().decode(errors='replace')
+                if line == '':
+                    continue
+                delay = self.latency + random.uniform(0, self.latency_jitter)
+                if delay > 0:
+                    self._stop.wait(delay)
+                self._write((line + '\r' if self._echo else '').encode()
+                            + self.process_line(line).encode())
+
+    def process_line(self, line) -> str:
+        """ Returns the response to a (eventually concatenated) command line. """
+        if not line.upper().startswith('AT'):
+            return '\r\nERROR\r\n'
+        commands = line.split(';')
+        commands = [commands[0]] + ['AT' + cmd.strip() for cmd in commands[1:]]
+        response = ''
+        for command in commands:
+            self.commands_count += 1
+            info = self._process_command(command)
+            if info is None or random.random() < self.error_rate:
+                self.errors_count += 1
+                return response + '\r\nERROR\r\n'
+            if info != '':
+                response += '\r\n' + info + '\r\n'
+        return response + '\r\nOK\r\n'
+
+    def _process_command(self, command) -> Optional[str]:
+        """ Returns the information response, or None for errors. """
+        cmd = command.upper()
+        if cmd == 'AT':
+            return ''
+        if cmd in ('ATE0', 'ATE1'):
+            self._echo = cmd == 'ATE1'
+            return ''
+        if cmd in self.IDENTITY:
+            return self.IDENTITY[cmd]
+        if cmd == 'AT+CSQ':
+            return '+CSQ: {},99'.format(random.randint(15, 25) if self.sim_ready else 99)
+        if cmd == 'AT+CREG?':
+            return '+CREG: 0,{}'.format(1 if self.sim_ready else 2)
+        if cmd == 'AT+CPIN?':
+            return '+CPIN: READY' if self.sim_ready else '+CPIN: SIM PIN'
+        if cmd == 'AT+COPS?':
+            return '+COPS: 0,0,"{}",7'.format(self.provider) if self.sim_ready else None
+        if cmd in ('AT+CGPS=1', 'AT+CGPS=0'):
+            gps_on = cmd == 'AT+CGPS=1'
+            if gps_on == self._gps_on:
+                # like the real modem, session already started/stopped
+                return None
+            self._gps_on = gps_on
+            self._gps_start = time.monotonic()
+            return ''
+        if cmd in ('AT+CGPSINFO', 'AT+CGNSSINFO'):
+            return self._gnss_info(cmd)
+        if cmd.startswith('AT+CGPSINFO=') or cmd.startswith('AT+CGNSSINFO='):
+            name, interval = cmd.split('=', 1)
+            try:
+                self._auto_report[name] = int(interval)
+            except ValueError:
+                return None
+            return ''
+        return None
+
+    def has_fix(self) -> bool:
+        """ Returns True if the GNSS session is on and the fix is available. """
+        return self.fix and self._gps_on \
+            and time.monotonic() - self._gps_start >= self.fix_after
+
+    def _gnss_info(self, cmd) -> str:
+        if not self.has_fix():
+            return '+CGPSINFO: ,,,,,,,,' if cmd == 'AT+CGPSINFO' else '+CGNSSINFO: ,,,,,,,,,,,,,,,'
+
+        pos = self._position
+        pos['lat'] = '{:011.6f}'.format(regenerateValueMaxMin(pos['lat'], 0.001, 0, 9000))
+        pos['lon'] = '{:012.6f}'.format(regenerateValueMaxMin(pos['lon'], 0.001, 0, 18000))
+        pos['alt'] = '{:.1f}'.format(regenerateValueMaxMin(pos['alt'], 0.4, 0, 500))
+        date, utc = time.strftime('%d%m%y'), time.strftime('%H%M%S.0')
+        if cmd == 'AT+CGPSINFO':
+            return '+CGPSINFO: {},N,{},E,{},{},{},{},'.format(
+                pos['lat'], pos['lon'], date, utc, pos['alt'], pos['speed'])
+        return '+CGNSSINFO: 2,06,04,00,{},N,{},E,{},{},{},{},,1.3,1.0,0.8'.format(
+            pos['lat'], pos['lon'], date, utc, pos['alt'], pos['speed'])
+
+    # Unsolicited reports
+
+    def _auto_report_loop(self):
+        next_reports = {}
+        while not self._stop.wait(0.05):
+            now = time.monotonic()
+            for cmd, interval in self._auto_report.items():
+                if interval <= 0 or not self._gps_on:
+                    next_reports.pop(cmd, None)
+                    continue
+                if next_reports.setdefault(cmd, now + interval) <= now:
+                    next_reports[cmd] = now + interval
+                    self._write(('\r\n' + self._gnss_info(cmd) + '\r\n').encode())
+
+    def _write(self, data: bytes):
+        with self._write_lock:
+            try:
+                os.write(self._master_fd, data)
+            except OSError:
+                pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Virtual SIM7600 modem on a pseudo-terminal")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="Seconds before each response (default: 0.005)")
+    parser.add_argument("--latency-jitter", type=float, default=0.0,
+                        help="Max random seconds added to the latency (default: 0.0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Probability of an ERROR response for each command (default: 0.0)")
+    parser.add_argument("--no-fix", action="store_true",
+                        help="Never return a GNSS fix")
+    parser.add_argument("--fix-after", type=float, default=0.0,
+                        help="Seconds from GNSS session start to the first fix (default: 0.0)")
+    parser.add_argument("--no-sim", action="store_true",
+                        help="Simulate a modem without SIM (AT+COPS? returns ERROR)")
+    args = parser.parse_args()
+
+    modem = VirtualModem(args.latency, args.latency_jitter, args.error_rate,
+                         not args.no_fix, args.fix_after, not args.no_sim)
+    with modem:
+        print("Virtual SIM7600 modem available on {} (Ctrl+C to quit)".format(modem.port))
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+    print("Virtual SIM7600 modem stopped after {} commands ({} errors)"
+          .format(modem.commands_count, modem.errors_count))
+
+
+if __name__ == '__main__':
+    main()
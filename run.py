@@ -2,13 +2,9 @@
 
 import logging
 
-from fw_sim7600.sim7600.device import Device
 from fw_sim7600.sim7600.mappings import PID, PROPS_CODES, CALC_PROPS_CODES
-
-
 from fw_sim7600.base.runner import DeviceRunner
 from fw_sim7600.base.settings import Settings
-from fw_sim7600.sim7600.simulator import DeviceSimulator
 
 # default logger, used if _setup_logging() was not called
 logger = logging.getLogger()
@@ -36,7 +32,8 @@ FW_SETTINGS = {
 
     # Enable local cache for properties (default: True)
     Settings.CACHE_ENABLE: True,
-    # Maximum time a property can be stored on the cache before sending his value again. (default: 300)
+    # Maximum time a property can be stored on the cache before sending his value again. It applies only to
+    # properties without a `deadband`, or without the `max_interval` field in their `deadband` (default: 300)
     Settings.CACHE_TIME_TO_RESET: 10 * 60,
 
     # Log level for console messages (default: logging.WARN)
@@ -57,14 +54,46 @@ FW_SETTINGS = {
     #Settings.LOGGER_FILE_FORMAT: "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     # Format for logging date on file (default: "%Y-%m-%d %H:%M:%S")
     #Settings.LOGGER_FILE_DATE_FORMAT: "%Y-%m-%d %H:%M:%S",
+    # Max size in bytes of the log file before rotating it, 0 to disable the rotation (default: 1048576)
+    #Settings.LOGGER_FILE_MAX_BYTES: 1024 * 1024,
+    # Number of rotated log files kept, older ones are deleted (default: 5)
+    #Settings.LOGGER_FILE_BACKUP_COUNT: 5,
 
     # Seconds between each device connection retry (default: 5)
     #Settings.DEV_CONN_RETRY: 5,
     # Seconds between each publish retry (default: 30)
     #Settings.DEV_PUBLISH_RETRY_SLEEP: 30,
-
-    # Seconds that the main loop sleeps before next iteration (default: 10)
+    # GNSS session policy: "always_on", "idle_timeout" or "per_cycle" (default: "per_cycle")
+    #Settings.DEV_GNSS_SESSION: "per_cycle",
+    # Seconds with an unchanged GNSS position before stopping the GNSS session, and then before restarting it, used by the "idle_timeout" policy (default: 60)
+    #Settings.DEV_GNSS_SESSION_IDLE_TIMEOUT: 60,
+    # Seconds between each GNSS auto-report, 0 to poll the GNSS data (default: 0)
+    #Settings.DEV_GNSS_AUTO_REPORT: 0,
+    # Serial port that streams the NMEA sentences, empty to read the GNSS data from the AT port (default: "")
+    #Settings.DEV_NMEA_PORT: "/dev/ttyUSB1",
+    # Serial port speed for the NMEA port (default: 115200)
+    #Settings.DEV_NMEA_SPEED: 115200,
+
+    # Seconds between the start of each main loop iteration, also fractional (eg: 0.5) (default: 10)
     #Settings.MAIN_LOOP_SLEEP: 10,
+    # Run the device's refresh and the DBus publication on separated threads, linked by a queue (default: False)
+    #Settings.MAIN_LOOP_PIPELINE: False,
+    # Max refreshes queued on pipeline mode (default: 4)
+    #Settings.PIPELINE_QUEUE_SIZE: 4,
+    # Pipeline's queue overflow policy: "drop_oldest" or "coalesce_latest" (default: "coalesce_latest")
+    #Settings.PIPELINE_OVERFLOW: "coalesce_latest",
+
+    # File where the latest published values are stored and published on startup (warm start), empty to disable (default: "")
+    #Settings.STATE_FILE: "/var/lib/fw_sim7600/state.json",
+    # Min seconds between the state file's updates (default: 60)
+    #Settings.STATE_SAVE_INTERVAL: 60,
+    # Max age in seconds of the state file to publish his values on startup, 0 for no limit (default: 3600)
+    #Settings.STATE_MAX_AGE: 3600,
+
+    # Record the durations of the AT commands and of the main loop's stages (default: False)
+    #Settings.TIMINGS_ENABLE: False,
+    # File where the timings are written on each cycle in the Prometheus text format, empty to disable (default: "")
+    #Settings.TIMINGS_PROMETHEUS_FILE: "/var/lib/node_exporter/textfile_collector/fw_sim7600.prom",
 
     # Exit value on success (default: 0)
     #Settings.EXIT_SUCCESS: 0,
@@ -74,21 +103,38 @@ FW_SETTINGS = {
     #Settings.EXIT_INIT_ERROR_DEV: 2,
     # Exit value on DBus initialization error (default: 3)
     #Settings.EXIT_INIT_ERROR_DBUS: 3,
+    # Exit value on device changed since the warm start's state was saved, restart required (default: 4)
+    #Settings.EXIT_DEVICE_CHANGED: 4,
+    # Exit value on calculated properties with a dependency cycle (default: 5)
+    #Settings.EXIT_INIT_ERROR_PROPS: 5,
 }
 
 if __name__ == '__main__':
 
+    # devices are imported only when used, so the `--version` and `--help`
+    # arguments don't pay the `pyserial` import time
     def init_device_physical(device, speed, auto_refresh):
-        return Device(device, speed, auto_refresh)
+        from fw_sim7600.sim7600.device import Device
+        return Device(device, speed, auto_refresh,
+                      gnss_auto_report=r.settings.get_dev_gnss_auto_report,
+                      gnss_session=r.settings.get_dev_gnss_session,
+                      gnss_session_idle_timeout=r.settings.get_dev_gnss_session_idle_timeout,
+                      nmea_port=r.settings.get_dev_nmea_port or None,
+                      nmea_speed=r.settings.get_dev_nmea_speed)
 
 
     def init_device_simulator(device, speed, auto_refresh):
+        from fw_sim7600.sim7600.simulator import DeviceSimulator
         return DeviceSimulator(device, speed)
 
 
-    r = DeviceRunner(init_device_physical, init_device_simulator,
-                       FW_SETTINGS,
-                       PID, PROPS_CODES, CALC_PROPS_CODES)
+    try:
+        r = DeviceRunner(init_device_physical, init_device_simulator,
+                           FW_SETTINGS,
+                           PID, PROPS_CODES, CALC_PROPS_CODES)
+    except ValueError as err:
+        logger.error("Error on properties definition: {}".format(err))
+        exit(Settings(FW_SETTINGS).get_exit_init_error_props)
     args = r.cli_args()
 
     if args.version:
@@ -109,5 +155,5 @@ if __name__ == '__main__':
     FW_SETTINGS[Settings.PARAM_SERIAL_PORT] = args.port
     FW_SETTINGS[Settings.PARAM_SERIAL_SPEED] = args.speed
 
-    r.run(args.simulate, args.dev)
+    r.run(args.simulate, args.dev, args.profile)
     exit(0)